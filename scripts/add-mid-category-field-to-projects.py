@@ -22,6 +22,9 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Set
 
+from gh_client import get_client
+from project_index import load_project_index
+
 
 # 中カテゴリのフィールドカラー
 FIELD_COLORS = [
@@ -32,15 +35,10 @@ FIELD_COLORS = [
 
 
 def run_gh_command(args: List[str], check: bool = True) -> subprocess.CompletedProcess:
-    """GitHub CLIコマンドを実行"""
+    """GitHub CLIコマンドを実行（プロセス内APIクライアント経由）"""
     try:
-        result = subprocess.run(
-            ["gh"] + args,
-            capture_output=True,
-            text=True,
-            check=check
-        )
-        return result
+        output = get_client().run_gh_command(args)
+        return subprocess.CompletedProcess(["gh"] + args, 0, stdout=output, stderr="")
     except subprocess.CalledProcessError as e:
         if check:
             print(f"❌ エラー: GitHub CLIコマンドの実行に失敗しました")
@@ -259,42 +257,18 @@ def get_existing_field_info(project_id: str) -> Dict[str, any]:
     return None
 
 
-def get_project_items(project_id: str) -> List[Dict[str, str]]:
+def get_project_items(project_id: str, cache_file: Path) -> List[Dict[str, str]]:
     """プロジェクトの全アイテム（Issue）を取得"""
-    query = f"""
-    {{
-      node(id: "{project_id}") {{
-        ... on ProjectV2 {{
-          items(first: 100) {{
-            nodes {{
-              id
-              content {{
-                ... on Issue {{
-                  number
-                  title
-                }}
-              }}
-            }}
-          }}
-        }}
-      }}
-    }}
-    """
-
-    response = run_graphql_query(query)
-    items = response.get("data", {}).get("node", {}).get("items", {}).get("nodes", [])
-
-    result = []
-    for item in items:
-        content = item.get("content", {})
-        if content:
-            result.append({
-                "item_id": item["id"],
-                "issue_number": content.get("number"),
-                "title": content.get("title")
-            })
+    project_index = load_project_index(
+        run_graphql_query,
+        project_id=project_id,
+        cache_file=cache_file
+    )
 
-    return result
+    return [
+        {"item_id": item_id, "issue_number": issue_number}
+        for issue_number, item_id in project_index.items.items()
+    ]
 
 
 def update_item_field_value(project_id: str, item_id: str, field_id: str, option_id: str) -> None:
@@ -325,16 +299,17 @@ def set_field_values_for_issues(
     project_id: str,
     field_data: Dict[str, any],
     tasks_data: dict,
-    mapping_data: dict
+    mapping_data: dict,
+    cache_file: Path
 ) -> int:
     """各Issueにフィールド値を設定"""
     print()
     print("🔗 各Issueにフィールド値を設定中...")
 
     # プロジェクトアイテムを取得
-    project_items = get_project_items(project_id)
+    project_items = get_project_items(project_id, cache_file)
 
-    # Issue番号 -> アイテムIDのマッピングを作成
+    # Issue番号（文字列） -> アイテムIDのマッピングを作成
     issue_to_item = {item["issue_number"]: item["item_id"] for item in project_items}
 
     # 中カテゴリ名 -> オプションIDのマッピングを作成
@@ -359,7 +334,7 @@ def set_field_values_for_issues(
             continue
 
         # アイテムIDを取得
-        item_id = issue_to_item.get(issue_number)
+        item_id = issue_to_item.get(str(issue_number))
         if not item_id:
             print(f"  ⚠️  Issue #{issue_number}: プロジェクトアイテムが見つかりません")
             continue
@@ -428,7 +403,8 @@ def main():
         project["id"],
         field_data,
         tasks_data,
-        mapping_data
+        mapping_data,
+        project_root / ".cache" / "project-index.json"
     )
 
     # サマリーを表示
@@ -0,0 +1,174 @@
+"""
+スケジュールの自動生成
+
+tasks.json のタスク（effort / dependencies / priority / assignee）とプロジェクトの稼働日カレンダーから、
+schedule.json の全体（各タスクの startDate / endDate / weekNumber、weeklySchedule、criticalPath）を作ります。
+
+日程の決め方:
+    - 既定は resource_leveling のリストスケジューリングで、担当者の稼働能力（project.resources、
+      省略時は1名 × プロジェクトの稼働率）を守りながら、依存タスクが終わり次第開始する。
+      開始待ちのタスクを優先度付きキューで選ぶため O((V+E) log V)
+      （担当者の重複を許すと既存の schedule.json と同じ日程にならないので、こちらを既定にしている）
+    - resources=False なら担当者の稼働能力を考えず、トポロジカル順の前進計算1回で
+      最早日程を求める（各タスク・各依存関係を1度ずつ見るだけなので O(V+E)）
+    - 期間は 工数 ÷ 稼働率 を切り上げた稼働日数（土日・祝日・担当者の休業日は数えない）
+    - status が done / completed / in_progress のタスクは日付を動かさない
+      （日付は tasks.json のタスク、無ければ既存の schedule.json のタスクから取る）
+    - weekNumber はプロジェクト開始日を含む週（月曜始まり）を Week 1 とした週番号。
+      複数の週にまたがるタスクは "Week 3-4"
+    - criticalPath / slack は生成した日付（稼働日数）から求める
+      （critical_path.compute_scheduled_critical_path。update-schedule.py の再計算と同じ）
+
+schedule.json の他の項目:
+    - project: 既存の schedule.json の project（holidays, resources など）に tasks.json の project を重ねる
+    - milestones / risks: 既存の schedule.json の値。無ければ tasks.json の値
+    - metadata: 既存の schedule.json（無ければ tasks.json）の値で、updatedAt を生成日にする
+
+使用例:
+    schedule = generate_schedule(tasks_data, base_schedule=schedule_data)
+    schedule["tasks"][0]["weekNumber"]   # "Week 1"
+    schedule["criticalPath"]             # ["TASK-001", "TASK-005", ...]
+"""
+
+import copy
+from datetime import date
+from typing import Dict, Optional
+
+from critical_path import apply_critical_path, compute_scheduled_critical_path
+from resource_leveling import FIXED_STATUSES, LevelingResult, assignee_capacity, level_resources, task_effort
+from schedule_graph import topological_order
+from task_store import TaskStore
+from weekly_schedule import build_weekly_schedule
+from work_calendar import WorkCalendar, allocation_from_project, calendar_from_project, task_duration
+
+# 生成する項目（tasks.json のタスクにあっても使わない）
+SCHEDULED_FIELDS = ("startDate", "endDate", "weekNumber", "slack")
+
+
+def _project_start(store: TaskStore, project: Dict) -> str:
+    return project.get("startDate") or min(
+        (task["startDate"] for task in store if task.get("startDate")), default=date.today().isoformat()
+    )
+
+
+def forward_schedule(
+    store: TaskStore,
+    project: Dict,
+    calendar: Optional[WorkCalendar] = None
+) -> LevelingResult:
+    """
+    担当者の稼働能力を考えず、依存タスクが終わり次第開始する最早日程を求める（store のタスクは変更しない）
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+    """
+    calendar = calendar or calendar_from_project(project)
+    default_allocation = allocation_from_project(project)
+    hours_per_day = project.get("workingHoursPerDay") or 0
+    start_rank = calendar.rank(_project_start(store, project))
+
+    result = LevelingResult()
+    # タスクID → 終了日より後の最初の稼働日の番号（後続タスクが開始できる時刻）
+    finish: Dict[str, int] = {}
+    for task_id in topological_order(store):
+        task = store.get(task_id)
+        if task.get("status") in FIXED_STATUSES and task.get("startDate") and task.get("endDate"):
+            start = date.fromisoformat(task["startDate"])
+            end = date.fromisoformat(task["endDate"])
+        else:
+            ready = max((finish[dep_id] for dep_id in store.dependencies(task_id) if dep_id in finish), default=start_rank)
+            assignee = task.get("assignee")
+            allocation = assignee_capacity(project, assignee)[1] if assignee else default_allocation
+            task_calendar = calendar.for_assignee(assignee)
+            start = task_calendar.next_working_day(calendar.date_at(max(ready, start_rank)))
+            end = task_calendar.add_working_days(start, task_duration(task_effort(task, hours_per_day), allocation) - 1)
+
+        result.starts[task_id] = start.isoformat()
+        result.ends[task_id] = end.isoformat()
+        if task.get("startDate"):
+            result.delays[task_id] = calendar.working_day_shift(task["startDate"], start)
+        finish[task_id] = calendar.rank(end.toordinal() + 1)
+
+    result.finish_date = max(result.ends.values(), default=None)
+    return result
+
+
+def week_number(start: str, end: str, first_monday: int) -> str:
+    """タスクの期間の週番号（"Week 3" / "Week 3-4"）"""
+    first = (date.fromisoformat(start).toordinal() - first_monday) // 7 + 1
+    last = (date.fromisoformat(end).toordinal() - first_monday) // 7 + 1
+    return f"Week {first}" if first == last else f"Week {first}-{last}"
+
+
+def generate_schedule(
+    tasks_data: Dict,
+    base_schedule: Optional[Dict] = None,
+    calendar: Optional[WorkCalendar] = None,
+    resources: bool = True,
+    today: Optional[date] = None
+) -> Dict:
+    """
+    tasks.json から schedule.json のデータを作る（tasks_data / base_schedule は変更しない）
+
+    Args:
+        tasks_data: tasks.json のデータ
+        base_schedule: 既存の schedule.json のデータ（カレンダー・マイルストーン・リスク・完了済みタスクの日付を引き継ぐ）
+        calendar: 稼働日カレンダー（省略時は project から作る）
+        resources: False なら担当者の稼働能力を考えない前進計算で日程を決める
+        today: metadata.updatedAt に書く日付（省略時は今日）
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+    """
+    base_schedule = base_schedule or {}
+    project = {**copy.deepcopy(base_schedule.get("project", {})), **copy.deepcopy(tasks_data.get("project", {}))}
+    scheduled = {task["id"]: task for task in base_schedule.get("tasks", [])}
+
+    tasks = []
+    for source in tasks_data.get("tasks", []):
+        task = {key: copy.deepcopy(value) for key, value in source.items() if key not in SCHEDULED_FIELDS}
+        if task.get("status") in FIXED_STATUSES:
+            previous = source if source.get("startDate") and source.get("endDate") else scheduled.get(task["id"], {})
+            if previous.get("startDate") and previous.get("endDate"):
+                task["startDate"] = previous["startDate"]
+                task["endDate"] = previous["endDate"]
+        tasks.append(task)
+
+    store = TaskStore(tasks)
+    calendar = calendar or calendar_from_project(project)
+    if resources:
+        result = level_resources(store, project, calendar)
+    else:
+        result = forward_schedule(store, project, calendar)
+
+    project_start = _project_start(store, project)
+    start_ordinal = date.fromisoformat(project_start).toordinal()
+    first_monday = start_ordinal - date.fromordinal(start_ordinal).weekday()
+    for task in tasks:
+        task["startDate"] = result.starts[task["id"]]
+        task["endDate"] = result.ends[task["id"]]
+        task["weekNumber"] = week_number(task["startDate"], task["endDate"], first_monday)
+
+    if result.finish_date:
+        project.setdefault("estimatedEndDate", result.finish_date)
+        project.setdefault("workingDays", calendar.working_days_between(project_start, project["estimatedEndDate"]))
+
+    metadata = copy.deepcopy(base_schedule.get("metadata") or tasks_data.get("metadata") or {})
+    metadata["updatedAt"] = (today or date.today()).isoformat()
+
+    schedule = {
+        "project": project,
+        "tasks": tasks,
+        "milestones": copy.deepcopy(base_schedule.get("milestones", tasks_data.get("milestones", []))),
+        "weeklySchedule": build_weekly_schedule(tasks, project_start=project_start, calendar=calendar),
+        "criticalPath": [],
+        "risks": copy.deepcopy(base_schedule.get("risks", tasks_data.get("risks", []))),
+        "metadata": metadata
+    }
+    apply_critical_path(schedule, compute_scheduled_critical_path(store, calendar, project_start))
+
+    # 既存の schedule.json にだけある項目はそのまま残す
+    for key, value in base_schedule.items():
+        if key not in schedule:
+            schedule[key] = copy.deepcopy(value)
+    return schedule
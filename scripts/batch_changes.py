@@ -0,0 +1,105 @@
+"""
+スケジュール変更の一括指定ファイルの読み込み
+
+update-schedule.py --batch に渡すファイル（JSON Lines または YAML）を読み込み、
+操作のリストに正規化します。各変更はコマンドラインの1回分の指定と同じ項目で書きます。
+
+JSON Lines（1行1変更、# で始まる行と空行は無視）:
+    {"task": "TASK-007", "extend_deadline": 7}
+    {"task": "TASK-015", "start_date": "2026-02-10"}
+    {"task": "TASK-005", "priority": "high"}
+    {"task": "TASK-010", "action": "delete"}
+
+YAML（PyYAML が必要。リスト、または changes: の下にリスト）:
+    changes:
+      - {task: TASK-007, extend_deadline: 7}
+      - task: TASK-005
+        priority: high
+
+項目名はハイフン区切り（extend-deadline, start-date）でも構いません。
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    import yaml
+except ImportError:  # PyYAML はオプション（JSON Lines は標準ライブラリのみで読める）
+    yaml = None
+
+# 項目名 → 操作名
+OPERATION_KEYS = {
+    "extend_deadline": "extend_deadline",
+    "start_date": "start_date",
+    "priority": "priority",
+    "action": "delete",
+}
+
+YAML_SUFFIXES = {".yaml", ".yml"}
+
+
+def _normalize(raw: Dict, location: str) -> Dict:
+    """1件の変更を {"op", "task", "value", "location"} に正規化"""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{location}: 変更はオブジェクトで指定してください")
+    entry = {str(key).replace("-", "_"): value for key, value in raw.items()}
+
+    task_id = entry.pop("task", None)
+    if not task_id:
+        raise ValueError(f"{location}: task（タスクID）を指定してください")
+
+    operations = [key for key in entry if key in OPERATION_KEYS]
+    unknown = [key for key in entry if key not in OPERATION_KEYS]
+    if unknown:
+        raise ValueError(f"{location}: 不明な項目: {', '.join(unknown)}")
+    if len(operations) != 1:
+        raise ValueError(
+            f"{location}: 操作（extend_deadline, start_date, priority, action）を1つだけ指定してください"
+        )
+
+    key = operations[0]
+    value = entry[key]
+    if key == "action" and value != "delete":
+        raise ValueError(f"{location}: 無効な action: {value}（delete のみ指定できます）")
+    if key == "extend_deadline" and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ValueError(f"{location}: extend_deadline は日数（整数）で指定してください")
+
+    return {"op": OPERATION_KEYS[key], "task": str(task_id), "value": value, "location": location}
+
+
+def load_changes(path: Path) -> List[Dict]:
+    """
+    一括変更ファイルを読み込む
+
+    Returns:
+        [{"op": "extend_deadline"|"start_date"|"priority"|"delete", "task", "value", "location"}, ...]
+
+    Raises:
+        ValueError: 形式が不正な場合、または YAML ファイルで PyYAML が無い場合
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix.lower() in YAML_SUFFIXES:
+        if yaml is None:
+            raise ValueError("YAMLファイルの読み込みには PyYAML が必要です（pip install pyyaml）。JSON Lines 形式も使用できます")
+        document = yaml.safe_load(text) or []
+        if isinstance(document, dict):
+            document = document.get("changes", [])
+        if not isinstance(document, list):
+            raise ValueError(f"{path}: 変更のリストを指定してください")
+        return [_normalize(raw, f"{path.name} の{index}件目") for index, raw in enumerate(document, start=1)]
+
+    changes = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        location = f"{path.name}:{line_number}"
+        try:
+            raw = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{location}: JSONとして読み込めません: {e}")
+        changes.append(_normalize(raw, location))
+    return changes
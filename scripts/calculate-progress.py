@@ -11,87 +11,63 @@
 使い方:
     python3 scripts/calculate-progress.py
 
+    # プロジェクト期間の稼働日ごとのPV/EV/AC時系列（バーンアップチャート用）を出力
+    python3 scripts/calculate-progress.py --series progress-series.csv
+    python3 scripts/calculate-progress.py --series progress-series.json
+
+    # ルート以下の全プロジェクト（tasks.json）をまとめたポートフォリオレポートを出力
+    python3 scripts/calculate-progress.py --portfolio examples/ --portfolio-output PORTFOLIO.md
+
+    時系列のEV/ACには daily-report.py が記録した progress-history/ の履歴を使います
+    （履歴が無い日は空欄、今日は現在の tasks.json の値）。
+
 EVMの指標:
 - PV (Planned Value): 予定出来高（予定通りの進捗）
 - EV (Earned Value): 実績出来高（実際の進捗）
 - AC (Actual Cost): 実コスト（実際の工数）
 - SPI (Schedule Performance Index): スケジュール効率指数 = EV / PV
 - CPI (Cost Performance Index): コスト効率指数 = EV / AC
+
+計算は scripts/evm.py のEVMエンジンで行います。
 """
 
+import argparse
+import csv
 import json
 import os
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-
-def load_tasks() -> Dict:
-    """tasks.jsonを読み込む"""
-    with open('tasks.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def calculate_pv(task: Dict, current_date: datetime, start_date: datetime, end_date: datetime) -> float:
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from evm import TaskColumns, compute_evm, compute_evm_series
+from output_writer import get_writer
+from portfolio import load_portfolio, rollup_portfolio
+from snapshot_store import SnapshotStore, evm_actuals
+from task_model import load_project
+from work_calendar import WorkCalendar
+
+def calculate_all_progress(data: Dict, calendar: Optional[WorkCalendar] = None) -> Dict:
     """
-    Planned Value (予定出来高) を計算
+    全体・Phase別・中カテゴリ別の進捗を1回の走査でまとめて計算
 
-    現在日が開始日〜終了日の範囲内なら、経過日数に応じて線形に増加
-    """
-    if current_date < start_date:
-        return 0.0
-    elif current_date >= end_date:
-        return task.get('weight', 0)
-    else:
-        total_days = (end_date - start_date).days
-        elapsed_days = (current_date - start_date).days
-        if total_days == 0:
-            return task.get('weight', 0)
-        return task.get('weight', 0) * (elapsed_days / total_days)
+    calendar を渡すと、PVを稼働日の経過に応じて計算する（土日・祝日は増えない）。
 
-def calculate_ev(task: Dict) -> float:
-    """
-    Earned Value (実績出来高) を計算
-
-    ステータスに応じた完了率を適用
-    """
-    status = task.get('status', 'pending')
-    weight = task.get('weight', 0)
-
-    status_completion = {
-        'done': 1.0,
-        'completed': 1.0,
-        'in_progress': 0.5,
-        'pending': 0.0,
-        'not_started': 0.0,
-        'blocked': 0.0,
-        'cancelled': 0.0
-    }
-
-    return weight * status_completion.get(status, 0.0)
-
-def calculate_ac(task: Dict) -> float:
-    """
-    Actual Cost (実コスト) を計算
-
-    実工数が記録されていればそれを使用、なければ見積工数を使用
+    Returns:
+        {
+            'overall': 全体の指標,
+            'groups': {'phase': {Phase名: 指標}, 'midCategory': {中カテゴリ名: 指標}}
+        }
     """
-    actual_hours = task.get('actualHours', task.get('actual_hours', None))
-    if actual_hours is not None:
-        return actual_hours
-
-    # 実工数が無い場合、ステータスに応じて見積工数を使用
-    status = task.get('status', 'pending')
-    estimated_hours = task.get('effortHours', task.get('estimatedHours', task.get('estimated_hours', 0)))
-
-    if status in ['done', 'completed']:
-        return estimated_hours
-    elif status == 'in_progress':
-        return estimated_hours * 0.5
-    else:
-        return 0.0
+    return compute_evm(
+        data.get('tasks', []),
+        group_by={'phase': 'Unknown', 'midCategory': 'その他'},
+        calendar=calendar
+    )
 
-def calculate_overall_progress(data: Dict) -> Dict:
+def calculate_overall_progress(data: Dict, calendar: Optional[WorkCalendar] = None) -> Dict:
     """
-    全体の進捗を計算
+    全体の進捗を計算（calendar は calculate_all_progress と同じ）
 
     Returns:
         {
@@ -105,131 +81,84 @@ def calculate_overall_progress(data: Dict) -> Dict:
             'completion_rate': 完了率 (%)
         }
     """
-    tasks = data.get('tasks', [])
-    project = data.get('project', {})
-
-    current_date = datetime.now()
-
-    total_weight = sum(task.get('weight', 0) for task in tasks)
-    total_pv = 0.0
-    total_ev = 0.0
-    total_ac = 0.0
-
-    for task in tasks:
-        # 日付をパース
-        start_date_str = task.get('start_date') or task.get('startDate')
-        end_date_str = task.get('end_date') or task.get('endDate')
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-
-            total_pv += calculate_pv(task, current_date, start_date, end_date)
-
-        total_ev += calculate_ev(task)
-        total_ac += calculate_ac(task)
-
-    # SPI, CPIの計算
-    spi = total_ev / total_pv if total_pv > 0 else 0.0
-    cpi = total_ev / total_ac if total_ac > 0 else 0.0
-
-    # 進捗率と完了率
-    progress_rate = (total_ev / total_weight * 100) if total_weight > 0 else 0.0
-    completion_rate = (total_pv / total_weight * 100) if total_weight > 0 else 0.0
-
-    return {
-        'total_weight': total_weight,
-        'pv': total_pv,
-        'ev': total_ev,
-        'ac': total_ac,
-        'spi': spi,
-        'cpi': cpi,
-        'progress_rate': progress_rate,
-        'completion_rate': completion_rate,
-        'current_date': current_date.strftime('%Y-%m-%d')
-    }
-
-def calculate_phase_progress(data: Dict) -> Dict[str, Dict]:
-    """Phase別の進捗を計算"""
-    tasks = data.get('tasks', [])
-    phases = {}
-    current_date = datetime.now()
-
-    for task in tasks:
-        phase = task.get('phase', 'Unknown')
-        if phase not in phases:
-            phases[phase] = {
-                'tasks': [],
-                'total_weight': 0,
-                'pv': 0.0,
-                'ev': 0.0,
-                'ac': 0.0
-            }
-
-        phases[phase]['tasks'].append(task)
-        phases[phase]['total_weight'] += task.get('weight', 0)
-
-        # 日付をパース
-        start_date_str = task.get('start_date') or task.get('startDate')
-        end_date_str = task.get('end_date') or task.get('endDate')
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-            phases[phase]['pv'] += calculate_pv(task, current_date, start_date, end_date)
-
-        phases[phase]['ev'] += calculate_ev(task)
-        phases[phase]['ac'] += calculate_ac(task)
-
-    # SPI, CPI, 進捗率を計算
-    for phase, stats in phases.items():
-        stats['spi'] = stats['ev'] / stats['pv'] if stats['pv'] > 0 else 0.0
-        stats['cpi'] = stats['ev'] / stats['ac'] if stats['ac'] > 0 else 0.0
-        stats['progress_rate'] = (stats['ev'] / stats['total_weight'] * 100) if stats['total_weight'] > 0 else 0.0
-        del stats['tasks']  # タスクリストは不要なので削除
-
-    return phases
-
-def calculate_mid_category_progress(data: Dict) -> Dict[str, Dict]:
-    """中カテゴリ別の進捗を計算"""
-    tasks = data.get('tasks', [])
-    mid_categories = {}
-    current_date = datetime.now()
-
-    for task in tasks:
-        mid_cat = task.get('midCategory', 'その他')
-        if mid_cat not in mid_categories:
-            mid_categories[mid_cat] = {
-                'tasks': [],
-                'total_weight': 0,
-                'pv': 0.0,
-                'ev': 0.0,
-                'ac': 0.0
-            }
-
-        mid_categories[mid_cat]['tasks'].append(task)
-        mid_categories[mid_cat]['total_weight'] += task.get('weight', 0)
-
-        # 日付をパース
-        start_date_str = task.get('start_date') or task.get('startDate')
-        end_date_str = task.get('end_date') or task.get('endDate')
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-            mid_categories[mid_cat]['pv'] += calculate_pv(task, current_date, start_date, end_date)
-
-        mid_categories[mid_cat]['ev'] += calculate_ev(task)
-        mid_categories[mid_cat]['ac'] += calculate_ac(task)
-
-    # SPI, CPI, 進捗率を計算
-    for mid_cat, stats in mid_categories.items():
-        stats['spi'] = stats['ev'] / stats['pv'] if stats['pv'] > 0 else 0.0
-        stats['cpi'] = stats['ev'] / stats['ac'] if stats['ac'] > 0 else 0.0
-        stats['progress_rate'] = (stats['ev'] / stats['total_weight'] * 100) if stats['total_weight'] > 0 else 0.0
-        del stats['tasks']  # タスクリストは不要なので削除
-
-    return mid_categories
+    return compute_evm(data.get('tasks', []), group_by={}, calendar=calendar)['overall']
+
+def calculate_phase_progress(data: Dict, calendar: Optional[WorkCalendar] = None) -> Dict[str, Dict]:
+    """Phase別の進捗を計算（calendar は calculate_all_progress と同じ）"""
+    return compute_evm(data.get('tasks', []), group_by={'phase': 'Unknown'}, calendar=calendar)['groups']['phase']
+
+def calculate_mid_category_progress(data: Dict, calendar: Optional[WorkCalendar] = None) -> Dict[str, Dict]:
+    """中カテゴリ別の進捗を計算（calendar は calculate_all_progress と同じ）"""
+    return compute_evm(
+        data.get('tasks', []), group_by={'midCategory': 'その他'}, calendar=calendar
+    )['groups']['midCategory']
+
+def write_series(rows: List[Dict], path: str):
+    """EVM時系列をCSVまたはJSONで出力（拡張子で判定）"""
+    if path.endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['date', 'pv', 'pv_rate', 'ev', 'ac', 'spi', 'cpi'])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    key: '' if value is None else (round(value, 4) if isinstance(value, float) else value)
+                    for key, value in row.items()
+                })
+
+    print(f"✅ 進捗時系列を出力しました: {path}（{len(rows)}日分）")
+
+def write_portfolio_report(summaries: List[Dict], portfolio: Dict, root: str, path: str):
+    """ポートフォリオレポートをMarkdownで出力"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    lines = [
+        "# 📊 ポートフォリオ進捗レポート",
+        "",
+        f"**更新日時**: {today}  ",
+        f"**対象**: `{root}` 以下の {portfolio['project_count']} プロジェクト / {portfolio['task_count']} タスク",
+        "",
+        "## 全体進捗（予算加重）",
+        "",
+        f"{generate_progress_badge(portfolio['progress_rate'])} {generate_spi_badge(portfolio['spi'])} {generate_cpi_badge(portfolio['cpi'])}",
+        "",
+        "| 指標 | 値 | 説明 |",
+        "|------|-----|------|",
+        f"| **進捗率** | {portfolio['progress_rate']:.1f}% | 予算（見積工数）で重み付けした進捗率 |",
+        f"| **予算** | {portfolio['budget']:.1f}h | 全プロジェクトの見積工数の合計 |",
+        f"| **PV (予定出来高)** | {portfolio['pv']:.1f}h | スケジュール通りの進捗 |",
+        f"| **EV (実績出来高)** | {portfolio['ev']:.1f}h | 実際の進捗 |",
+        f"| **AC (実コスト)** | {portfolio['ac']:.1f}h | 実際の工数 |",
+        f"| **SPI (スケジュール効率)** | {portfolio['spi']:.2f} | 1.0以上で予定より進んでいる |",
+        f"| **CPI (コスト効率)** | {portfolio['cpi']:.2f} | 1.0以上で予算内で進んでいる |",
+        "",
+        "## プロジェクト別進捗",
+        "",
+        "| プロジェクト | パス | タスク数 | 予算 | 進捗率 | SPI | CPI | ステータス |",
+        "|-------------|------|---------|------|--------|-----|-----|-----------|"
+    ]
+
+    errors = []
+    for summary in sorted(summaries, key=lambda s: s['path']):
+        if 'error' in summary:
+            errors.append(summary)
+            continue
+        stats = summary['overall']
+        status_emoji = "✅" if stats['progress_rate'] >= 100 else "🔄" if stats['progress_rate'] >= 50 else "📝"
+        lines.append(
+            f"| {summary['name']} | `{os.path.relpath(summary['path'], root)}` | {summary['task_count']} | "
+            f"{summary['budget']:.1f}h | {stats['progress_rate']:.1f}% | {stats['spi']:.2f} | {stats['cpi']:.2f} | {status_emoji} |"
+        )
+
+    if errors:
+        lines += ["", "## ⚠️ 読み込めなかったプロジェクト", ""]
+        lines += [f"- `{os.path.relpath(summary['path'], root)}`: {summary['error']}" for summary in errors]
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    print(f"✅ ポートフォリオレポートを出力しました: {path}")
 
 def generate_progress_badge(progress_rate: float) -> str:
     """
@@ -348,23 +277,67 @@ def update_readme(overall: Dict, phases: Dict, mid_categories: Dict, project_nam
         lines.insert(insert_index, '\n' + progress_section + '\n')
         content = '\n'.join(lines)
 
-    with open('README.md', 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    print("✅ README.mdに進捗情報を更新しました")
+    if get_writer().write('README.md', content):
+        print("✅ README.mdに進捗情報を更新しました")
+    else:
+        print("✅ README.mdの進捗情報に変更はありません（書き込みを省略）")
 
 def main():
     """メイン処理"""
+    parser = argparse.ArgumentParser(description='EVM方式で進捗を計算してREADME.mdに埋め込む')
+    parser.add_argument('--series', metavar='PATH',
+                        help='稼働日ごとのPV/EV/AC時系列をCSV（.json ならJSON）で出力して終了')
+    parser.add_argument('--history-dir', default='progress-history',
+                        help='--series の実績に使う進捗スナップショットの保存先')
+    parser.add_argument('--portfolio', metavar='ROOT',
+                        help='ROOT以下の全プロジェクトを集計してポートフォリオレポートを出力して終了')
+    parser.add_argument('--portfolio-output', default='PORTFOLIO.md',
+                        help='ポートフォリオレポートの出力先（デフォルト: PORTFOLIO.md）')
+    parser.add_argument('--workers', type=int, help='ポートフォリオ集計のワーカープロセス数（デフォルト: CPU数）')
+    args = parser.parse_args()
+
     print("📊 進捗計算を開始します...")
 
-    # tasks.jsonを読み込み
-    data = load_tasks()
+    if args.portfolio:
+        summaries = load_portfolio(args.portfolio, workers=args.workers)
+        if not summaries:
+            print(f"❌ {args.portfolio} 以下に tasks.json が見つかりません")
+            sys.exit(1)
+        portfolio = rollup_portfolio(summaries)
+        print(f"\n【ポートフォリオ】{portfolio['project_count']}プロジェクト")
+        print(f"全体進捗率: {portfolio['progress_rate']:.1f}%")
+        print(f"SPI: {portfolio['spi']:.2f} (スケジュール効率)")
+        print(f"CPI: {portfolio['cpi']:.2f} (コスト効率)")
+        write_portfolio_report(summaries, portfolio, args.portfolio, args.portfolio_output)
+        return
+
+    # tasks.jsonを読み込み（日付はschedule.jsonから補う）
+    model = load_project()
+    data = model.data
+    schedule = model.schedule
     project_name = data.get('project', {}).get('name', 'Unknown Project')
 
-    # 進捗を計算
-    overall = calculate_overall_progress(data)
-    phases = calculate_phase_progress(data)
-    mid_categories = calculate_mid_category_progress(data)
+    if args.series:
+        project = {**schedule.get('project', {}), **data.get('project', {})}
+        # 履歴の実績に今日の現在値を重ねる
+        actuals = evm_actuals(SnapshotStore(args.history_dir))
+        columns = TaskColumns(data.get('tasks', []), group_by={})
+        actuals[datetime.now().strftime('%Y-%m-%d')] = {'ev': sum(columns.ev), 'ac': sum(columns.ac)}
+        rows = compute_evm_series(
+            data.get('tasks', []),
+            project['startDate'],
+            project.get('estimatedEndDate') or project['startDate'],
+            actuals=actuals,
+            calendar=model.calendar
+        )
+        write_series(rows, args.series)
+        return
+
+    # 進捗を計算（全体・Phase別・中カテゴリ別を1回の走査で集計）
+    progress = calculate_all_progress(data, model.calendar)
+    overall = progress['overall']
+    phases = progress['groups']['phase']
+    mid_categories = progress['groups']['midCategory']
 
     # 結果を表示
     print(f"\n【{project_name}】")
@@ -0,0 +1,351 @@
+"""
+変更ジャーナル（先行書き込みログ）
+
+スケジュール更新のたびに全ファイルを .backups/ にコピーする代わりに、1回の操作で変わった
+レコード（タスク・トップレベルの項目・Issueマッピングの各エントリ）の変更前後の値だけを
+.journal/changes.jsonl に追記します。
+
+書き込みの順序:
+    1. 変更内容（変更前後の値）をジャーナルに追記して fsync（pending）
+    2. tasks.json / schedule.json / github-issue-mapping.json を書き込む
+    3. ジャーナルに commit を追記
+
+2と3の間でプロセスが止まった場合は、次回起動時に最後の pending のエントリを変更前の値で巻き戻します。
+コミット済みの操作は新しい順に1つずつ取り消せます（取り消しもジャーナルに記録されます）。
+ジャーナルが MAX_JOURNAL_BYTES を超えると、新しい KEEP_ENTRIES 件だけを残して圧縮します。
+
+ジャーナルの1行（エントリ）:
+    {"op": 12, "time": "2026-02-03T10:15:00", "label": "TASK-007: 終了日 ...", "undoes": null,
+     "changes": [{"source": "schedule", "key": "task:TASK-007", "index_before": 6, "index_after": 6,
+                  "before": {...}, "after": {...}}, ...]}
+    {"op": 12, "status": "committed"}
+
+使用例:
+    before = snapshot(sources)
+    ...（sources を変更）...
+    changes = diff(before, sources)
+    op = journal.append("TASK-007 の期限延長", changes)
+    （ファイルを書き込む）
+    journal.mark(op, "committed")
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+JOURNAL_FILE = Path(".journal") / "changes.jsonl"
+
+# このサイズを超えたら古いエントリを圧縮する
+MAX_JOURNAL_BYTES = 2 * 1024 * 1024
+KEEP_ENTRIES = 100
+
+# 最後の行を読むときに末尾から読み込む単位
+TAIL_CHUNK = 64 * 1024
+
+# エントリの状態
+PENDING = "pending"
+COMMITTED = "committed"
+ROLLED_BACK = "rolled_back"
+
+# sources: {"tasks": tasks.json, "schedule": schedule.json, "mapping": github-issue-mapping.json}
+Sources = Dict[str, Dict]
+# snapshot: ソース名 → レコードキー → (位置, JSON文字列)
+Snapshot = Dict[str, Dict[str, Tuple[int, str]]]
+
+
+def _dumps(value) -> str:
+    # キーの順序は並べ替えない（取り消したときにファイル内の項目の順序を保つため）
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _records(data: Dict):
+    """
+    データをレコードに分解して (キー, 位置, 値) を返す
+
+    "tasks" のリストはタスクIDごと（task:<ID>）、それ以外のトップレベルの項目は
+    項目ごと（field:<名前>）のレコードとする。
+    """
+    for name, value in data.items():
+        if name == "tasks" and isinstance(value, list):
+            for index, task in enumerate(value):
+                yield f"task:{task['id']}", index, task
+        else:
+            yield f"field:{name}", 0, value
+
+
+def snapshot(sources: Sources) -> Snapshot:
+    """変更前の状態を記録（各レコードをJSON文字列にして保持）"""
+    return {
+        source: {key: (index, _dumps(value)) for key, index, value in _records(data)}
+        for source, data in sources.items()
+    }
+
+
+def diff(before: Snapshot, sources: Sources) -> List[Dict]:
+    """snapshot からの変更を、変わったレコードの変更前後の値のリストにする"""
+    changes = []
+    for source, data in sources.items():
+        old_records = before.get(source, {})
+        seen = set()
+        for key, index, value in _records(data):
+            seen.add(key)
+            old = old_records.get(key)
+            encoded = _dumps(value)
+            if old is not None and old[1] == encoded:
+                continue
+            change = {"source": source, "key": key, "index_after": index, "after": json.loads(encoded)}
+            if old is not None:
+                change["index_before"] = old[0]
+                change["before"] = json.loads(old[1])
+            changes.append(change)
+
+        # 削除されたレコード
+        for key, (index, encoded) in old_records.items():
+            if key not in seen:
+                changes.append({"source": source, "key": key, "index_before": index, "before": json.loads(encoded)})
+    return changes
+
+
+def _find_task(tasks: List[Dict], task_id: str) -> Optional[int]:
+    for index, task in enumerate(tasks):
+        if task.get("id") == task_id:
+            return index
+    return None
+
+
+def current_value(sources: Sources, change: Dict):
+    """変更対象のレコードの現在の値（存在しない場合は KeyError）"""
+    data = sources[change["source"]]
+    kind, _, name = change["key"].partition(":")
+    if kind == "field":
+        return data[name]
+    position = _find_task(data.get("tasks", []), name)
+    if position is None:
+        raise KeyError(change["key"])
+    return data["tasks"][position]
+
+
+def conflicts(sources: Sources, changes: List[Dict]) -> List[str]:
+    """現在の値が変更後の値と異なるレコード（取り消すと後の変更を上書きしてしまうもの）"""
+    conflicting = []
+    for change in changes:
+        try:
+            current = _dumps(current_value(sources, change))
+        except KeyError:
+            current = None
+        expected = _dumps(change["after"]) if "after" in change else None
+        if current != expected:
+            conflicting.append(f"{change['source']}:{change['key']}")
+    return conflicting
+
+
+def apply_changes(sources: Sources, changes: List[Dict], side: str = "before"):
+    """
+    変更前（side="before"）または変更後（side="after"）の値を sources に書き戻す
+
+    タスクの削除を先に行い、追加するタスクは記録された位置に挿入する。
+    """
+    inserts: Dict[str, List[Tuple[int, Dict]]] = {}
+    for change in changes:
+        data = sources[change["source"]]
+        kind, _, name = change["key"].partition(":")
+        present = side in change
+        value = change.get(side)
+
+        if kind == "field":
+            if present:
+                data[name] = value
+            else:
+                data.pop(name, None)
+            continue
+
+        tasks = data.setdefault("tasks", [])
+        position = _find_task(tasks, name)
+        if not present:
+            if position is not None:
+                del tasks[position]
+        elif position is not None:
+            tasks[position] = value
+        else:
+            inserts.setdefault(change["source"], []).append((change.get(f"index_{side}", len(tasks)), value))
+
+    for source, items in inserts.items():
+        tasks = sources[source]["tasks"]
+        for index, value in sorted(items, key=lambda item: item[0]):
+            tasks.insert(min(index, len(tasks)), value)
+
+
+class ChangeJournal:
+    """変更ジャーナル（JSON Lines、追記のみ）"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    # ------------------------------------------------------------------
+    # 書き込み
+    # ------------------------------------------------------------------
+
+    def _append_line(self, record: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _repair_tail(self):
+        """書き込み途中で止まった最後の行（改行で終わっていない行）を取り除く"""
+        try:
+            with open(self.path, "rb+") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                if size == 0:
+                    return
+                f.seek(size - 1)
+                if f.read(1) == b"\n":
+                    return
+                position = size
+                while position > 0:
+                    step = min(TAIL_CHUNK, position)
+                    position -= step
+                    f.seek(position)
+                    newline = f.read(step).rfind(b"\n")
+                    if newline >= 0:
+                        f.truncate(position + newline + 1)
+                        return
+                f.truncate(0)
+        except FileNotFoundError:
+            pass
+
+    def append(self, label: str, changes: List[Dict], undoes: Optional[int] = None) -> int:
+        """変更内容を pending として記録（ファイルを書き込む前に呼ぶ）"""
+        self._repair_tail()
+        if self.path.exists() and self.path.stat().st_size > MAX_JOURNAL_BYTES:
+            self.compact()
+
+        last = self._last_record()
+        op = last["op"] + 1 if last else 1
+        self._append_line({
+            "op": op,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "label": label,
+            "undoes": undoes,
+            "changes": changes
+        })
+        return op
+
+    def mark(self, op: int, status: str):
+        """エントリの状態を記録（committed / rolled_back）"""
+        self._append_line({"op": op, "status": status})
+
+    # ------------------------------------------------------------------
+    # 読み込み
+    # ------------------------------------------------------------------
+
+    def _last_record(self) -> Optional[Dict]:
+        """最後の行だけを末尾から読む"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            tail = b""
+            while position > 0:
+                step = min(TAIL_CHUNK, position)
+                position -= step
+                f.seek(position)
+                tail = f.read(step) + tail
+                lines = tail.rstrip(b"\n").split(b"\n")
+                if len(lines) > 1 or position == 0:
+                    try:
+                        return json.loads(lines[-1]) if lines[-1] else None
+                    except json.JSONDecodeError:
+                        return None
+        return None
+
+    def entries(self) -> List[Dict]:
+        """全エントリ（古い順、status と undone_by を解決済み）"""
+        entries: Dict[int, Dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if "changes" in record:
+                        record.setdefault("status", PENDING)
+                        entries[record["op"]] = record
+                    elif record.get("op") in entries:
+                        entries[record["op"]]["status"] = record["status"]
+        except FileNotFoundError:
+            return []
+
+        for entry in entries.values():
+            target = entries.get(entry.get("undoes"))
+            if target is not None and entry["status"] == COMMITTED:
+                target["undone_by"] = entry["op"]
+        return [entries[op] for op in sorted(entries)]
+
+    def pending(self) -> Optional[Dict]:
+        """コミットされずに残った最後のエントリ（前回の処理が途中で止まった場合）"""
+        last = self._last_record()
+        if last is None or "changes" not in last or last.get("status", PENDING) != PENDING:
+            return None
+        return last
+
+    def undo_candidate(self, op: Optional[int] = None) -> Dict:
+        """
+        取り消す操作を選ぶ（op 省略時は取り消されていない最新の操作）
+
+        Raises:
+            ValueError: 取り消せる操作が無い場合
+        """
+        candidates = [
+            entry for entry in self.entries()
+            if entry["status"] == COMMITTED and "undone_by" not in entry and entry.get("undoes") is None
+        ]
+        if op is None:
+            if not candidates:
+                raise ValueError("取り消せる変更がありません")
+            return candidates[-1]
+        for entry in candidates:
+            if entry["op"] == op:
+                return entry
+        raise ValueError(f"#{op} は取り消せません（存在しない・コミットされていない・取り消し済みのいずれか）")
+
+    # ------------------------------------------------------------------
+    # 圧縮
+    # ------------------------------------------------------------------
+
+    def compact(self, keep: int = KEEP_ENTRIES) -> int:
+        """
+        新しい keep 件のエントリだけを残して書き直す（状態はエントリの行にまとめる）
+
+        Returns:
+            削除したエントリ数
+        """
+        entries = self.entries()
+        removed = max(len(entries) - keep, 0)
+        lines = []
+        for entry in entries[removed:]:
+            entry.pop("undone_by", None)
+            lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return removed
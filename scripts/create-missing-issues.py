@@ -12,17 +12,13 @@ import subprocess
 import sys
 from pathlib import Path
 
+from gh_client import get_client
+
 
 def run_gh_command(command):
-    """GitHub CLIコマンドを実行"""
+    """GitHub CLIコマンドを実行（プロセス内APIクライアント経由）"""
     try:
-        result = subprocess.run(
-            ["gh"] + command,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
+        return get_client().run_gh_command(command)
     except subprocess.CalledProcessError as e:
         print(f"ERROR: {e.stderr}")
         raise
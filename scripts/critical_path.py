@@ -0,0 +1,155 @@
+"""
+クリティカルパス分析（CPM）
+
+タスクの effort（日）と dependencies から、トポロジカル順の前進計算で
+最早開始・最早終了、後退計算で最遅開始・最遅終了を求め、
+総余裕（トータルフロート）が0のタスクをクリティカルパスとします。
+どちらの計算も各タスク・各依存関係を1度ずつ見るだけなので O(V+E) です。
+
+compute_critical_path の日数はプロジェクト開始からの工数日（カレンダー日ではない）です。
+日付の決まったスケジュールには compute_scheduled_critical_path を使います。各タスクの期間を
+startDate〜endDate の稼働日数とし、日付を動かせないタスク（status が done / completed / in_progress）と
+先行タスクの無いタスクは startDate より前に始められないものとして計算するので、日数は
+プロジェクト開始からの稼働日になります。期限延長などで余裕を超えて長くなったタスクは、
+後続タスクを押し出してクリティカルパスに乗ります。
+
+使用例:
+    store = TaskStore(schedule_data["tasks"])
+    result = compute_scheduled_critical_path(store, calendar, project_start="2026-01-06")
+    result.critical_path      # ["TASK-001", "TASK-005", ...]
+    result.slack["TASK-014"]  # 12（稼働日）
+    apply_critical_path(schedule_data, result)
+
+    # TASK-014 を余裕（12稼働日）を超えて延長すると、TASK-015 を押し出してクリティカルパスに乗る
+    # （update-schedule.py --task TASK-014 --extend-deadline 30 の後は slack が0になる）
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from schedule_graph import topological_order
+from task_store import TaskStore
+from work_calendar import WorkCalendar
+
+# 浮動小数点の誤差を吸収するための許容値（工数は0.5日単位）
+EPSILON = 1e-9
+
+# 日付を動かさないタスクの status
+FIXED_STATUSES = {"done", "completed", "in_progress"}
+
+
+class CriticalPathResult:
+    """CPMの計算結果"""
+
+    def __init__(self):
+        self.early_start: Dict[str, float] = {}
+        self.early_finish: Dict[str, float] = {}
+        self.late_start: Dict[str, float] = {}
+        self.late_finish: Dict[str, float] = {}
+        self.slack: Dict[str, float] = {}
+        self.critical_path: List[str] = []
+        self.project_duration: float = 0.0
+
+    def is_critical(self, task_id: str) -> bool:
+        return task_id in self.slack and self.slack[task_id] <= EPSILON
+
+
+def _effort(task: Dict) -> float:
+    return float(task.get("effort", 0) or 0)
+
+
+def compute_critical_path(
+    store: TaskStore,
+    duration: Optional[Callable[[Dict], float]] = None,
+    release: Optional[Callable[[Dict], Optional[float]]] = None
+) -> CriticalPathResult:
+    """
+    全タスクの最早・最遅日程と総余裕を計算
+
+    Args:
+        store: タスクストア
+        duration: タスクの所要日数を返す関数（省略時は effort）
+        release: タスクを開始できる最も早い日（プロジェクト開始からの日数、制約が無ければ None）を返す関数
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+    """
+    duration = duration or _effort
+    order = topological_order(store)
+    result = CriticalPathResult()
+
+    # 前進計算: 最早開始 = 先行タスクの最早終了の最大値
+    for task_id in order:
+        early_start = max(
+            (result.early_finish[dep_id] for dep_id in store.dependencies(task_id) if dep_id in store),
+            default=0.0
+        )
+        if release is not None:
+            early_start = max(early_start, release(store.get(task_id)) or 0.0)
+        result.early_start[task_id] = early_start
+        result.early_finish[task_id] = early_start + duration(store.get(task_id))
+
+    result.project_duration = max(result.early_finish.values(), default=0.0)
+
+    # 後退計算: 最遅終了 = 後続タスクの最遅開始の最小値
+    for task_id in reversed(order):
+        late_finish = min(
+            (result.late_start[dependent_id] for dependent_id in store.dependents(task_id)),
+            default=result.project_duration
+        )
+        result.late_finish[task_id] = late_finish
+        result.late_start[task_id] = late_finish - duration(store.get(task_id))
+        result.slack[task_id] = round(result.late_start[task_id] - result.early_start[task_id], 6)
+
+    result.critical_path = [task_id for task_id in order if result.is_critical(task_id)]
+    return result
+
+
+def compute_scheduled_critical_path(
+    store: TaskStore,
+    calendar: WorkCalendar,
+    project_start: Optional[str] = None
+) -> CriticalPathResult:
+    """
+    タスクの startDate / endDate から、稼働日単位で最早・最遅日程と総余裕を計算
+
+    日付を動かせないタスクと先行タスクの無いタスクは startDate を最早開始の下限とし、
+    それ以外のタスクは先行タスクが終わり次第開始できるものとする（日付の間の空きは余裕になる）。
+    日付の無いタスクは effort の日数とする。
+
+    Args:
+        store: タスクストア
+        calendar: 稼働日カレンダー
+        project_start: プロジェクト開始日（省略時は最も早いタスクの開始日）
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+    """
+    project_start = project_start or min((task["startDate"] for task in store if task.get("startDate")), default=None)
+    if project_start is None:
+        return compute_critical_path(store)
+    base = calendar.rank(project_start)
+
+    def duration(task: Dict) -> float:
+        if task.get("startDate") and task.get("endDate"):
+            return calendar.working_days_between(task["startDate"], task["endDate"])
+        return _effort(task)
+
+    def release(task: Dict) -> Optional[float]:
+        if not task.get("startDate"):
+            return None
+        has_predecessor = any(dep_id in store for dep_id in store.dependencies(task["id"]))
+        if task.get("status") in FIXED_STATUSES or not has_predecessor:
+            return calendar.rank(task["startDate"]) - base
+        return None
+
+    return compute_critical_path(store, duration=duration, release=release)
+
+
+def apply_critical_path(schedule_data: Dict, result: CriticalPathResult):
+    """計算結果を schedule.json のデータに書き込む（criticalPath と各タスクの slack）"""
+    schedule_data["criticalPath"] = list(result.critical_path)
+    for task in schedule_data.get("tasks", []):
+        if task["id"] in result.slack:
+            slack = result.slack[task["id"]]
+            # effort と同じく整数日は整数で保存する
+            task["slack"] = int(slack) if slack == int(slack) else slack
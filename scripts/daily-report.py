@@ -18,12 +18,17 @@
     # GitHub Issueに投稿
     python3 scripts/daily-report.py --github --issue-number 1
 
+    # 進捗スナップショットを記録しない
+    python3 scripts/daily-report.py --no-snapshot
+
+実行のたびに各タスクの status / actualHours を progress-history/ に記録します
+（scripts/snapshot_store.py）。記録は calculate-progress.py --series の実績に使われます。
+
 環境変数:
     GITHUB_REPOSITORY: GitHubリポジトリ (例: owner/repo)
     GITHUB_TOKEN: GitHub Personal Access Token
 """
 
-import json
 import os
 import sys
 import argparse
@@ -31,10 +36,16 @@ import subprocess
 from datetime import datetime, timedelta
 from typing import Dict, List
 
+from evm import STATUS_COMPLETION
+from gh_client import get_client
+from snapshot_store import SnapshotStore
+from task_model import load_project
+
+DEFAULT_HISTORY_DIR = 'progress-history'
+
 def load_tasks() -> Dict:
-    """tasks.jsonを読み込む"""
-    with open('tasks.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """tasks.jsonを読み込む（日付はschedule.jsonから補い、startDate / endDate に正規化済み）"""
+    return load_project().data
 
 def get_status_emoji(status: str) -> str:
     """ステータスに応じた絵文字を返す"""
@@ -54,17 +65,7 @@ def calculate_ev(task: Dict) -> float:
     status = task.get('status', 'pending')
     weight = task.get('weight', 0)
 
-    status_completion = {
-        'done': 1.0,
-        'completed': 1.0,
-        'in_progress': 0.5,
-        'pending': 0.0,
-        'not_started': 0.0,
-        'blocked': 0.0,
-        'cancelled': 0.0
-    }
-
-    return weight * status_completion.get(status, 0.0)
+    return weight * STATUS_COMPLETION.get(status, 0.0)
 
 def calculate_progress(data: Dict) -> Dict:
     """進捗を計算"""
@@ -105,25 +106,9 @@ def get_tasks_by_status(tasks: List[Dict], status_list: List[str]) -> List[Dict]
 
 def get_today_tasks(tasks: List[Dict]) -> List[Dict]:
     """今日が開始日または終了日のタスクを取得"""
-    today = datetime.now().date()
-    today_tasks = []
-
-    for task in tasks:
-        start_date_str = task.get('start_date') or task.get('startDate')
-        end_date_str = task.get('end_date') or task.get('endDate')
-
-        if start_date_str:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            if start_date == today:
-                today_tasks.append(task)
-                continue
-
-        if end_date_str:
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            if end_date == today:
-                today_tasks.append(task)
-
-    return today_tasks
+    # 日付は読み込み時に YYYY-MM-DD へ正規化済みなので文字列のまま比較できる
+    today = datetime.now().strftime('%Y-%m-%d')
+    return [task for task in tasks if today in (task.get('startDate'), task.get('endDate'))]
 
 def generate_report(data: Dict) -> str:
     """日次レポートを生成"""
@@ -243,15 +228,15 @@ def post_to_github_issue(report: str, issue_number: int):
         print("エラー: GITHUB_REPOSITORY 環境変数が設定されていません", file=sys.stderr)
         sys.exit(1)
 
-    # gh CLI を使用してコメントを投稿
+    # gh CLI互換のAPIクライアントでコメントを投稿
     cmd = [
-        'gh', 'issue', 'comment', str(issue_number),
+        'issue', 'comment', str(issue_number),
         '--repo', repo,
         '--body', report
     ]
 
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        get_client().run_gh_command(cmd)
         print(f"✅ GitHub Issue #{issue_number} にレポートを投稿しました")
         print(f"URL: https://github.com/{repo}/issues/{issue_number}")
     except subprocess.CalledProcessError as e:
@@ -259,18 +244,34 @@ def post_to_github_issue(report: str, issue_number: int):
         print(e.stderr, file=sys.stderr)
         sys.exit(1)
 
+def record_snapshot(data: Dict, history_dir: str = DEFAULT_HISTORY_DIR):
+    """進捗スナップショットを記録（前回からの差分のみ）"""
+    stats = calculate_progress(data)
+    record = SnapshotStore(history_dir).append(
+        data.get('tasks', []),
+        metrics={'progress_rate': round(stats['progress_rate'], 2)}
+    )
+    print(f"📝 進捗スナップショットを記録しました（{len(record['tasks'])}タスク分）", file=sys.stderr)
+
 def main():
     """メイン処理"""
     parser = argparse.ArgumentParser(description='日次進捗レポートを生成')
     parser.add_argument('--output', '-o', help='出力ファイル名')
     parser.add_argument('--github', action='store_true', help='GitHub Issueに投稿')
     parser.add_argument('--issue-number', type=int, help='GitHub Issue番号')
+    parser.add_argument('--history-dir', default=DEFAULT_HISTORY_DIR,
+                        help=f'進捗スナップショットの保存先（デフォルト: {DEFAULT_HISTORY_DIR}）')
+    parser.add_argument('--no-snapshot', action='store_true', help='進捗スナップショットを記録しない')
 
     args = parser.parse_args()
 
     # tasks.jsonを読み込み
     data = load_tasks()
 
+    # 進捗スナップショットを記録（前回からの差分のみ）
+    if not args.no_snapshot:
+        record_snapshot(data, args.history_dir)
+
     # レポートを生成
     report = generate_report(data)
 
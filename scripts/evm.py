@@ -0,0 +1,319 @@
+"""
+EVM（出来高管理）計算エンジン
+
+タスク一覧を1度だけ列形式（開始日・終了日の序数、ウェイト、EV・ACの値、グループキー）に
+変換し、全体・Phase別・中カテゴリ別など任意のグループのPV/EV/AC/SPI/CPIを
+1回の走査でまとめて集計します。
+
+使用例:
+    result = compute_evm(data['tasks'], group_by={'phase': 'Unknown', 'midCategory': 'その他'})
+    result['overall']['spi']
+    result['groups']['phase']['Phase 1']['progress_rate']
+
+    # プロジェクト期間の稼働日ごとのPV（S字カーブ）と、実績のある日のEV/AC
+    rows = compute_evm_series(data['tasks'], '2026-01-06', '2026-03-30', holidays=['2026-01-12'])
+
+    # 稼働日カレンダーを渡すと、PVは稼働日の経過に応じて増える（土日・祝日は横ばい）
+    result = compute_evm(data['tasks'], calendar=calendar_from_project(schedule['project']))
+
+EVMの指標:
+- PV (Planned Value): 予定出来高。開始日〜終了日の間は経過日数（カレンダー指定時は経過稼働日数）に応じて線形に増加
+- EV (Earned Value): 実績出来高。ウェイト × ステータスごとの完了率
+- AC (Actual Cost): 実コスト。actualHours があればその値、なければ見積工数 × ステータスごとの係数
+- SPI = EV / PV, CPI = EV / AC
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from work_calendar import WorkCalendar
+
+# ステータスごとの完了率（EV）
+STATUS_COMPLETION = {
+    'done': 1.0,
+    'completed': 1.0,
+    'in_progress': 0.5,
+    'pending': 0.0,
+    'not_started': 0.0,
+    'blocked': 0.0,
+    'cancelled': 0.0
+}
+
+# 実工数が無い場合に見積工数へ掛ける係数（AC）
+STATUS_COST_FACTOR = {
+    'done': 1.0,
+    'completed': 1.0,
+    'in_progress': 0.5
+}
+
+# 既定の集計キーと、値が無いタスクの分類名
+DEFAULT_GROUP_BY = {
+    'phase': 'Unknown',
+    'midCategory': 'その他'
+}
+
+
+def _date_ordinal(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    return date.fromisoformat(value).toordinal()
+
+
+class TaskColumns:
+    """
+    EVM計算用にタスクを列形式へ変換したもの（日付の解析は1度だけ）
+
+    calendar を渡すと、PVの計算では日付を稼働日の番号に置き換える（番号の差が稼働日数）。
+    開始日は以降で最初の稼働日、終了日と基準日はそれ以前で最後の稼働日の番号になる。
+    """
+
+    def __init__(self, tasks: List[Dict], group_by: Optional[Dict[str, str]] = None,
+                 calendar: Optional[WorkCalendar] = None):
+        group_by = DEFAULT_GROUP_BY if group_by is None else group_by
+        self.calendar = calendar
+        self.ids: List[str] = []
+        self.weights: List[float] = []
+        self.starts: List[Optional[int]] = []
+        self.ends: List[Optional[int]] = []
+        self.ev: List[float] = []
+        self.ac: List[float] = []
+        self.groups: Dict[str, List[str]] = {key: [] for key in group_by}
+
+        for task in tasks:
+            status = task.get('status', 'pending')
+            weight = task.get('weight', 0)
+
+            self.ids.append(task.get('id', ''))
+            self.weights.append(weight)
+            self.starts.append(_date_ordinal(task.get('start_date') or task.get('startDate')))
+            self.ends.append(_date_ordinal(task.get('end_date') or task.get('endDate')))
+            self.ev.append(weight * STATUS_COMPLETION.get(status, 0.0))
+
+            actual_hours = task.get('actualHours', task.get('actual_hours', None))
+            if actual_hours is None:
+                estimated_hours = task.get('effortHours', task.get('estimatedHours', task.get('estimated_hours', 0)))
+                actual_hours = estimated_hours * STATUS_COST_FACTOR.get(status, 0.0)
+            self.ac.append(actual_hours)
+
+            for key, default in group_by.items():
+                self.groups[key].append(task.get(key) or default)
+
+        # PVの計算に使う位置（カレンダー指定時は稼働日の番号）
+        if calendar is None:
+            self.start_positions = self.starts
+            self.end_positions = self.ends
+        else:
+            self.start_positions = [None if day is None else calendar.rank(day) for day in self.starts]
+            self.end_positions = [None if day is None else self._position(day) for day in self.ends]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _position(self, day: int) -> int:
+        """日付（序数）の位置。カレンダー指定時は day 以前で最後の稼働日の番号"""
+        if self.calendar is None:
+            return day
+        return self.calendar.rank(day + 1) - 1
+
+    def planned_value_series(self, first_day: int, last_day: int) -> List[float]:
+        """
+        first_day〜last_day（序数、両端を含む）の各日の全タスク合計PV
+
+        カレンダー指定時は稼働日の番号の上で計算し、非稼働日は直前の稼働日と同じ値になる。
+        """
+        if last_day < first_day:
+            return []
+        if self.calendar is None:
+            return self._series(first_day, last_day)
+
+        first = self._position(first_day)
+        values = self._series(first, self._position(last_day))
+        return [values[self._position(day) - first] for day in range(first_day, last_day + 1)]
+
+    def _series(self, first: int, last: int) -> List[float]:
+        """
+        位置 first〜last の全タスク合計PV
+
+        各タスクのPVは開始位置から終了位置まで傾き weight / (終了 − 開始) で増える折れ線なので、
+        傾きの変化点（開始に +傾き、終了に −傾き）と、開始＝終了のタスクの段差だけを
+        差分配列に記録し、累積和で全位置分を求める（O(タスク数 + 日数)）。
+        """
+        known = [
+            i for i in range(len(self))
+            if self.start_positions[i] is not None and self.end_positions[i] is not None
+        ]
+        base = min([first] + [self.start_positions[i] for i in known])
+        length = last - base + 1
+        slope_changes = [0.0] * length
+        steps = [0.0] * length
+
+        for i in known:
+            start, end, weight = self.start_positions[i], self.end_positions[i], self.weights[i]
+            if start - base >= length:
+                continue
+            if end <= start:
+                steps[start - base] += weight
+                continue
+            slope = weight / (end - start)
+            slope_changes[start - base] += slope
+            if end - base < length:
+                slope_changes[end - base] -= slope
+
+        series = []
+        ramp = 0.0
+        slope = 0.0
+        step_total = 0.0
+        for offset in range(length):
+            slope += slope_changes[offset]
+            step_total += steps[offset]
+            if offset >= first - base:
+                series.append(ramp + step_total)
+            # 翌日のPVには当日の傾き分が加わる
+            ramp += slope
+        return series
+
+    def planned_values(self, as_of: int) -> List[float]:
+        """基準日（序数）時点の各タスクのPV"""
+        as_of = self._position(as_of)
+        values = []
+        for weight, start, end in zip(self.weights, self.start_positions, self.end_positions):
+            if start is None or end is None or as_of < start:
+                values.append(0.0)
+            elif as_of >= end:
+                values.append(weight)
+            else:
+                values.append(weight * (as_of - start) / (end - start))
+        return values
+
+
+def _new_stats() -> Dict:
+    return {'total_weight': 0, 'pv': 0.0, 'ev': 0.0, 'ac': 0.0}
+
+
+def _finalize(stats: Dict) -> Dict:
+    """SPI, CPI, 進捗率を計算"""
+    total_weight = stats['total_weight']
+    stats['spi'] = stats['ev'] / stats['pv'] if stats['pv'] > 0 else 0.0
+    stats['cpi'] = stats['ev'] / stats['ac'] if stats['ac'] > 0 else 0.0
+    stats['progress_rate'] = (stats['ev'] / total_weight * 100) if total_weight > 0 else 0.0
+    stats['completion_rate'] = (stats['pv'] / total_weight * 100) if total_weight > 0 else 0.0
+    return stats
+
+
+def compute_evm_columns(columns: TaskColumns, as_of: Optional[datetime] = None) -> Dict:
+    """
+    列形式のタスクから全体とグループ別のEVM指標を1回の走査で集計
+
+    Returns:
+        {
+            'overall': {total_weight, pv, ev, ac, spi, cpi, progress_rate, completion_rate, current_date},
+            'groups': {集計キー: {グループ名: 同じ形式の指標}}
+        }
+    """
+    as_of = as_of or datetime.now()
+    pv_values = columns.planned_values(as_of.toordinal())
+
+    overall = _new_stats()
+    group_stats: Dict[str, Dict[str, Dict]] = {key: {} for key in columns.groups}
+    group_columns = list(columns.groups.items())
+
+    for index in range(len(columns)):
+        weight = columns.weights[index]
+        pv = pv_values[index]
+        ev = columns.ev[index]
+        ac = columns.ac[index]
+
+        overall['total_weight'] += weight
+        overall['pv'] += pv
+        overall['ev'] += ev
+        overall['ac'] += ac
+
+        for key, values in group_columns:
+            stats = group_stats[key].get(values[index])
+            if stats is None:
+                stats = group_stats[key][values[index]] = _new_stats()
+            stats['total_weight'] += weight
+            stats['pv'] += pv
+            stats['ev'] += ev
+            stats['ac'] += ac
+
+    _finalize(overall)
+    overall['current_date'] = as_of.strftime('%Y-%m-%d')
+    for groups in group_stats.values():
+        for stats in groups.values():
+            _finalize(stats)
+
+    return {'overall': overall, 'groups': group_stats}
+
+
+def compute_evm_series(
+    tasks: List[Dict],
+    start_date: str,
+    end_date: str,
+    holidays: Optional[Iterable[str]] = None,
+    actuals: Optional[Dict[str, Dict[str, float]]] = None,
+    as_of: Optional[datetime] = None,
+    calendar: Optional[WorkCalendar] = None
+) -> List[Dict]:
+    """
+    start_date〜end_date の稼働日（土日・holidaysを除く）ごとのEVM時系列を計算
+
+    Args:
+        tasks: タスクリスト
+        start_date, end_date: 期間（YYYY-MM-DD、両端を含む）
+        holidays: 除外する祝日・休業日（calendar を省略した場合に使う）
+        actuals: 日付 → {'ev': ..., 'ac': ...}（実績の履歴）。省略時は基準日の現在値のみ
+        as_of: 現在値を入れる基準日（省略時は今日）
+        calendar: 稼働日カレンダー（PVは稼働日の経過に応じて増える）
+
+    Returns:
+        [{'date', 'pv', 'pv_rate', 'ev', 'ac', 'spi', 'cpi'}, ...]
+        実績の無い日の ev / ac / spi / cpi は None
+    """
+    if calendar is None:
+        calendar = WorkCalendar(holidays=holidays, start=start_date, end=end_date)
+    columns = TaskColumns(tasks, group_by={}, calendar=calendar)
+    first_day = date.fromisoformat(start_date).toordinal()
+    last_day = date.fromisoformat(end_date).toordinal()
+    pv_by_day = columns.planned_value_series(first_day, last_day)
+
+    total_weight = sum(columns.weights)
+
+    if actuals is None:
+        today = (as_of or datetime.now()).strftime('%Y-%m-%d')
+        actuals = {today: {'ev': sum(columns.ev), 'ac': sum(columns.ac)}}
+
+    rows = []
+    for offset, pv in enumerate(pv_by_day):
+        day = date.fromordinal(first_day + offset)
+        if not calendar.is_working_ordinal(day.toordinal()):
+            continue
+
+        key = day.isoformat()
+        actual = actuals.get(key)
+        ev = actual['ev'] if actual else None
+        ac = actual['ac'] if actual else None
+        rows.append({
+            'date': key,
+            'pv': pv,
+            'pv_rate': (pv / total_weight * 100) if total_weight > 0 else 0.0,
+            'ev': ev,
+            'ac': ac,
+            'spi': (ev / pv if pv > 0 else 0.0) if actual else None,
+            'cpi': (ev / ac if ac > 0 else 0.0) if actual else None
+        })
+    return rows
+
+
+def compute_evm(tasks: List[Dict], group_by: Optional[Dict[str, str]] = None,
+                as_of: Optional[datetime] = None, calendar: Optional[WorkCalendar] = None) -> Dict:
+    """
+    タスク一覧から全体とグループ別のEVM指標を計算
+
+    Args:
+        tasks: tasks.json / schedule.json のタスクリスト
+        group_by: 集計キー → 値が無いタスクの分類名（省略時は phase と midCategory）
+        as_of: PVの基準日時（省略時は現在）
+        calendar: 稼働日カレンダー（省略時はPVを暦日の経過で計算）
+    """
+    return compute_evm_columns(TaskColumns(tasks, group_by, calendar), as_of)
@@ -14,16 +14,16 @@
     docs/MINDMAP.md
 """
 
-import json
 import os
 from datetime import datetime
 from collections import defaultdict
 from typing import Dict, List
 
+from task_model import load_project
+
 def load_tasks() -> Dict:
-    """tasks.jsonを読み込む"""
-    with open('tasks.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """tasks.jsonを読み込む（日付はschedule.jsonから補い、startDate / endDate に正規化済み）"""
+    return load_project().data
 
 def get_status_emoji(status: str) -> str:
     """ステータスに応じた絵文字を返す"""
@@ -128,8 +128,8 @@ def generate_mindmap_content(data: Dict) -> str:
                 task_title = task.get('title', task.get('name', 'Unnamed'))
 
                 # 日付と重みを追加
-                start = task.get('start_date', 'N/A')
-                end = task.get('end_date', 'N/A')
+                start = task.get('startDate', 'N/A')
+                end = task.get('endDate', 'N/A')
                 weight = task.get('weight', 0)
 
                 # Format: MM-DD形式
@@ -205,8 +205,8 @@ def generate_mindmap_content(data: Dict) -> str:
                 status = task.get('status', 'pending')
                 priority = task.get('priority', 'medium')
                 assignee = task.get('assignee', '未割当')
-                start_date = task.get('start_date', task.get('startDate', 'N/A'))
-                end_date = task.get('end_date', task.get('endDate', 'N/A'))
+                start_date = task.get('startDate', 'N/A')
+                end_date = task.get('endDate', 'N/A')
                 description = task.get('description', '')
 
                 status_emoji = get_status_emoji(status)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+スケジュール自動生成 - tasks.json から schedule.json を作る
+
+tasks.json のタスク（工数・依存関係・優先度・担当者）とプロジェクトの稼働日カレンダー
+（既存の schedule.json の project.holidays など）から、各タスクの startDate / endDate / weekNumber、
+weeklySchedule、criticalPath を計算して schedule.json を生成します。
+
+使い方:
+    python3 scripts/generate-schedule.py
+
+    # 書き込まずに結果だけ確認
+    python3 scripts/generate-schedule.py --dry-run
+
+    # 担当者の稼働能力を考えず、依存関係だけで最早日程を求める
+    python3 scripts/generate-schedule.py --ignore-resources
+
+    # テンプレートから別のファイルに生成
+    python3 scripts/generate-schedule.py --tasks templates/tasks.json --schedule schedule.json --output /tmp/schedule.json
+
+日程の決め方は scripts/auto_schedule.py を参照してください。
+既存の schedule.json を上書きする場合は変更を .journal/changes.jsonl に記録するので、
+python3 scripts/update-schedule.py --undo で生成前の schedule.json に戻せます。
+PLAN.md / SCHEDULE.md は次回 update-schedule.py を実行したときに再生成されます。
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from auto_schedule import generate_schedule
+from change_journal import COMMITTED, JOURNAL_FILE, ChangeJournal, diff, snapshot
+from output_writer import CACHE_FILE as OUTPUT_HASH_FILE, OutputWriter
+
+
+def load_json(path: Path, required: bool = True) -> dict:
+    """JSONファイルを読み込む（required=False なら無い場合は空の dict）"""
+    if not path.exists():
+        if required:
+            raise FileNotFoundError(f"{path} が見つかりません")
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_result(schedule: dict, base_schedule: dict):
+    """生成したスケジュールの概要を表示"""
+    project = schedule["project"]
+    tasks = schedule["tasks"]
+    previous = {task["id"]: task for task in base_schedule.get("tasks", [])}
+    moved = [
+        task["id"] for task in tasks
+        if task["id"] in previous
+        and (previous[task["id"]].get("startDate"), previous[task["id"]].get("endDate")) != (task["startDate"], task["endDate"])
+    ]
+    finish = max((task["endDate"] for task in tasks), default=None)
+
+    print(f"\n🗓️  スケジュールを生成しました（{len(tasks)}タスク、{len(schedule['weeklySchedule'])}週）")
+    print(f"開始日: {project.get('startDate')}")
+    print(f"完了予定: {finish or '未定'}")
+    print(f"クリティカルパス: {len(schedule['criticalPath'])}タスク")
+    if previous:
+        print(f"既存の schedule.json から日付が変わるタスク: {len(moved)}件")
+        for task_id in moved[:10]:
+            task = next(t for t in tasks if t["id"] == task_id)
+            old = previous[task_id]
+            print(f"  {task_id}: {old.get('startDate')} 〜 {old.get('endDate')} → {task['startDate']} 〜 {task['endDate']}")
+        if len(moved) > 10:
+            print(f"  ほか{len(moved) - 10}件")
+
+    target = project.get("estimatedEndDate")
+    if finish and target and finish > target:
+        print(f"⚠️  完了予定が予定終了日 {target} を過ぎています")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="tasks.json から schedule.json を生成する")
+    parser.add_argument("--tasks", default="tasks.json", help="タスク定義（デフォルト: tasks.json）")
+    parser.add_argument("--schedule", default="schedule.json",
+                        help="カレンダー・マイルストーン・リスクを引き継ぐ既存の schedule.json（無くてもよい）")
+    parser.add_argument("--output", help="出力先（デフォルト: --schedule と同じファイル）")
+    parser.add_argument("--ignore-resources", action="store_true",
+                        help="担当者の稼働能力を考えず、依存関係だけで日程を決める")
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに結果だけ表示")
+    args = parser.parse_args()
+
+    schedule_path = Path(args.schedule)
+    output_path = Path(args.output) if args.output else schedule_path
+
+    try:
+        tasks_data = load_json(Path(args.tasks))
+        base_schedule = load_json(schedule_path, required=False)
+        schedule = generate_schedule(tasks_data, base_schedule, resources=not args.ignore_resources)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print_result(schedule, base_schedule)
+    if args.dry_run:
+        print("\n（--dry-run のためファイルは書き込みません）")
+        return
+
+    # 既存の schedule.json を上書きする場合は変更をジャーナルに記録する（update-schedule.py --undo で戻せる）
+    journal = op = None
+    if output_path.exists() and output_path.resolve() == schedule_path.resolve():
+        changes = diff(snapshot({"schedule": base_schedule}), {"schedule": schedule})
+        if changes:
+            journal = ChangeJournal(output_path.parent / JOURNAL_FILE)
+            op = journal.append(f"スケジュール自動生成（{args.tasks} から）", changes)
+
+    writer = OutputWriter(output_path.parent / OUTPUT_HASH_FILE)
+    if writer.write(output_path, json.dumps(schedule, indent=2, ensure_ascii=False)):
+        print(f"\n✅ {output_path} を保存しました")
+    else:
+        print(f"\n✅ {output_path} に変更はありません（書き込みを省略）")
+    if op is not None:
+        journal.mark(op, COMMITTED)
+        print(f"  ✓ 変更ジャーナルに記録（#{op}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@
 ASCIIツリーと詳細表でプロジェクトの全タスクを可視化
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+from output_writer import get_writer
+from task_model import load_project
+
 def create_ascii_tree(tasks, project_name):
     """タスク一覧をASCIIツリー形式で生成（開始日・終了日・重み付き）"""
     # Group by phase and midCategory
@@ -65,8 +67,8 @@ def create_ascii_tree(tasks, project_name):
                 status_icon = '完了' if task['status'] == 'completed' else '進行中' if task['status'] == 'in_progress' else '未着手'
 
                 # Add dates and weight
-                start = task.get('start_date', 'N/A')
-                end = task.get('end_date', 'N/A')
+                start = task.get('startDate', 'N/A')
+                end = task.get('endDate', 'N/A')
                 weight = task.get('weight', 0)
 
                 # Format: [status] title (MM/DD〜MM/DD, W=n)
@@ -78,14 +80,13 @@ def create_ascii_tree(tasks, project_name):
     return '\n'.join(lines)
 
 
-def generate_task_review():
-    """タスクレビュードキュメントを生成"""
-    root_dir = Path(__file__).parent.parent
-    tasks_file = root_dir / 'tasks.json'
+def generate_task_review(data=None, root_dir=None):
+    """タスクレビュードキュメントを生成（data を省略すると tasks.json を読み込む）"""
+    root_dir = Path(root_dir) if root_dir else Path(__file__).parent.parent
 
-    # Load tasks.json
-    with open(tasks_file, 'r') as f:
-        data = json.load(f)
+    # Load tasks.json (dates filled from schedule.json)
+    if data is None:
+        data = load_project(root_dir).data
 
     tasks = data['tasks']
 
@@ -177,7 +178,7 @@ def generate_task_review():
 
             for task in mid_tasks:
                 status_text = '✅ 完了' if task['status'] == 'completed' else '🔄 進行中' if task['status'] == 'in_progress' else '⬜ 未着手'
-                output.append(f'| {task["id"]} | {task["title"]} | {task.get("start_date", "")} | {task.get("end_date", "")} | {task["weight"]} | {status_text} |')
+                output.append(f'| {task["id"]} | {task["title"]} | {task.get("startDate", "")} | {task.get("endDate", "")} | {task["weight"]} | {status_text} |')
 
             output.append('')
 
@@ -186,10 +187,10 @@ def generate_task_review():
 
     # Write to file
     output_file = root_dir / 'docs' / 'TASK_REVIEW.md'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(output))
-
-    print(f'✓ Generated {output_file}')
+    if get_writer().write(output_file, '\n'.join(output)):
+        print(f'✓ Generated {output_file}')
+    else:
+        print(f'✓ {output_file} is up to date (write skipped)')
 
 
 if __name__ == '__main__':
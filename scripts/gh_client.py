@@ -0,0 +1,661 @@
+"""
+GitHub APIクライアント
+
+gh CLIをコマンドごとに起動する代わりに、プロセス内でHTTPS接続を保持（keep-alive）
+したままREST / GraphQL APIを呼び出します。トークンは GITHUB_TOKEN / GH_TOKEN 環境変数、
+または `gh auth token` から1度だけ取得します。
+
+各スクリプトの run_gh_command と同じ呼び出し形式（gh の引数リスト）も受け付けるため、
+既存コードは呼び出し先を差し替えるだけで移行できます。
+
+    client = get_client()
+    client.run_gh_command(["issue", "edit", "12", "--repo", repo, "--milestone", "Week 3"])
+    client.graphql("{ viewer { login } }")
+    client.rest("GET", f"repos/{repo}/milestones", params={"state": "all"})
+
+プロセス内で処理できないサブコマンド（project create など）は従来通り gh を起動します。
+レート制限（X-RateLimit-Remaining / Retry-After / セカンダリレート制限）はスレッド間で
+共有する RateLimiter が管理し、制限にかかった場合は待機してから再試行します。
+APIエラーと通信エラー（タイムアウト・TLS・名前解決・接続断）は subprocess.CalledProcessError の
+サブクラス（GitHubAPIError）として送出されるため、既存の例外処理はそのまま動作します。
+
+通信エラー時の再送:
+    読み取り（GET / HEAD / GraphQL query）は接続を張り直して1度だけ再送します。
+    Issue作成などの書き込み（その他のREST / GraphQL mutation）は、サーバーが
+    処理したか分からない状態で再送すると重複するため、リクエストを送り切る前の失敗だけ再送します。
+    再利用する keep-alive 接続がサーバー側で閉じられていないかは、書き込みの送信前に確認します。
+"""
+
+import http.client
+import json
+import os
+import re
+import select
+import subprocess
+import threading
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+API_HOST = "api.github.com"
+DEFAULT_TIMEOUT = 30
+USER_AGENT = "project-requirements-system-scripts"
+
+# レート制限時の最大再試行回数
+MAX_RETRIES = 5
+
+# 書き込み系リクエストの最小間隔（秒）
+# GitHubのセカンダリレート制限の目安（コンテンツ作成は1分あたり80件まで）に合わせる
+DEFAULT_WRITE_INTERVAL = 60 / 80
+MAX_WRITE_INTERVAL = 60.0
+
+# セカンダリレート制限でRetry-Afterが無い場合の初回待機時間（秒）
+SECONDARY_LIMIT_BACKOFF = 60.0
+
+# 通信エラー（HTTPレスポンスが無い）の場合の GitHubAPIError.status
+TRANSPORT_ERROR_STATUS = 1
+
+
+class GitHubAPIError(subprocess.CalledProcessError):
+    """GitHub APIのエラー（gh CLIの失敗と同じ扱いにするため CalledProcessError を継承）"""
+
+    def __init__(self, status: int, command: List[str], message: str, body: str = ""):
+        super().__init__(status, ["gh"] + list(command), output=body, stderr=message)
+        self.status = status
+
+    def __str__(self) -> str:
+        return f"GitHub API error ({self.status}): {self.stderr}"
+
+
+def resolve_token() -> str:
+    """APIトークンを取得（環境変数 → gh auth token の順）"""
+    for name in ("GITHUB_TOKEN", "GH_TOKEN"):
+        token = os.environ.get(name)
+        if token:
+            return token
+
+    result = subprocess.run(
+        ["gh", "auth", "token"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout.strip()
+
+
+def _parse_args(args: List[str], value_flags: Tuple[str, ...]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """gh形式の引数を位置引数とフラグに分解"""
+    positional: List[str] = []
+    flags: Dict[str, List[str]] = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("-"):
+            name, has_value, inline = arg.partition("=")
+            if has_value:
+                flags.setdefault(name, []).append(inline)
+            elif name in value_flags and i + 1 < len(args):
+                flags.setdefault(name, []).append(args[i + 1])
+                i += 1
+            else:
+                flags.setdefault(name, []).append("")
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, flags
+
+
+def _only(flags: Dict[str, List[str]], supported: Tuple[str, ...]) -> bool:
+    """実装しているフラグだけが指定されているか（それ以外のフラグがあれば gh に任せる）"""
+    return all(name in supported for name in flags)
+
+
+def _typed_field(value: str):
+    """gh api -F と同じ規則で値を変換"""
+    if value in ("true", "false"):
+        return value == "true"
+    if value == "null":
+        return None
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    return value
+
+
+def _split_labels(values: List[str]) -> List[str]:
+    labels: List[str] = []
+    for value in values:
+        labels.extend(label.strip() for label in value.split(",") if label.strip())
+    return labels
+
+
+class RateLimiter:
+    """
+    GitHub APIのレート制限に合わせてリクエストを調整（スレッド間で共有）
+
+    - 書き込み系リクエストは write_interval 秒以上の間隔を空けて送信する
+    - X-RateLimit-Remaining が0になったら X-RateLimit-Reset まで全スレッドを停止する
+    - 403/429でレート制限と判定した場合は Retry-After（無ければ指数バックオフ）だけ待機し、
+      書き込み間隔を2倍に広げる。成功するたびに間隔を少しずつ元に戻す
+    """
+
+    def __init__(self, write_interval: float = DEFAULT_WRITE_INTERVAL,
+                 max_write_interval: float = MAX_WRITE_INTERVAL):
+        self.min_write_interval = write_interval
+        self.max_write_interval = max_write_interval
+        self.write_interval = write_interval
+        self.remaining: Optional[int] = None
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._next_write_at = 0.0
+
+    def wait(self, write: bool):
+        """送信可能になるまで待機（書き込みは送信枠を予約してから待つ）"""
+        with self._lock:
+            start = max(time.monotonic(), self._resume_at)
+            if write:
+                start = max(start, self._next_write_at)
+                self._next_write_at = start + self.write_interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _pause(self, seconds: float):
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def update(self, headers: Dict[str, str], write: bool):
+        """成功したレスポンスのヘッダーから残り回数を反映"""
+        with self._lock:
+            remaining = headers.get("x-ratelimit-remaining")
+            if remaining is not None:
+                self.remaining = int(remaining)
+                reset = headers.get("x-ratelimit-reset")
+                if self.remaining == 0 and reset:
+                    self._pause(max(0.0, int(reset) - time.time()) + 1)
+            if write:
+                self.write_interval = max(self.min_write_interval, self.write_interval * 0.9)
+
+    def retry_delay(self, status: int, headers: Dict[str, str], text: str, attempt: int) -> Optional[float]:
+        """
+        レート制限による失敗なら待機秒数を返し、全スレッドを一時停止する
+
+        レート制限以外の403（権限不足など）は None を返す。
+        """
+        if status not in (403, 429):
+            return None
+
+        retry_after = headers.get("retry-after")
+        reset = headers.get("x-ratelimit-reset")
+        if retry_after:
+            delay = float(retry_after)
+        elif headers.get("x-ratelimit-remaining") == "0" and reset:
+            delay = max(0.0, int(reset) - time.time()) + 1
+        elif "rate limit" in text.lower():
+            delay = SECONDARY_LIMIT_BACKOFF * (2 ** attempt)
+        else:
+            return None
+
+        with self._lock:
+            self._pause(delay)
+            self.write_interval = min(self.max_write_interval, max(1.0, self.write_interval * 2))
+        return delay
+
+
+def _is_write(method: str, path: str, body: Optional[Dict]) -> bool:
+    """セカンダリレート制限の対象になる書き込み系リクエストか"""
+    if method in ("GET", "HEAD"):
+        return False
+    if path.startswith("/graphql"):
+        return str((body or {}).get("query", "")).lstrip().startswith("mutation")
+    return True
+
+
+class GitHubClient:
+    """keep-alive接続を使うGitHub APIクライアント（スレッドごとに接続を保持）"""
+
+    def __init__(self, token: Optional[str] = None, host: str = API_HOST, timeout: int = DEFAULT_TIMEOUT,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self._token = token
+        self.host = host
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._milestones: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def token(self) -> str:
+        if self._token is None:
+            with self._lock:
+                if self._token is None:
+                    self._token = resolve_token()
+        return self._token
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> http.client.HTTPSConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _reset_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self._local.connection = None
+
+    def _drop_stale_connection(self):
+        """サーバー側で閉じられた keep-alive 接続を捨てる（閉じられた接続は読み込み可能になる）"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or connection.sock is None:
+            return
+        try:
+            readable, _, _ = select.select([connection.sock], [], [], 0)
+        except (OSError, ValueError):
+            readable = True
+        if readable:
+            self._reset_connection()
+
+    def _send(self, method: str, path: str, payload: Optional[bytes], headers: Dict[str, str],
+              command: List[str], write: bool):
+        """
+        リクエストを1回送信（通信エラーは GitHubAPIError にする）
+
+        書き込みはサーバーに届いた後の失敗で再送すると二重に処理されるので、送り切る前の失敗だけ再送する。
+        """
+        if write:
+            self._drop_stale_connection()
+
+        # 接続が切れていた場合は1度だけ再接続する（書き込みは送り切る前の失敗に限る）
+        for attempt in range(2):
+            connection = self._connection()
+            sent = False
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                sent = True
+                response = connection.getresponse()
+                raw = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                self._reset_connection()
+                if attempt == 0 and not (write and sent):
+                    continue
+                note = "（送信済みのため再送しません）" if write and sent else ""
+                raise GitHubAPIError(
+                    TRANSPORT_ERROR_STATUS, command, f"通信エラー: {type(e).__name__}: {e}{note}"
+                ) from e
+
+        response_headers = {key.lower(): value for key, value in response.getheaders()}
+        return response.status, response_headers, raw.decode("utf-8") if raw else ""
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        command: Optional[List[str]] = None
+    ) -> Tuple[int, Dict[str, str], object]:
+        """
+        APIリクエストを送信
+
+        Returns:
+            (ステータスコード, レスポンスヘッダー, パース済みJSON)
+        """
+        if path.startswith("https://"):
+            parsed = urllib.parse.urlsplit(path)
+            path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        elif not path.startswith("/"):
+            path = "/" + path
+        if params:
+            separator = "&" if "?" in path else "?"
+            path += separator + urllib.parse.urlencode(params)
+
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": USER_AGENT,
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        write = _is_write(method, path, body)
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.wait(write)
+            status, response_headers, text = self._send(method, path, payload, headers, command or [method, path], write)
+            if status < 400:
+                self.rate_limiter.update(response_headers, write)
+                break
+            delay = self.rate_limiter.retry_delay(status, response_headers, text, attempt)
+            if delay is None or attempt == MAX_RETRIES:
+                break
+            print(f"⏳ GitHub APIのレート制限に達しました。{delay:.0f}秒待機して再試行します...")
+
+        try:
+            data = json.loads(text) if text else None
+        except json.JSONDecodeError:
+            data = text
+
+        if status >= 400:
+            message = data.get("message", text) if isinstance(data, dict) else text
+            if isinstance(data, dict) and data.get("errors"):
+                message += f" {json.dumps(data['errors'], ensure_ascii=False)}"
+            raise GitHubAPIError(status, command or [method, path], message, text)
+
+        return status, response_headers, data
+
+    def rest(self, method: str, path: str, body: Optional[Dict] = None, params: Optional[Dict] = None):
+        """REST APIを呼び出してJSONを返す"""
+        return self.request(method, path, body=body, params=params)[2]
+
+    def paginate(self, path: str, params: Optional[Dict] = None, limit: Optional[int] = None) -> List:
+        """Linkヘッダーをたどって一覧系APIの全件を取得"""
+        params = dict(params or {})
+        params.setdefault("per_page", 100)
+        results: List = []
+        next_path: Optional[str] = path
+        while next_path:
+            _, headers, data = self.request("GET", next_path, params=params)
+            results.extend(data or [])
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+            match = re.search(r'<([^>]+)>;\s*rel="next"', headers.get("link", ""))
+            next_path = match.group(1) if match else None
+            params = None
+        return results
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """
+        GraphQL APIを呼び出してレスポンス全体を返す
+
+        dataが空でerrorsのみの場合は GitHubAPIError を送出する。部分的なエラー
+        （エイリアス付きmutationの一部失敗など）はレスポンスのerrorsで確認できる。
+        """
+        body = {"query": query}
+        if variables:
+            body["variables"] = variables
+        result = self.request("POST", "/graphql", body=body, command=["api", "graphql"])[2]
+        if isinstance(result, dict) and result.get("errors") and not result.get("data"):
+            message = "; ".join(error.get("message", "") for error in result["errors"])
+            raise GitHubAPIError(1, ["api", "graphql"], message, json.dumps(result, ensure_ascii=False))
+        return result
+
+    # ------------------------------------------------------------------
+    # gh CLI互換レイヤー
+    # ------------------------------------------------------------------
+
+    def run_gh_command(self, args: List[str]) -> str:
+        """
+        gh CLIの引数リストを受け取り、同等のAPI呼び出しを行って標準出力相当の文字列を返す
+
+        対応していないサブコマンドや、ハンドラーが実装していないフラグが1つでもあれば
+        （--body-file, --search, -F key=@file など）、gh を起動して処理する。
+        """
+        handler = None
+        if len(args) >= 2:
+            handler = {
+                ("api", None): self._gh_api,
+                ("issue", "create"): self._gh_issue_create,
+                ("issue", "edit"): self._gh_issue_edit,
+                ("issue", "close"): self._gh_issue_close,
+                ("issue", "reopen"): self._gh_issue_reopen,
+                ("issue", "comment"): self._gh_issue_comment,
+                ("issue", "list"): self._gh_issue_list,
+                ("label", "create"): self._gh_label_create,
+                ("auth", "status"): self._gh_auth_status,
+            }.get((args[0], None) if args[0] == "api" else (args[0], args[1]))
+
+        if handler is not None:
+            output = handler(args)
+            if output is not None:
+                return output
+
+        return self._run_gh_process(args)
+
+    def _run_gh_process(self, args: List[str]) -> str:
+        result = subprocess.run(
+            ["gh"] + args,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+
+    _API_FLAGS = ("-X", "--method", "-f", "--raw-field", "-F", "--field")
+
+    def _gh_api(self, args: List[str]) -> Optional[str]:
+        positional, flags = _parse_args(args[1:], self._API_FLAGS + ("-H", "--header"))
+        # jq式・独自ヘッダー・ページング指定などはghに任せる
+        if not positional or not _only(flags, self._API_FLAGS):
+            return None
+        # -F のファイル読み込み（key=@file）と配列・入れ子の指定（key[]=...）もghに任せる
+        typed = flags.get("-F", []) + flags.get("--field", [])
+        if any(value.partition("=")[2].startswith("@") or "[" in value.partition("=")[0] for value in typed):
+            return None
+
+        endpoint = positional[0]
+        fields: Dict = {}
+        for value in flags.get("-f", []) + flags.get("--raw-field", []):
+            key, _, raw = value.partition("=")
+            fields[key] = raw
+        for value in flags.get("-F", []) + flags.get("--field", []):
+            key, _, raw = value.partition("=")
+            fields[key] = _typed_field(raw)
+
+        if endpoint == "graphql":
+            query = fields.pop("query", "")
+            result = self.request("POST", "/graphql", body={"query": query, "variables": fields or None},
+                                  command=args)[2]
+            if isinstance(result, dict) and result.get("errors"):
+                message = "; ".join(error.get("message", "") for error in result["errors"])
+                raise GitHubAPIError(1, args, message, json.dumps(result, ensure_ascii=False))
+            return json.dumps(result, ensure_ascii=False)
+
+        method = (flags.get("-X") or flags.get("--method") or ["POST" if fields else "GET"])[-1].upper()
+        if method == "GET":
+            data = self.request(method, endpoint, params=fields or None, command=args)[2]
+        else:
+            data = self.request(method, endpoint, body=fields, command=args)[2]
+        return json.dumps(data, ensure_ascii=False) if data is not None else ""
+
+    def _milestone_number(self, repo: str, title: str) -> int:
+        if repo not in self._milestones:
+            milestones = self.paginate(f"/repos/{repo}/milestones", params={"state": "all"})
+            self._milestones[repo] = {m["title"]: m["number"] for m in milestones}
+        if title not in self._milestones[repo]:
+            raise GitHubAPIError(1, ["issue"], f"could not add to milestone '{title}': '{title}' not found")
+        return self._milestones[repo][title]
+
+    # 値を取るフラグ（引数の分解用。実装しているフラグは各ハンドラーで指定する）
+    _ISSUE_FLAGS = ("--repo", "-R", "--title", "-t", "--body", "-b", "--body-file", "-F", "--label", "-l",
+                    "--add-label", "--remove-label", "--milestone", "-m", "--assignee", "-a",
+                    "--add-assignee", "--remove-assignee", "--comment", "-c", "--reason", "-r",
+                    "--state", "-s", "--search", "-S", "--author", "-A", "--json", "--jq", "-q",
+                    "--template", "--limit", "-L")
+
+    @staticmethod
+    def _flag(flags: Dict[str, List[str]], *names: str) -> Optional[str]:
+        for name in names:
+            if name in flags:
+                return flags[name][-1]
+        return None
+
+    def _gh_issue_create(self, args: List[str]) -> Optional[str]:
+        _, flags = _parse_args(args[2:], self._ISSUE_FLAGS)
+        repo = self._flag(flags, "--repo", "-R")
+        title = self._flag(flags, "--title", "-t")
+        supported = ("--repo", "-R", "--title", "-t", "--body", "-b", "--label", "-l",
+                     "--milestone", "-m", "--assignee", "-a")
+        if not repo or title is None or not _only(flags, supported):
+            return None
+
+        body = {"title": title, "body": self._flag(flags, "--body", "-b") or ""}
+        labels = _split_labels(flags.get("--label", []) + flags.get("-l", []))
+        if labels:
+            body["labels"] = labels
+        milestone = self._flag(flags, "--milestone", "-m")
+        if milestone:
+            body["milestone"] = self._milestone_number(repo, milestone)
+        assignees = _split_labels(flags.get("--assignee", []) + flags.get("-a", []))
+        if assignees:
+            body["assignees"] = assignees
+
+        issue = self.request("POST", f"/repos/{repo}/issues", body=body, command=args)[2]
+        return issue["html_url"]
+
+    def _gh_issue_edit(self, args: List[str]) -> Optional[str]:
+        positional, flags = _parse_args(args[2:], self._ISSUE_FLAGS)
+        repo = self._flag(flags, "--repo", "-R")
+        supported = ("--repo", "-R", "--title", "-t", "--body", "-b", "--milestone", "-m",
+                     "--add-label", "--remove-label")
+        if not repo or not positional or not _only(flags, supported):
+            return None
+
+        number = positional[0]
+        body: Dict = {}
+        title = self._flag(flags, "--title", "-t")
+        if title is not None:
+            body["title"] = title
+        text = self._flag(flags, "--body", "-b")
+        if text is not None:
+            body["body"] = text
+        milestone = self._flag(flags, "--milestone", "-m")
+        if milestone is not None:
+            body["milestone"] = self._milestone_number(repo, milestone) if milestone else None
+
+        issue = None
+        if body:
+            issue = self.request("PATCH", f"/repos/{repo}/issues/{number}", body=body, command=args)[2]
+
+        labels = _split_labels(flags.get("--add-label", []))
+        if labels:
+            self.request("POST", f"/repos/{repo}/issues/{number}/labels", body={"labels": labels}, command=args)
+
+        for label in _split_labels(flags.get("--remove-label", [])):
+            try:
+                self.request("DELETE", f"/repos/{repo}/issues/{number}/labels/{urllib.parse.quote(label)}",
+                             command=args)
+            except GitHubAPIError as e:
+                # 既に外されているラベルは無視（gh issue edit と同じ挙動）
+                if e.status != 404:
+                    raise
+
+        if issue:
+            return issue["html_url"]
+        return f"https://github.com/{repo}/issues/{number}"
+
+    def _gh_issue_close(self, args: List[str]) -> Optional[str]:
+        positional, flags = _parse_args(args[2:], self._ISSUE_FLAGS)
+        repo = self._flag(flags, "--repo", "-R")
+        if not repo or not positional or not _only(flags, ("--repo", "-R", "--comment", "-c")):
+            return None
+
+        number = positional[0]
+        comment = self._flag(flags, "--comment", "-c")
+        if comment:
+            self.request("POST", f"/repos/{repo}/issues/{number}/comments", body={"body": comment}, command=args)
+        self.request("PATCH", f"/repos/{repo}/issues/{number}", body={"state": "closed"}, command=args)
+        return ""
+
+    def _gh_issue_reopen(self, args: List[str]) -> Optional[str]:
+        positional, flags = _parse_args(args[2:], self._ISSUE_FLAGS)
+        repo = self._flag(flags, "--repo", "-R")
+        if not repo or not positional or not _only(flags, ("--repo", "-R")):
+            return None
+
+        self.request("PATCH", f"/repos/{repo}/issues/{positional[0]}", body={"state": "open"}, command=args)
+        return ""
+
+    def _gh_issue_comment(self, args: List[str]) -> Optional[str]:
+        positional, flags = _parse_args(args[2:], self._ISSUE_FLAGS)
+        repo = self._flag(flags, "--repo", "-R")
+        body = self._flag(flags, "--body", "-b")
+        if not repo or not positional or body is None or not _only(flags, ("--repo", "-R", "--body", "-b")):
+            return None
+
+        comment = self.request("POST", f"/repos/{repo}/issues/{positional[0]}/comments",
+                               body={"body": body}, command=args)[2]
+        return comment["html_url"]
+
+    def _gh_issue_list(self, args: List[str]) -> Optional[str]:
+        _, flags = _parse_args(args[2:], self._ISSUE_FLAGS)
+        repo = self._flag(flags, "--repo", "-R")
+        fields = self._flag(flags, "--json")
+        supported = ("--repo", "-R", "--json", "--state", "-s", "--limit", "-L")
+        if not repo or not fields or not _only(flags, supported):
+            return None
+
+        state = self._flag(flags, "--state", "-s") or "open"
+        limit = int(self._flag(flags, "--limit", "-L") or 30)
+        issues = [
+            issue for issue in self.paginate(f"/repos/{repo}/issues", params={"state": state})
+            if "pull_request" not in issue
+        ][:limit]
+
+        # gh issue list --json と同じ形式に変換
+        converters = {
+            "number": lambda i: i["number"],
+            "title": lambda i: i["title"],
+            "body": lambda i: i.get("body") or "",
+            "state": lambda i: i["state"].upper(),
+            "url": lambda i: i["html_url"],
+            "labels": lambda i: [
+                {"name": l["name"], "description": l.get("description") or "", "color": l.get("color", "")}
+                for l in i.get("labels", [])
+            ],
+            "milestone": lambda i: (
+                {"number": i["milestone"]["number"], "title": i["milestone"]["title"]}
+                if i.get("milestone") else None
+            ),
+            "assignees": lambda i: [{"login": a["login"]} for a in i.get("assignees", [])],
+        }
+        names = [name.strip() for name in fields.split(",")]
+        if any(name not in converters for name in names):
+            return None
+
+        result = [{name: converters[name](issue) for name in names} for issue in issues]
+        return json.dumps(result, ensure_ascii=False)
+
+    def _gh_label_create(self, args: List[str]) -> Optional[str]:
+        positional, flags = _parse_args(args[2:], ("--repo", "-R", "--color", "-c", "--description", "-d"))
+        repo = self._flag(flags, "--repo", "-R")
+        if not repo or not positional or not _only(flags, ("--repo", "-R", "--color", "-c", "--description", "-d")):
+            return None
+
+        body = {"name": positional[0]}
+        color = self._flag(flags, "--color", "-c")
+        if color:
+            body["color"] = color.lstrip("#")
+        description = self._flag(flags, "--description", "-d")
+        if description:
+            body["description"] = description
+
+        self.request("POST", f"/repos/{repo}/labels", body=body, command=args)
+        return ""
+
+    def _gh_auth_status(self, args: List[str]) -> Optional[str]:
+        if len(args) > 2:
+            return None
+        # /rate_limit はGitHub Actionsのトークンでも参照でき、無効なトークンなら401になる
+        self.request("GET", "/rate_limit", command=args)
+        return f"Logged in to {self.host}"
+
+
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GitHubClient:
+    """プロセス内で共有するクライアントを取得"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GitHubClient()
+    return _client
@@ -2,30 +2,59 @@
 """
 GitHub Sync Script
 Synchronizes tasks.json with GitHub Issues, Projects, and Milestones
+
+Only milestones and issues whose rendered representation changed since the
+last run are sent to GitHub. The content hashes of the last synced state are
+kept in a state file (default: .cache/github-sync-state.json next to
+tasks.json); pass --full to ignore it and resync everything.
 """
 
+import hashlib
 import json
 import subprocess
 import sys
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from gh_client import get_client
+
+STATE_VERSION = 1
+
+# Labels generated from task fields (stale ones are removed from issues matched by title)
+MANAGED_LABEL_PREFIXES = ('status:', 'priority:')
+
+
+def _content_hash(value) -> str:
+    """Stable hash of a JSON-serializable value"""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
 
 
 class GitHubSync:
-    def __init__(self, tasks_file: str, schedule_file: str, repo: Optional[str] = None):
+    def __init__(self, tasks_file: str, schedule_file: str, repo: Optional[str] = None,
+                 state_file: Optional[str] = None, full: bool = False):
         """Initialize GitHub Sync
 
         Args:
             tasks_file: Path to tasks.json
             schedule_file: Path to schedule.json
             repo: GitHub repository (owner/repo). If None, auto-detect from git remote
+            state_file: Path to the sync state file. Defaults to
+                .cache/github-sync-state.json next to tasks.json
+            full: Ignore the sync state and push every milestone and issue
         """
         self.tasks_file = tasks_file
         self.schedule_file = schedule_file
         self.repo = repo or self._detect_repo()
         self.tasks_data = None
         self.schedule_data = None
+        self.github = get_client()
+        self.state_file = state_file or os.path.join(
+            os.path.dirname(os.path.abspath(tasks_file)), '.cache', 'github-sync-state.json'
+        )
+        self.full = full
+        self.state = None
 
     def _detect_repo(self) -> str:
         """Auto-detect GitHub repository from git remote"""
@@ -63,20 +92,42 @@ class GitHubSync:
         print(f"✓ Loaded {len(self.tasks_data['tasks'])} tasks from {self.tasks_file}")
         print(f"✓ Loaded {len(self.schedule_data['schedule'])} scheduled items from {self.schedule_file}")
 
+    def load_state(self):
+        """Load the last synced state (empty on --full, repo change or unreadable file)"""
+        empty = {'version': STATE_VERSION, 'repo': self.repo, 'milestones': {}, 'issues': {}}
+        self.state = empty
+        if self.full or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if state.get('version') == STATE_VERSION and state.get('repo') == self.repo:
+            self.state = state
+            print(f"✓ Loaded sync state from {self.state_file}")
+
+    def save_state(self):
+        """Write the sync state atomically"""
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
+
     def _run_gh_command(self, args: List[str]) -> str:
-        """Run gh CLI command"""
+        """Run gh CLI command (served in-process by the API client)"""
         try:
-            result = subprocess.run(
-                ['gh'] + args,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
+            return self.github.run_gh_command(args)
         except subprocess.CalledProcessError as e:
             print(f"Error running gh command: {e.stderr}")
             raise
 
+    def _get_milestone_numbers(self) -> Dict[str, int]:
+        """Get milestone title -> number mapping"""
+        milestones = self.github.paginate(f'/repos/{self.repo}/milestones', params={'state': 'all'})
+        return {m['title']: m['number'] for m in milestones}
+
     def check_gh_cli(self) -> bool:
         """Check if gh CLI is installed and authenticated"""
         try:
@@ -101,52 +152,76 @@ class GitHubSync:
         """Create or update GitHub milestones"""
         print("\n=== Creating/Updating Milestones ===")
 
+        synced = self.state['milestones']
+        changed = []
+        for milestone in self.tasks_data['milestones']:
+            fields = {
+                'title': milestone['title'],
+                'description': milestone['description'],
+                'due_on': f"{milestone['due_date']}T23:59:59Z"
+            }
+            digest = _content_hash(fields)
+            if synced.get(milestone['title'], {}).get('hash') != digest:
+                changed.append((fields, digest))
+
+        unchanged = len(self.tasks_data['milestones']) - len(changed)
+        if not changed:
+            print(f"  No changes ({unchanged} milestones up to date)")
+            return
+
         # Get existing milestones
         existing_milestones = {}
         try:
-            output = self._run_gh_command([
-                'api', f'/repos/{self.repo}/milestones',
-                '--jq', '.[] | {title: .title, number: .number}'
-            ])
-            for line in output.split('\n'):
-                if line.strip():
-                    data = json.loads(line)
-                    existing_milestones[data['title']] = data['number']
+            existing_milestones = self._get_milestone_numbers()
         except:
             pass
 
-        for milestone in self.tasks_data['milestones']:
-            title = milestone['title']
-            description = milestone['description']
-            due_date = milestone['due_date']
+        for fields, digest in changed:
+            title = fields['title']
+            args = [arg for key, value in fields.items() for arg in ('-f', f'{key}={value}')]
 
             if title in existing_milestones:
                 # Update existing milestone
                 milestone_number = existing_milestones[title]
                 self._run_gh_command([
                     'api', f'/repos/{self.repo}/milestones/{milestone_number}',
-                    '-X', 'PATCH',
-                    '-f', f'title={title}',
-                    '-f', f'description={description}',
-                    '-f', f'due_on={due_date}T23:59:59Z'
-                ])
+                    '-X', 'PATCH'
+                ] + args)
                 print(f"  Updated milestone: {title}")
             else:
                 # Create new milestone
                 self._run_gh_command([
                     'api', f'/repos/{self.repo}/milestones',
-                    '-X', 'POST',
-                    '-f', f'title={title}',
-                    '-f', f'description={description}',
-                    '-f', f'due_on={due_date}T23:59:59Z'
-                ])
+                    '-X', 'POST'
+                ] + args)
                 print(f"  Created milestone: {title}")
 
-    def create_or_update_issues(self):
-        """Create or update GitHub issues from tasks"""
-        print("\n=== Creating/Updating Issues ===")
+            synced[title] = {'hash': digest}
+
+        if unchanged:
+            print(f"  Unchanged: {unchanged} milestones")
 
-        # Get existing issues
+    def _render_issue(self, task: Dict, milestone_titles: Dict[str, str]) -> Dict:
+        """Render the GitHub representation of a task"""
+        labels = list(task.get('labels', []))
+
+        # Add status label
+        labels.append(f"status:{task['status']}")
+
+        # Add priority label
+        if task.get('priority'):
+            labels.append(f"priority:{task['priority']}")
+
+        return {
+            'title': f"{task['id']}: {task['title']}",
+            'body': self._create_issue_body(task),
+            'labels': sorted(set(labels)),
+            'milestone': milestone_titles.get(task.get('milestone')),
+            'state': 'closed' if task['status'] == 'completed' else 'open'
+        }
+
+    def _get_existing_issues(self) -> Dict[str, Dict]:
+        """Get existing issues keyed by title"""
         existing_issues = {}
         try:
             output = self._run_gh_command([
@@ -162,99 +237,127 @@ class GitHubSync:
                 existing_issues[issue['title']] = issue
         except:
             pass
+        return existing_issues
 
-        # Get milestones for mapping
-        milestone_map = {}
-        try:
-            output = self._run_gh_command([
-                'api', f'/repos/{self.repo}/milestones',
-                '--jq', '.[] | {title: .title, number: .number}'
-            ])
-            for line in output.split('\n'):
-                if line.strip():
-                    data = json.loads(line)
-                    milestone_map[data['title']] = data['number']
-        except:
-            pass
+    def create_or_update_issues(self):
+        """Create or update GitHub issues from tasks"""
+        print("\n=== Creating/Updating Issues ===")
 
         # Get milestone titles from tasks data
         milestone_titles = {m['id']: m['title'] for m in self.tasks_data['milestones']}
 
+        synced = self.state['issues']
+        changed: List[Tuple[Dict, Dict, str]] = []
         for task in self.tasks_data['tasks']:
-            title = f"{task['id']}: {task['title']}"
-            body = self._create_issue_body(task)
-            labels = task.get('labels', [])
-
-            # Add status label
-            labels.append(f"status:{task['status']}")
-
-            # Add priority label
-            if task.get('priority'):
-                labels.append(f"priority:{task['priority']}")
-
-            # Get milestone number
-            milestone_title = None
-            if task.get('milestone') and task['milestone'] in milestone_titles:
-                milestone_title = milestone_titles[task['milestone']]
-                milestone_title = milestone_titles[task['milestone']]
-
-            if title in existing_issues:
-                # Update existing issue
-                issue = existing_issues[title]
-                issue_number = issue['number']
-
-                # Determine state
-                state = 'closed' if task['status'] == 'completed' else 'open'
-
-                # Update issue
-                cmd = [
-                    'issue', 'edit', str(issue_number),
-                    '--repo', self.repo,
-                    '--body', body
-                ]
-
-                if labels:
-                    cmd.extend(['--add-label', ','.join(labels)])
-
-                if milestone_title:
-                    cmd.extend(['--milestone', milestone_title])
-
-                self._run_gh_command(cmd)
-
-                # Update state if needed
-                if issue['state'] != state:
-                    if state == 'closed':
-                        self._run_gh_command(['issue', 'close', str(issue_number), '--repo', self.repo])
-                    else:
-                        self._run_gh_command(['issue', 'reopen', str(issue_number), '--repo', self.repo])
-
-                print(f"  Updated issue #{issue_number}: {title}")
+            rendered = self._render_issue(task, milestone_titles)
+            digest = _content_hash(rendered)
+            entry = synced.get(task['id'])
+            if not entry or entry.get('hash') != digest:
+                changed.append((task, rendered, digest))
+
+        unchanged = len(self.tasks_data['tasks']) - len(changed)
+        if not changed:
+            print(f"  No changes ({unchanged} issues up to date)")
+            return
+
+        # Issues not in the sync state are matched by title
+        existing_issues = {}
+        if any(task['id'] not in synced for task, _, _ in changed):
+            existing_issues = self._get_existing_issues()
+
+        for task, rendered, digest in changed:
+            entry = synced.get(task['id'])
+            if entry:
+                issue_number = self._update_issue(entry['issue'], rendered, entry)
+            elif rendered['title'] in existing_issues:
+                issue = existing_issues[rendered['title']]
+                # Labels added by hand are left alone; generated ones are replaced
+                names = [label['name'] for label in issue.get('labels', [])]
+                previous = {
+                    'labels': [
+                        name for name in names
+                        if name in rendered['labels'] or name.startswith(MANAGED_LABEL_PREFIXES)
+                    ],
+                    'state': issue['state'].lower()
+                }
+                issue_number = self._update_issue(issue['number'], rendered, previous)
+            else:
+                issue_number = self._create_issue(task, rendered)
+
+            synced[task['id']] = {
+                'issue': issue_number,
+                'hash': digest,
+                'body': _content_hash(rendered['body']),
+                'title': rendered['title'],
+                'labels': rendered['labels'],
+                'milestone': rendered['milestone'],
+                'state': rendered['state']
+            }
+
+        if unchanged:
+            print(f"  Unchanged: {unchanged} issues")
+
+    def _update_issue(self, issue_number: int, rendered: Dict, previous: Dict) -> int:
+        """Send only the parts of an issue that differ from the previous sync"""
+        edits = []
+
+        if previous.get('title') != rendered['title']:
+            edits.extend(['--title', rendered['title']])
+
+        if previous.get('body') != _content_hash(rendered['body']):
+            edits.extend(['--body', rendered['body']])
+
+        added = [label for label in rendered['labels'] if label not in previous.get('labels', [])]
+        removed = [label for label in previous.get('labels', []) if label not in rendered['labels']]
+        if added:
+            edits.extend(['--add-label', ','.join(added)])
+        if removed:
+            edits.extend(['--remove-label', ','.join(removed)])
+
+        if rendered['milestone'] and previous.get('milestone') != rendered['milestone']:
+            edits.extend(['--milestone', rendered['milestone']])
+
+        if edits:
+            self._run_gh_command(['issue', 'edit', str(issue_number), '--repo', self.repo] + edits)
+
+        # Update state if needed
+        if previous.get('state') != rendered['state']:
+            if rendered['state'] == 'closed':
+                self._run_gh_command(['issue', 'close', str(issue_number), '--repo', self.repo])
             else:
-                # Create new issue
-                cmd = [
-                    'issue', 'create',
-                    '--repo', self.repo,
-                    '--title', title,
-                    '--body', body
-                ]
+                self._run_gh_command(['issue', 'reopen', str(issue_number), '--repo', self.repo])
+
+        print(f"  Updated issue #{issue_number}: {rendered['title']}")
+        return issue_number
+
+    def _create_issue(self, task: Dict, rendered: Dict) -> int:
+        """Create a new issue and return its number"""
+        cmd = [
+            'issue', 'create',
+            '--repo', self.repo,
+            '--title', rendered['title'],
+            '--body', rendered['body']
+        ]
 
-                if labels:
-                    cmd.extend(['--label', ','.join(labels)])
+        if rendered['labels']:
+            cmd.extend(['--label', ','.join(rendered['labels'])])
+
+        if rendered['milestone']:
+            cmd.extend(['--milestone', rendered['milestone']])
+
+        if task.get('assignee'):
+            cmd.extend(['--assignee', task['assignee']])
 
-                if milestone_title:
-                    cmd.extend(['--milestone', milestone_title])
+        output = self._run_gh_command(cmd)
+        print(f"  Created issue: {rendered['title']}")
 
-                if task.get('assignee'):
-                    cmd.extend(['--assignee', task['assignee']])
+        issue_number = int(output.strip().split('/')[-1])
 
-                output = self._run_gh_command(cmd)
-                print(f"  Created issue: {title}")
+        # Close issue if already completed
+        if rendered['state'] == 'closed':
+            self._run_gh_command(['issue', 'close', str(issue_number), '--repo', self.repo])
 
-                # Close issue if already completed
-                if task['status'] == 'completed':
-                    issue_url = output.strip()
-                    issue_number = issue_url.split('/')[-1]
-                    self._run_gh_command(['issue', 'close', issue_number, '--repo', self.repo])
+        return issue_number
 
     def _create_issue_body(self, task: Dict) -> str:
         """Create issue body from task data"""
@@ -362,8 +465,13 @@ class GitHubSync:
             sys.exit(1)
 
         self.load_data()
-        self.create_or_update_milestones()
-        self.create_or_update_issues()
+        self.load_state()
+        try:
+            self.create_or_update_milestones()
+            self.create_or_update_issues()
+        finally:
+            # Keep whatever was synced so a failed run resumes where it stopped
+            self.save_state()
         self.create_project_board()
         self.display_progress()
 
@@ -390,6 +498,15 @@ def main():
         '--repo',
         help='GitHub repository (owner/repo). Auto-detected if not specified'
     )
+    parser.add_argument(
+        '--state-file',
+        help='Path to the sync state file (default: .cache/github-sync-state.json next to tasks.json)'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Ignore the sync state and push every milestone and issue'
+    )
 
     args = parser.parse_args()
 
@@ -403,7 +520,8 @@ def main():
         sys.exit(1)
 
     try:
-        syncer = GitHubSync(args.tasks, args.schedule, args.repo)
+        syncer = GitHubSync(args.tasks, args.schedule, args.repo,
+                            state_file=args.state_file, full=args.full)
         syncer.sync()
     except Exception as e:
         print(f"\nError: {e}")
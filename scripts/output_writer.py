@@ -0,0 +1,156 @@
+"""
+生成ファイルの書き込み（内容が変わったときだけ書く）
+
+生成した内容のハッシュ（SHA-256）を既存ファイルのハッシュと比べ、同じなら書き込みを省略します。
+既存ファイルのハッシュは .cache/output-hashes.json に更新時刻・サイズと一緒に保存しておき、
+ファイルが変わっていなければ読み直さずに比較します。書き込むときは同じディレクトリの
+一時ファイルに書いてから os.replace で置き換えるので、途中で失敗しても壊れたファイルは残りません。
+
+使用例:
+    writer = get_writer()
+    if writer.write(Path("PLAN.md"), content):
+        print("PLAN.md を更新しました")
+    writer.changed    # 実際に書き込んだファイル
+    writer.unchanged  # 内容が同じで省略したファイル
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CACHE_FILE = Path(".cache") / "output-hashes.json"
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class OutputWriter:
+    """内容が変わったファイルだけを原子的に書き込む"""
+
+    def __init__(self, cache_file: Optional[Path] = CACHE_FILE):
+        # 相対パスは作成時のカレントディレクトリを基準にする
+        self.cache_file = Path(cache_file).resolve() if cache_file else None
+        self.changed: List[str] = []
+        self.unchanged: List[str] = []
+        self._lock = threading.Lock()
+        self._hashes: Optional[Dict[str, Dict]] = None
+
+    # ------------------------------------------------------------------
+    # ハッシュキャッシュ
+    # ------------------------------------------------------------------
+
+    def _load_hashes(self) -> Dict[str, Dict]:
+        if self._hashes is None:
+            self._hashes = {}
+            if self.cache_file and self.cache_file.exists():
+                try:
+                    with open(self.cache_file, "r", encoding="utf-8") as f:
+                        self._hashes = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    pass
+        return self._hashes
+
+    def _save_hashes(self):
+        if not self.cache_file:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.cache_file, json.dumps(self._hashes, indent=2, ensure_ascii=False).encode("utf-8"))
+        except OSError:
+            # キャッシュが書けなくても出力自体は成功させる
+            pass
+
+    def _existing_hash(self, path: Path, key: str) -> Optional[str]:
+        """既存ファイルのハッシュ（更新時刻とサイズが記録と同じなら読み直さない）"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        cached = self._load_hashes().get(key)
+        if cached and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+            return cached["hash"]
+
+        with open(path, "rb") as f:
+            return _content_hash(f.read())
+
+    # ------------------------------------------------------------------
+    # 書き込み
+    # ------------------------------------------------------------------
+
+    def write(self, path: Path, content: str) -> bool:
+        """
+        内容が変わっていればファイルを書き込む
+
+        Returns:
+            書き込んだ場合 True、内容が同じで省略した場合 False
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        data = content.encode("utf-8")
+        new_hash = _content_hash(data)
+
+        with self._lock:
+            changed = self._existing_hash(path, key) != new_hash
+            if changed:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                _atomic_write(path, data)
+
+            stat = path.stat()
+            self._load_hashes()[key] = {"hash": new_hash, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            self._save_hashes()
+            (self.changed if changed else self.unchanged).append(_display_path(path))
+
+        return changed
+
+    def print_summary(self):
+        """更新したファイルと省略したファイルを表示"""
+        if self.changed:
+            print(f"📝 更新したファイル: {', '.join(self.changed)}")
+        if self.unchanged:
+            print(f"⏭️  変更なし（書き込み省略）: {', '.join(self.unchanged)}")
+
+
+def _display_path(path: Path) -> str:
+    """表示用のパス（カレントディレクトリ以下なら相対パス）"""
+    try:
+        return str(path.resolve().relative_to(Path.cwd()))
+    except ValueError:
+        return str(path)
+
+
+def _atomic_write(path: Path, data: bytes):
+    """同じディレクトリの一時ファイルに書いてから置き換える"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # 既存ファイルのパーミッションを引き継ぐ
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        else:
+            os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+_writer: Optional[OutputWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> OutputWriter:
+    """プロセス内で共有するライターを取得（カレントディレクトリの .cache にハッシュを保存）"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = OutputWriter()
+    return _writer
@@ -0,0 +1,463 @@
+"""
+PLAN.md レンダラー
+
+schedule.json のタスクを1回の走査で Phase → カテゴリ別にまとめ、工数・Weight・期間を
+同時に集計してから、行のリストを最後に1度だけ結合して PLAN.md を生成します。
+Phase の数に制限はなく、"Phase 2" と "Phase 10" のような名前も番号順に並べます。
+
+週番号は schedule.json の weeklySchedule の期間（dateRange）から求めます。weeklySchedule が無い場合は
+週次スケジュールの集計と同じく、プロジェクト開始日を含む週（月曜始まり）を Week 1 とします。
+
+PlanRenderer はセクション（概要・Phase・タスク一覧など）ごとに描画できるため、
+sectioned_doc.splice と組み合わせて変更のあったセクションだけを描画し直せます。
+
+使用例:
+    content = render_plan(tasks_data, schedule_data)
+
+    renderer = PlanRenderer(tasks_data, schedule_data)
+    renderer.keys()                      # ["overview", "phase:Phase 1", ..., "closing"]
+    renderer.render_section("summary")
+"""
+
+import bisect
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+# 既定の Phase 名（該当しない Phase は Phase 名のみで表示）
+PHASE_TITLES = {
+    "Phase 1": "基盤整備と設計",
+    "Phase 2": "実装と技術検証",
+    "Phase 3": "フル移行と展開",
+}
+
+# Phase 完了マイルストーンの説明
+PHASE_MILESTONES = {
+    "Phase 1": "基盤整備・設計完了、LookerML設計方針確定",
+    "Phase 2": "Looker Studio高優先度ダッシュボード3種完成、LookerML基本構造実装完了",
+    "Phase 3": "全ダッシュボード完成、本番リリース",
+}
+
+CATEGORY_TITLES = {
+    "design": "設計・調査",
+    "development": "開発",
+    "testing": "テスト",
+    "documentation": "ドキュメント"
+}
+
+# 依存関係マップに表示する Phase ごとのタスク数
+DEPENDENCY_MAP_LIMIT = 5
+
+OVERVIEW_FOOTER = """- **ステークホルダー**: バックオフィス部門、マネージャー層、IT部門
+
+## 目的・目標
+
+### ビジネス目標
+- スプレッドシート管理工数を80%削減
+- データ更新の自動化によるリアルタイム分析の実現
+- 横展開可能なBI基盤の確立
+- 意思決定の高速化
+
+### 技術目標
+- BigQueryを基盤としたLooker/Looker Studio環境の構築
+- LookerML（コードベース管理）の導入と標準化
+- 30個以上のスプレッドシート（48シート）からの完全移行
+- 既存BigQuery DWHテーブルの活用
+
+### 成功基準
+- [ ] スプレッドシート管理工数を80%削減
+- [ ] ダッシュボード更新の自動化率100%
+- [ ] マネージャー層の満足度80%以上
+- [ ] BigQueryクエリコストを月間予算（5-10万円）内に収める
+- [ ] データ整合性100%（スプレッドシートとの突合）
+- [ ] LookerML開発者を3名以上育成
+- [ ] 全成果物の期限内納品
+
+## プロジェクトスコープ
+
+### 含まれるもの（In Scope）
+- 既存BigQuery DWHテーブルの確認とマッピング
+- Looker/Looker Studioからの既存テーブル接続
+- 7つのダッシュボードの構築（高優先度3、中優先度3、低優先度1）
+- LookerMLによるコードベース管理の導入
+- データ整合性検証スクリプトの作成
+- ユーザートレーニングとドキュメント整備
+
+### 含まれないもの（Out of Scope）
+- BigQueryテーブル構造の変更・再設計
+- ETLパイプラインの構築・変更（既に存在するため）
+- 既存システムからBigQueryへのデータ連携の変更
+- 新規データソースの追加
+
+## WBS（作業分解構造）
+
+"""
+
+RISK_SECTION = """## リスク管理
+
+| ID | リスク | 影響度 | 発生確率 | 対策 | 責任者 |
+|----|--------|--------|----------|------|--------|
+| RISK-001 | LookerML習熟度不足による開発遅延 | 高 | 中 | ・Phase 2でトライアル期間を設定<br>・外部トレーニングの活用<br>・シンプルな実装から開始 | PM |
+| RISK-002 | データ品質問題によるダッシュボード信頼性低下 | 高 | 中 | ・Phase 1での徹底的なデータ検証<br>・データ品質チェックの自動化<br>・問題データのクレンジングルール策定 | BI Engineer |
+| RISK-003 | ユーザー要件変更によるスコープクリープ | 中 | 高 | ・優先度による段階的実装<br>・変更管理プロセスの明確化<br>・Phase 3での調整バッファ確保 | PM |
+| RISK-004 | BigQueryコスト超過 | 中 | 低 | ・クエリ最適化<br>・コストモニタリングの自動化<br>・予算アラート設定 | BI Engineer |
+| RISK-005 | 50%稼働による遅延リスク | 高 | 中 | ・優先度の明確化<br>・クリティカルパスの管理<br>・早期のリスク検知とエスカレーション | PM |
+
+## マイルストーン
+
+"""
+
+CLOSING_SECTIONS = """
+## 成果物
+
+### Phase 1
+- [ ] 既存BigQuery DWHテーブルのドキュメント（テーブル一覧、スキーマ定義）
+- [ ] スプレッドシート→BigQueryマッピング表
+- [ ] データ品質チェックスクリプト
+- [ ] ダッシュボードワイヤーフレーム（高優先度3種）
+- [ ] KPI定義書
+- [ ] LookerML設計書
+
+### Phase 2
+- [ ] Looker Studioダッシュボード（優先度：高）×3
+  - 経営ダッシュボード
+  - 稼働状況ダッシュボード
+  - 財務ダッシュボード
+- [ ] Looker Models（advisor_operations, financial_analysis）
+- [ ] Looker Views（base, facts, aggregates）
+- [ ] Looker Explores（advisor_activity, contract_management等）
+- [ ] GitHubリポジトリ（LookerMLコードベース）
+- [ ] LookerML開発ガイドライン
+- [ ] トレーニング資料
+
+### Phase 3
+- [ ] Lookerダッシュボード（優先度：中）×3
+  - 顧問パフォーマンスダッシュボード
+  - 解約分析ダッシュボード
+  - 営業（SS）分析ダッシュボード
+- [ ] Lookerダッシュボード（優先度：低）×1
+  - 詳細分析ダッシュボード
+- [ ] システムアーキテクチャ設計書
+- [ ] ダッシュボード利用マニュアル
+- [ ] 運用手順書
+- [ ] トラブルシューティングガイド
+
+## コミュニケーション計画
+
+### 定例会議
+- **週次進捗会議**: 毎週月曜日 10:00-10:30
+- **フェーズレビュー**: 各Phase終了時（Week 4, Week 8, Week 12）
+
+### レポート
+- **週次レポート**: 毎週金曜日に進捗報告
+- **月次レポート**: 月末に全体まとめ
+
+### コミュニケーションチャネル
+- **Slack**: #project-dashboard-migration
+- **GitHub Projects**: 進捗トラッキング
+- **Email**: プロジェクト関係者メーリングリスト
+
+## 品質基準
+
+### ダッシュボード品質
+- [ ] データ整合性100%（スプレッドシートとの突合）
+- [ ] ダッシュボード目視検証完了
+- [ ] LookML構文チェック（LookML Validator）
+- [ ] ユーザーレビュー実施
+
+### ドキュメント
+- [ ] システムアーキテクチャ設計書作成
+- [ ] ダッシュボード利用マニュアル作成
+- [ ] LookerML開発ガイドライン作成
+- [ ] 運用手順書作成
+
+### セキュリティ
+- [ ] BigQuery IAMアクセス制御設定
+- [ ] 列レベルセキュリティ設定（顧問名、企業名）
+- [ ] 監査ログ有効化
+
+## 承認
+
+| 役割 | 氏名 | 承認日 | 署名 |
+|------|------|--------|------|
+| プロジェクトマネージャー | [未定] | - | _______ |
+| バックオフィス責任者 | [未定] | - | _______ |
+| IT部門責任者 | [未定] | - | _______ |
+
+---
+
+**作成日**: 2026-01-15
+**最終更新**: {today}
+**バージョン**: 1.0（自動生成）
+**SPEC.md参照**: Version 2.0 (2026-01-15)
+"""
+
+
+class PhaseSummary:
+    """Phase ごとの集計（1回の走査で更新する）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.tasks: List[Dict] = []
+        self.by_category: Dict[str, List[Dict]] = {}
+        self.effort = 0
+        self.hours = 0
+        self.weight = 0
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+
+    def add(self, task: Dict, start: int, end: int):
+        self.tasks.append(task)
+        self.by_category.setdefault(task.get("category", "その他"), []).append(task)
+        self.effort += task.get("effort", 0)
+        self.hours += task.get("effortHours", 0)
+        self.weight += task.get("weight", 0)
+        self.start = start if self.start is None else min(self.start, start)
+        self.end = end if self.end is None else max(self.end, end)
+
+    @property
+    def title(self) -> str:
+        subtitle = PHASE_TITLES.get(self.name)
+        return f"{self.name}: {subtitle}" if subtitle else self.name
+
+
+def _phase_sort_key(name: str):
+    """"Phase 2" < "Phase 10" となるよう数字部分を数値として比較する"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def _short_date(ordinal: int) -> str:
+    day = date.fromordinal(ordinal)
+    return f"{day.month}/{day.day}"
+
+
+def _week_lookup(schedule_data: Dict, first_day: int):
+    """日付（序数）→ 週番号 の関数を返す"""
+    week_starts = []
+    for week in schedule_data.get("weeklySchedule", []):
+        range_start = week.get("dateRange", "").split("〜")[0].strip()
+        if range_start:
+            week_starts.append(date.fromisoformat(range_start).toordinal())
+
+    if week_starts:
+        # 各週の開始日で二分探索（最初の週より前の日付は Week 1）
+        return lambda ordinal: max(bisect.bisect_right(week_starts, ordinal), 1)
+
+    start_date = schedule_data.get("project", {}).get("startDate")
+    base = date.fromisoformat(start_date).toordinal() if start_date else first_day
+    first_monday = base - date.fromordinal(base).weekday()
+    return lambda ordinal: (ordinal - first_monday) // 7 + 1
+
+
+def group_by_phase(tasks: List[Dict]) -> List[PhaseSummary]:
+    """タスクを Phase ごとに集計（Phase 名の番号順）"""
+    phases: Dict[str, PhaseSummary] = {}
+    for task in tasks:
+        name = task.get("phase", "") or "その他"
+        summary = phases.get(name)
+        if summary is None:
+            summary = phases[name] = PhaseSummary(name)
+        summary.add(
+            task,
+            date.fromisoformat(task["startDate"]).toordinal(),
+            date.fromisoformat(task["endDate"]).toordinal()
+        )
+    return [phases[name] for name in sorted(phases, key=_phase_sort_key)]
+
+
+class PlanRenderer:
+    """
+    PLAN.md をセクション単位で描画する
+
+    集計（Phase・合計・週番号）は作成時に1度だけ行い、各セクションはそれを参照して描画する。
+    セクションのキー: overview, phase:<Phase名>, task-table, dependency-map, summary, milestones, closing
+    """
+
+    def __init__(self, tasks_data: Dict, schedule_data: Dict, today: Optional[datetime] = None):
+        self.today = today or datetime.now()
+        self.project_name = tasks_data.get("project", {}).get("name", "プロジェクト")
+        self.schedule_project = schedule_data.get("project", {})
+        self.tasks = schedule_data.get("tasks", [])
+        self.total_weeks = len(schedule_data.get("weeklySchedule", []))
+
+        self.phases = group_by_phase(self.tasks)
+        self.phase_index = {phase.name: index for index, phase in enumerate(self.phases, start=1)}
+        self.total_effort = sum(phase.effort for phase in self.phases)
+        self.total_hours = sum(phase.hours for phase in self.phases)
+        self.total_weight = sum(phase.weight for phase in self.phases)
+
+        if self.phases:
+            start = min(phase.start for phase in self.phases)
+            end = max(phase.end for phase in self.phases)
+            self.project_start = date.fromordinal(start).isoformat()
+            self.project_end = date.fromordinal(end).isoformat()
+            self.total_days = end - start + 1
+        else:
+            self.project_start = self.project_end = "未定"
+            self.total_days = 0
+            start = 0
+        self.week_of = _week_lookup(schedule_data, start)
+
+        self._renderers = {
+            "overview": self._render_overview,
+            "task-table": self._render_task_table,
+            "dependency-map": self._render_dependency_map,
+            "summary": self._render_summary,
+            "milestones": self._render_milestones,
+            "closing": self._render_closing,
+        }
+
+    def keys(self) -> List[str]:
+        """セクションのキー（表示順）"""
+        return (
+            ["overview"]
+            + [f"phase:{phase.name}" for phase in self.phases]
+            + ["task-table", "dependency-map", "summary", "milestones", "closing"]
+        )
+
+    def render_section(self, key: str) -> str:
+        """1セクションを描画"""
+        if key.startswith("phase:"):
+            name = key[len("phase:"):]
+            return self._render_phase(self.phases[self.phase_index[name] - 1])
+        return self._renderers[key]()
+
+    def render(self) -> str:
+        """全セクションを描画（マーカーなし）"""
+        return "".join(self.render_section(key) for key in self.keys())
+
+    # ------------------------------------------------------------------
+    # セクション
+    # ------------------------------------------------------------------
+
+    def _week_label(self, phase: PhaseSummary) -> str:
+        first_week, last_week = self.week_of(phase.start), self.week_of(phase.end)
+        return f"Week {first_week}" if first_week == last_week else f"Week {first_week}-{last_week}"
+
+    @staticmethod
+    def _date_label(phase: PhaseSummary) -> str:
+        return f"{_short_date(phase.start)}-{_short_date(phase.end)}"
+
+    def _render_overview(self) -> str:
+        lines = [
+            f"# {self.project_name} 実行計画書\n",
+            "\n",
+            "## プロジェクト概要\n",
+            "\n",
+            f"- **プロジェクト名**: {self.project_name}\n",
+            f"- **開始日**: {self.project_start}\n",
+            f"- **終了日**: {self.project_end}\n",
+            f"- **期間**: {self.total_weeks}週間（約{self.total_days}日間）\n",
+            f"- **稼働体制**: {self.schedule_project.get('teamSize', '1名兼任（50%稼働）')}\n",
+            f"- **総稼働日数**: {self.schedule_project.get('workingDays', 56)}日（土日祝を除く）\n",
+            f"- **総工数**: {self.total_effort}人日（{self.total_hours}時間）\n",
+            OVERVIEW_FOOTER,
+        ]
+        return "".join(lines)
+
+    def _render_phase(self, phase: PhaseSummary) -> str:
+        """WBS（Phase → カテゴリ → タスク）"""
+        index = self.phase_index[phase.name]
+        lines = [f"### {phase.title} ({self._week_label(phase)}: {self._date_label(phase)})\n\n"]
+        for section, (category, category_tasks) in enumerate(phase.by_category.items(), start=1):
+            lines.append(f"#### {index}.{section} {CATEGORY_TITLES.get(category, category.capitalize())}\n")
+            for task in sorted(category_tasks, key=lambda x: x["id"]):
+                dependencies = task.get("dependencies", [])
+                lines.append(
+                    f"- **{task['id']}** {task.get('title', '')}\n"
+                    f"  - 担当: {task.get('assignee', '未定')}\n"
+                    f"  - 工数: {task.get('effort', 0)}日（{task.get('effortHours', 0)}時間）\n"
+                    f"  - Weight: {task.get('weight', 0)}\n"
+                    f"  - 依存: {', '.join(dependencies) if dependencies else 'なし'}\n"
+                    f"  - 説明: {task.get('description', '')}\n\n"
+                )
+        lines.append(f"**{phase.name} 合計**: {phase.effort}日（{phase.hours}時間）、Weight {phase.weight}\n\n")
+        return "".join(lines)
+
+    def _render_task_table(self) -> str:
+        """タスク一覧テーブル"""
+        lines = [
+            "## タスク一覧（GitHub Projects用）\n\n",
+            "| ID | タスク名 | Phase | 工数 | Weight | 依存関係 | カテゴリ |\n",
+            "|----|---------|-------|------|--------|----------|----------|\n",
+        ]
+        for task in sorted(self.tasks, key=lambda x: x["id"]):
+            dependencies = task.get("dependencies", [])
+            lines.append(
+                f"| {task['id']} | {task.get('title', '')} | {task.get('phase', '')} | {task.get('effort', 0)}日 | "
+                f"{task.get('weight', 0)} | {', '.join(dependencies) if dependencies else '-'} | {task.get('category', '')} |\n"
+            )
+
+        lines.append("\n**Weight設定ガイド:**\n")
+        lines.append(f"- 総Weight = {self.total_weight} (プロジェクト全体の進捗を%で管理)\n")
+        lines.append("- 0.5日タスク = Weight 2, 1日タスク = Weight 3-4, 1.5日タスク = Weight 5, 2.5日タスク = Weight 9\n\n")
+        return "".join(lines)
+
+    def _render_dependency_map(self) -> str:
+        """依存関係マップ（各Phaseの先頭のタスクのみ）"""
+        lines = ["## 依存関係マップ\n\n```\n"]
+        for index, phase in enumerate(self.phases):
+            prefix = "\n" if index else ""
+            lines.append(f"{prefix}{phase.title} (Weight: {phase.weight})\n")
+            for task in phase.tasks[:DEPENDENCY_MAP_LIMIT]:
+                lines.append(f"├── {task['id']}: {task.get('title', '')} (W:{task.get('weight', 0)})\n")
+        lines.append("```\n\n")
+        return "".join(lines)
+
+    def _render_summary(self) -> str:
+        """工数サマリー"""
+        total_effort, total_hours = self.total_effort, self.total_hours
+        lines = [
+            "## 工数サマリー\n\n",
+            "### Phase別工数\n\n",
+            "| Phase | 期間 | タスク数 | 総工数 | Total Weight |\n",
+            "|-------|------|----------|--------|--------------|\n",
+        ]
+        for phase in self.phases:
+            lines.append(
+                f"| {phase.name} | {self._week_label(phase)} ({self._date_label(phase)}) | {len(phase.tasks)}個 | "
+                f"{phase.effort}日 ({phase.hours}時間) | {phase.weight}% |\n"
+            )
+        lines.append(
+            f"| **合計** | **{self.total_weeks}週間** | **{len(self.tasks)}個** | "
+            f"**{total_effort}日 ({total_hours}時間)** | **{self.total_weight}%** |\n\n"
+        )
+
+        lines.append("### メンバー別工数\n\n")
+        lines.append("| メンバー | 担当タスク数 | 総工数 | 備考 |\n")
+        lines.append("|---------|-------------|--------|------|\n")
+        lines.append(f"| BI Engineer | {len(self.tasks)}個 | {total_effort}日 ({total_hours}時間) | 50%稼働（1日3.5時間） |\n\n")
+
+        buffer_rate = ((28 - total_effort) / 28 * 100) if total_effort > 0 else 0
+        lines.append("### 稼働日数計算\n\n")
+        lines.append(f"- **プロジェクト期間**: {self.project_start}〜{self.project_end}（{self.total_days}日間）\n")
+        lines.append("- **休業日**: 土日、1/12(成人の日)、2/11(建国記念の日)、2/23(天皇誕生日)、3/20(春分の日)\n")
+        lines.append("- **稼働日数**: 約56日\n")
+        lines.append("- **50%稼働**: 28人日 = 196時間\n")
+        lines.append(f"- **計画工数**: {total_effort}人日 = {total_hours}時間\n")
+        lines.append(f"- **余裕率**: {buffer_rate:.1f}%\n\n")
+        return "".join(lines)
+
+    def _render_milestones(self) -> str:
+        """リスク管理とマイルストーン（各Phaseの最終日）"""
+        lines = [RISK_SECTION]
+        for phase in self.phases:
+            summary = PHASE_MILESTONES.get(phase.name)
+            description = f"{phase.name}完了 - {summary}" if summary else f"{phase.name}完了"
+            lines.append(f"- **Week {self.week_of(phase.end)} ({date.fromordinal(phase.end).isoformat()})**: {description}\n")
+        return "".join(lines)
+
+    def _render_closing(self) -> str:
+        return CLOSING_SECTIONS.format(today=self.today.strftime("%Y-%m-%d"))
+
+
+def render_plan(tasks_data: Dict, schedule_data: Dict, today: Optional[datetime] = None) -> str:
+    """
+    PLAN.md の内容を生成
+
+    Args:
+        tasks_data: tasks.json のデータ（プロジェクト名）
+        schedule_data: schedule.json のデータ（日付入りのタスクと週次スケジュール）
+        today: 最終更新日（省略時は今日）
+    """
+    return PlanRenderer(tasks_data, schedule_data, today).render()
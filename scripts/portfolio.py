@@ -0,0 +1,126 @@
+"""
+ポートフォリオ（複数プロジェクト）の進捗集計
+
+ルートディレクトリ以下の tasks.json を探し、プロジェクトごとのEVM指標を
+プロセスプールで並列に計算して、予算（見積工数）で重み付けした全体の指標にまとめます。
+各ワーカーはJSONの読み込みとEVM計算まで行い、親プロセスには小さな集計結果だけを返します。
+
+重み付けの考え方:
+    プロジェクトごとに weight の合計（BAC）が異なるため、各プロジェクトの PV / EV を
+    「BAC に対する割合 × プロジェクトの予算（見積工数の合計、時間）」に換算してから合計します。
+    AC は実工数（時間）なのでそのまま合計し、全体の CPI = EV / AC も時間どうしの比になります。
+
+使用例:
+    summaries = load_portfolio("projects/", workers=8)
+    portfolio = rollup_portfolio(summaries)
+    portfolio["progress_rate"], portfolio["spi"]
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from evm import compute_evm
+from task_model import load_project
+
+# 探索しないディレクトリ
+SKIP_DIRS = {".git", ".cache", "node_modules", "__pycache__", "venv", ".venv"}
+
+# ワーカー1つに一度に渡すプロジェクト数（プロセス間通信の回数を減らす）
+CHUNK_SIZE = 8
+
+
+def discover_projects(root: str) -> Iterator[str]:
+    """root以下で tasks.json を持つディレクトリを順に返す（パス順）"""
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        if "tasks.json" in filenames:
+            yield directory
+
+
+def summarize_project(project_dir: str, as_of: Optional[datetime] = None) -> Dict:
+    """
+    1プロジェクトを読み込んでEVM指標を計算（ワーカープロセスで実行）
+
+    読み込みは task_model のキャッシュを使うので、変更の無いプロジェクトはJSONを解析し直さない。
+
+    Returns:
+        {path, name, task_count, budget, overall} または読み込みに失敗した場合は {path, error}
+    """
+    try:
+        model = load_project(project_dir)
+        project = model.project
+        tasks = model.tasks
+        overall = compute_evm(tasks, group_by={}, as_of=as_of, calendar=model.calendar)["overall"]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return {"path": project_dir, "error": str(e)}
+
+    # 予算: タスクの見積工数の合計 → project.totalEffortHours → weight の合計
+    budget = sum(task.get("effortHours", 0) or 0 for task in tasks)
+    budget = budget or project.get("totalEffortHours") or overall["total_weight"]
+
+    return {
+        "path": project_dir,
+        "name": project.get("name", os.path.basename(os.path.abspath(project_dir))),
+        "task_count": len(tasks),
+        "budget": budget,
+        "overall": overall
+    }
+
+
+def load_portfolio(root: str, workers: Optional[int] = None,
+                   as_of: Optional[datetime] = None) -> List[Dict]:
+    """
+    root以下の全プロジェクトを集計
+
+    Args:
+        root: 探索するルートディレクトリ
+        workers: ワーカープロセス数（省略時はCPU数、1ならプロセスを使わない）
+        as_of: PVの基準日時（省略時は現在）
+    """
+    project_dirs = list(discover_projects(root))
+    as_of = as_of or datetime.now()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(project_dirs) <= 1:
+        return [summarize_project(project_dir, as_of) for project_dir in project_dirs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(project_dirs))) as executor:
+        return list(executor.map(
+            summarize_project,
+            project_dirs,
+            [as_of] * len(project_dirs),
+            chunksize=CHUNK_SIZE
+        ))
+
+
+def rollup_portfolio(summaries: List[Dict]) -> Dict:
+    """
+    プロジェクトごとの指標を予算で重み付けして全体の指標にまとめる
+
+    Returns:
+        {project_count, task_count, budget, pv, ev, ac, spi, cpi, progress_rate, completion_rate}
+        （pv / ev / ac は時間換算）
+    """
+    totals = {"project_count": 0, "task_count": 0, "budget": 0.0, "pv": 0.0, "ev": 0.0, "ac": 0.0}
+    for summary in summaries:
+        if "error" in summary:
+            continue
+        overall = summary["overall"]
+        total_weight = overall["total_weight"]
+        scale = summary["budget"] / total_weight if total_weight > 0 else 0.0
+
+        totals["project_count"] += 1
+        totals["task_count"] += summary["task_count"]
+        totals["budget"] += summary["budget"]
+        totals["pv"] += overall["pv"] * scale
+        totals["ev"] += overall["ev"] * scale
+        totals["ac"] += overall["ac"]
+
+    budget = totals["budget"]
+    totals["spi"] = totals["ev"] / totals["pv"] if totals["pv"] > 0 else 0.0
+    totals["cpi"] = totals["ev"] / totals["ac"] if totals["ac"] > 0 else 0.0
+    totals["progress_rate"] = (totals["ev"] / budget * 100) if budget > 0 else 0.0
+    totals["completion_rate"] = (totals["pv"] / budget * 100) if budget > 0 else 0.0
+    return totals
@@ -0,0 +1,313 @@
+"""
+GitHub Projects V2 アイテムインデックス
+
+Projects V2 の全アイテムを pageInfo.endCursor でページングしながら取得し、
+Issue番号 → Item ID、フィールド名 → フィールドID（Single Selectはオプションも）の
+対応表をローカルキャッシュ（.cache/project-index.json）に保存します。
+
+キャッシュはプロジェクトのノードIDをキーとし、以下の順で再利用を判定します。
+    1. TTL以内ならそのまま使用
+    2. TTL切れの場合はプロジェクトの updatedAt とアイテム数・フィールド数だけを
+       問い合わせ（ETag相当）、一致すれば再利用
+    3. 必要なIssueがインデックスに無い場合は再取得
+       （再取得しても無いIssueはプロジェクトに含まれていないので、呼び出し側は
+       ProjectIndex.fresh を見て同じ実行の中で何度も再取得しないようにする）
+
+使用例:
+    index = load_project_index(run_gh_api, owner="sh-usami-rg", number=3,
+                               cache_file=base_dir / ".cache" / "project-index.json")
+    item_id = index.item_id("12")
+    field_id = index.field_id("Start Date")
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+# キャッシュの有効期限（秒）
+DEFAULT_TTL_SECONDS = 15 * 60
+
+# 1ページあたりの取得件数（GitHub GraphQL APIの上限）
+PAGE_SIZE = 100
+
+CACHE_VERSION = 1
+
+_PROJECT_FIELDS = """
+      id
+      title
+      number
+      updatedAt
+      fields(first: 100) {
+        totalCount
+        nodes {
+          ... on ProjectV2FieldCommon {
+            id
+            name
+          }
+          ... on ProjectV2SingleSelectField {
+            options {
+              id
+              name
+            }
+          }
+        }
+      }
+"""
+
+_ITEMS_PAGE = """
+      items(first: %d%s) {
+        totalCount
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          id
+          content {
+            ... on Issue {
+              number
+            }
+            ... on PullRequest {
+              number
+            }
+          }
+        }
+      }
+"""
+
+
+def _graphql_string(value: str) -> str:
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _items_selection(cursor: Optional[str]) -> str:
+    after = f", after: {_graphql_string(cursor)}" if cursor else ""
+    return _ITEMS_PAGE % (PAGE_SIZE, after)
+
+
+class ProjectIndex:
+    """Projects V2のフィールド・アイテム対応表（fresh: キャッシュではなくAPIから取得した直後か）"""
+
+    def __init__(self, entry: Dict, fresh: bool = False):
+        self.entry = entry
+        self.fresh = fresh
+
+    @property
+    def project_id(self) -> str:
+        return self.entry["id"]
+
+    @property
+    def title(self) -> str:
+        return self.entry.get("title", "")
+
+    @property
+    def number(self) -> Optional[int]:
+        return self.entry.get("number")
+
+    @property
+    def fields(self) -> Dict[str, Dict]:
+        """フィールド名 → {"id": ..., "options": {オプション名: オプションID}}"""
+        return self.entry["fields"]
+
+    @property
+    def items(self) -> Dict[str, str]:
+        """Issue番号（文字列） → Item ID"""
+        return self.entry["items"]
+
+    def field_id(self, name: str) -> Optional[str]:
+        field = self.fields.get(name)
+        return field["id"] if field else None
+
+    def option_id(self, field_name: str, option_name: str) -> Optional[str]:
+        field = self.fields.get(field_name)
+        if not field:
+            return None
+        return field.get("options", {}).get(option_name)
+
+    def item_id(self, issue_number) -> Optional[str]:
+        return self.items.get(str(issue_number))
+
+
+def _parse_fields(nodes: Iterable[Dict]) -> Dict[str, Dict]:
+    fields = {}
+    for node in nodes:
+        if not node or "name" not in node:
+            continue
+        field = {"id": node["id"]}
+        if "options" in node:
+            field["options"] = {option["name"]: option["id"] for option in node["options"]}
+        fields[node["name"]] = field
+    return fields
+
+
+def _collect_items(items: Dict[str, str], page: Dict):
+    for node in page.get("nodes", []):
+        content = node.get("content") if node else None
+        if content and "number" in content:
+            items[str(content["number"])] = node["id"]
+
+
+def _fetch_project(run_graphql: Callable[[str], Dict], owner: Optional[str],
+                   number: Optional[int], project_id: Optional[str]) -> Dict:
+    """プロジェクトのフィールドと全アイテムをページングしながら取得"""
+    if project_id:
+        query = f"""
+        {{
+          node(id: {_graphql_string(project_id)}) {{
+            ... on ProjectV2 {{
+{_PROJECT_FIELDS}
+{_items_selection(None)}
+            }}
+          }}
+        }}
+        """
+        project = (run_graphql(query).get("data") or {}).get("node")
+    else:
+        query = f"""
+        {{
+          user(login: {_graphql_string(owner)}) {{
+            projectV2(number: {int(number)}) {{
+{_PROJECT_FIELDS}
+{_items_selection(None)}
+            }}
+          }}
+        }}
+        """
+        project = ((run_graphql(query).get("data") or {}).get("user") or {}).get("projectV2")
+
+    if not project or "id" not in project:
+        target = project_id or f"{owner}/projects/{number}"
+        raise ValueError(f"Projects V2が見つかりません: {target}")
+
+    items: Dict[str, str] = {}
+    page = project["items"]
+    _collect_items(items, page)
+
+    # 2ページ目以降はノードIDで取得
+    while page["pageInfo"]["hasNextPage"]:
+        query = f"""
+        {{
+          node(id: {_graphql_string(project["id"])}) {{
+            ... on ProjectV2 {{
+{_items_selection(page["pageInfo"]["endCursor"])}
+            }}
+          }}
+        }}
+        """
+        page = run_graphql(query)["data"]["node"]["items"]
+        _collect_items(items, page)
+
+    return {
+        "id": project["id"],
+        "title": project.get("title", ""),
+        "number": project.get("number"),
+        "updatedAt": project.get("updatedAt"),
+        "itemCount": project["items"]["totalCount"],
+        "fieldCount": project["fields"]["totalCount"],
+        "fields": _parse_fields(project["fields"]["nodes"]),
+        "items": items,
+        "fetchedAt": time.time()
+    }
+
+
+def _fetch_fingerprint(run_graphql: Callable[[str], Dict], project_id: str) -> Dict:
+    """キャッシュ検証用のプロジェクト更新情報を取得"""
+    query = f"""
+    {{
+      node(id: {_graphql_string(project_id)}) {{
+        ... on ProjectV2 {{
+          updatedAt
+          items {{
+            totalCount
+          }}
+          fields {{
+            totalCount
+          }}
+        }}
+      }}
+    }}
+    """
+    node = (run_graphql(query).get("data") or {}).get("node") or {}
+    return {
+        "updatedAt": node.get("updatedAt"),
+        "itemCount": (node.get("items") or {}).get("totalCount"),
+        "fieldCount": (node.get("fields") or {}).get("totalCount")
+    }
+
+
+def _load_cache(cache_file: Optional[Path]) -> Dict:
+    empty = {"version": CACHE_VERSION, "projects": {}, "aliases": {}}
+    if not cache_file or not cache_file.exists():
+        return empty
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return empty
+    if cache.get("version") != CACHE_VERSION:
+        return empty
+    return cache
+
+
+def _save_cache(cache_file: Optional[Path], cache: Dict):
+    if not cache_file:
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False)
+
+
+def load_project_index(
+    run_graphql: Callable[[str], Dict],
+    owner: Optional[str] = None,
+    number: Optional[int] = None,
+    project_id: Optional[str] = None,
+    cache_file: Optional[Path] = None,
+    ttl: float = DEFAULT_TTL_SECONDS,
+    require_issues: Optional[Iterable] = None,
+    refresh: bool = False
+) -> ProjectIndex:
+    """
+    Projects V2のインデックスを取得（キャッシュがあれば再利用）
+
+    Args:
+        run_graphql: GraphQLクエリ文字列を受け取りレスポンスJSONを返す関数
+        owner, number: ユーザー所有プロジェクトの指定（project_idが無い場合）
+        project_id: Projects V2のノードID
+        cache_file: キャッシュファイルのパス（Noneならキャッシュしない）
+        ttl: 検証なしでキャッシュを使う秒数
+        require_issues: インデックスに含まれているべきIssue番号
+        refresh: Trueなら常に再取得
+    """
+    if not project_id and not (owner and number):
+        raise ValueError("project_id または owner と number を指定してください")
+
+    cache = _load_cache(cache_file)
+    alias = f"user:{owner}/{number}" if owner and number else None
+    resolved_id = project_id or cache["aliases"].get(alias)
+    entry = cache["projects"].get(resolved_id) if resolved_id else None
+
+    if entry and not refresh:
+        required = [str(issue) for issue in (require_issues or [])]
+        if any(issue not in entry["items"] for issue in required):
+            entry = None
+        elif time.time() - entry.get("fetchedAt", 0) > ttl:
+            fingerprint = _fetch_fingerprint(run_graphql, resolved_id)
+            if all(entry.get(key) == value for key, value in fingerprint.items()):
+                entry["fetchedAt"] = time.time()
+                _save_cache(cache_file, cache)
+            else:
+                entry = None
+    else:
+        entry = None
+
+    fresh = entry is None
+    if fresh:
+        entry = _fetch_project(run_graphql, owner, number, resolved_id)
+        cache["projects"][entry["id"]] = entry
+        if alias:
+            cache["aliases"][alias] = entry["id"]
+        _save_cache(cache_file, cache)
+
+    return ProjectIndex(entry, fresh=fresh)
@@ -0,0 +1,262 @@
+"""
+GitHub Projects V2 フィールド一括更新モジュール
+
+複数の updateProjectV2ItemFieldValue をエイリアス付きの1つのmutationドキュメントに
+まとめて送信し、gh api graphql の呼び出し回数をタスク数に依存しない回数に抑えます。
+Issueのプロジェクトへの追加（addProjectV2ItemById）も同じ方法でまとめて送信します。
+
+使用例:
+    batch = ProjectFieldBatch(project_id, run_gh_api)
+    batch.set_date(item_id, start_field_id, "2026-01-06", label="TASK-001 Start Date")
+    batch.set_date(item_id, end_field_id, "2026-01-08", label="TASK-001 End Date")
+    updated, errors = batch.flush()
+
+    project_id = resolve_project_id(run_gh_api, "sh-usami-rg", 3)
+    content_ids = issue_node_ids(run_gh_api, "sh-usami-rg", "dashboard-migration-project", ["12", "13"])
+    items = ProjectItemBatch(project_id, run_gh_api)
+    items.add(content_ids["12"], label="#12")
+    item_ids, errors = items.flush()   # {"#12": "PVTI_..."}
+"""
+
+import json
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# 1リクエストあたりのmutation数の上限
+# （GitHubのセカンダリレート制限ではmutation 1件あたり5ポイントとして計算されるため、
+#   1ドキュメントを小さく保つ）
+MAX_MUTATIONS_PER_REQUEST = 50
+
+# 1リクエストで問い合わせるIssue数
+MAX_ISSUES_PER_QUERY = 100
+
+
+def _graphql_string(value: str) -> str:
+    """GraphQLの文字列リテラルに変換（エスケープ付き）"""
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _alias_results(response: Dict, labels: List[str], prefix: str) -> Tuple[List[Tuple[str, Dict]], List[str]]:
+    """
+    エイリアス付きドキュメントのレスポンスをエイリアス単位の結果とエラーに分ける
+
+    Returns:
+        (成功した (ラベル, 結果のデータ) のリスト, エラーメッセージのリスト)
+    """
+    results: List[Tuple[str, Dict]] = []
+    errors: List[str] = []
+    failed = {}
+    for error in (response or {}).get("errors", []) or []:
+        path = error.get("path") or []
+        if path and str(path[0]).startswith(prefix):
+            failed[str(path[0])] = error.get("message", "unknown error")
+        else:
+            errors.append(error.get("message", "unknown error"))
+
+    data = (response or {}).get("data") or {}
+    for index, label in enumerate(labels):
+        alias = f"{prefix}{index}"
+        if alias in failed:
+            errors.append(f"{label}: {failed[alias]}")
+        elif data.get(alias):
+            results.append((label, data[alias]))
+        else:
+            errors.append(f"{label}: no result")
+    return results, errors
+
+
+def resolve_project_id(run_graphql: Callable[[str], Dict], owner: str, number: int) -> str:
+    """ユーザー所有の Projects V2 の番号からノードIDを取得"""
+    query = f"{{ user(login: {_graphql_string(owner)}) {{ projectV2(number: {int(number)}) {{ id }} }} }}"
+    project = ((run_graphql(query).get("data") or {}).get("user") or {}).get("projectV2")
+    if not project:
+        raise ValueError(f"Projects V2が見つかりません: {owner}/projects/{number}")
+    return project["id"]
+
+
+def issue_node_ids(
+    run_graphql: Callable[[str], Dict],
+    owner: str,
+    repo: str,
+    numbers: Iterable,
+    chunk_size: int = MAX_ISSUES_PER_QUERY
+) -> Dict[str, str]:
+    """
+    Issue番号 → IssueのノードID（エイリアス付きクエリでまとめて取得、見つからない番号は含まない）
+    """
+    numbers = [str(number) for number in numbers]
+    node_ids: Dict[str, str] = {}
+    for offset in range(0, len(numbers), max(1, chunk_size)):
+        chunk = numbers[offset:offset + max(1, chunk_size)]
+        selections = "\n".join(f"    i{index}: issue(number: {int(number)}) {{ id }}" for index, number in enumerate(chunk))
+        query = (
+            f"{{\n  repository(owner: {_graphql_string(owner)}, name: {_graphql_string(repo)}) {{\n"
+            f"{selections}\n  }}\n}}"
+        )
+        repository = (run_graphql(query).get("data") or {}).get("repository") or {}
+        for index, number in enumerate(chunk):
+            issue = repository.get(f"i{index}")
+            if issue:
+                node_ids[number] = issue["id"]
+    return node_ids
+
+
+class ProjectFieldBatch:
+    """Projects V2アイテムのフィールド更新をまとめて送信するバッチ"""
+
+    def __init__(
+        self,
+        project_id: str,
+        run_graphql: Callable[[str], Dict],
+        chunk_size: int = MAX_MUTATIONS_PER_REQUEST
+    ):
+        """
+        Args:
+            project_id: Projects V2のノードID
+            run_graphql: GraphQLクエリ文字列を受け取りレスポンスJSONを返す関数
+            chunk_size: 1リクエストにまとめるmutation数
+        """
+        self.project_id = project_id
+        self.run_graphql = run_graphql
+        self.chunk_size = max(1, chunk_size)
+        # (item_id, field_id, valueリテラル, ラベル)
+        self.pending: List[Tuple[str, str, str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def _queue(self, item_id: str, field_id: str, value_literal: str, label: str):
+        self.pending.append((item_id, field_id, value_literal, label or item_id))
+
+    def set_date(self, item_id: str, field_id: str, value: str, label: str = ""):
+        """日付フィールドの更新を登録（YYYY-MM-DD）"""
+        self._queue(item_id, field_id, f"{{date: {_graphql_string(value)}}}", label)
+
+    def set_text(self, item_id: str, field_id: str, value: str, label: str = ""):
+        """テキストフィールドの更新を登録"""
+        self._queue(item_id, field_id, f"{{text: {_graphql_string(value)}}}", label)
+
+    def set_number(self, item_id: str, field_id: str, value: float, label: str = ""):
+        """数値フィールドの更新を登録"""
+        self._queue(item_id, field_id, f"{{number: {float(value)}}}", label)
+
+    def set_single_select(self, item_id: str, field_id: str, option_id: str, label: str = ""):
+        """Single Selectフィールドの更新を登録"""
+        self._queue(
+            item_id, field_id,
+            f"{{singleSelectOptionId: {_graphql_string(option_id)}}}",
+            label
+        )
+
+    def _build_mutation(self, chunk: List[Tuple[str, str, str, str]]) -> str:
+        """エイリアス付きmutationドキュメントを生成"""
+        project_id = _graphql_string(self.project_id)
+        operations = []
+        for index, (item_id, field_id, value_literal, _) in enumerate(chunk):
+            operations.append(
+                f"  u{index}: updateProjectV2ItemFieldValue(input: {{"
+                f"projectId: {project_id}, "
+                f"itemId: {_graphql_string(item_id)}, "
+                f"fieldId: {_graphql_string(field_id)}, "
+                f"value: {value_literal}"
+                f"}}) {{ projectV2Item {{ id }} }}"
+            )
+        return "mutation {\n" + "\n".join(operations) + "\n}"
+
+    def flush(self) -> Tuple[int, List[str]]:
+        """
+        登録済みの更新をチャンク単位で送信
+
+        Returns:
+            (成功した更新数, エラーメッセージのリスト)
+        """
+        updated = 0
+        errors: List[str] = []
+
+        pending, self.pending = self.pending, []
+
+        for offset in range(0, len(pending), self.chunk_size):
+            chunk = pending[offset:offset + self.chunk_size]
+            labels = [label for _, _, _, label in chunk]
+            try:
+                response = self.run_graphql(self._build_mutation(chunk))
+            except Exception as e:
+                errors.extend(f"{label}: {e}" for label in labels)
+                continue
+
+            # エイリアス単位でエラーを判定（他のmutationは適用される）
+            results, chunk_errors = _alias_results(response, labels, "u")
+            updated += len(results)
+            errors.extend(chunk_errors)
+
+        return updated, errors
+
+
+class ProjectItemBatch:
+    """IssueのProjects V2への追加（addProjectV2ItemById）をまとめて送信するバッチ"""
+
+    def __init__(
+        self,
+        project_id: str,
+        run_graphql: Callable[[str], Dict],
+        chunk_size: int = MAX_MUTATIONS_PER_REQUEST
+    ):
+        """
+        Args:
+            project_id: Projects V2のノードID
+            run_graphql: GraphQLクエリ文字列を受け取りレスポンスJSONを返す関数
+            chunk_size: 1リクエストにまとめるmutation数
+        """
+        self.project_id = project_id
+        self.run_graphql = run_graphql
+        self.chunk_size = max(1, chunk_size)
+        # (content_id, ラベル)
+        self.pending: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def add(self, content_id: str, label: str = ""):
+        """Issue（またはPR）のノードIDの追加を登録"""
+        self.pending.append((content_id, label or content_id))
+
+    def _build_mutation(self, chunk: List[Tuple[str, str]]) -> str:
+        project_id = _graphql_string(self.project_id)
+        operations = [
+            f"  a{index}: addProjectV2ItemById(input: {{"
+            f"projectId: {project_id}, contentId: {_graphql_string(content_id)}"
+            f"}}) {{ item {{ id }} }}"
+            for index, (content_id, _) in enumerate(chunk)
+        ]
+        return "mutation {\n" + "\n".join(operations) + "\n}"
+
+    def flush(self) -> Tuple[Dict[str, str], List[str]]:
+        """
+        登録済みの追加をチャンク単位で送信（追加済みのIssueはそのままのアイテムが返る）
+
+        Returns:
+            (ラベル → Item ID, エラーメッセージのリスト)
+        """
+        item_ids: Dict[str, str] = {}
+        errors: List[str] = []
+
+        pending, self.pending = self.pending, []
+
+        for offset in range(0, len(pending), self.chunk_size):
+            chunk = pending[offset:offset + self.chunk_size]
+            labels = [label for _, label in chunk]
+            try:
+                response = self.run_graphql(self._build_mutation(chunk))
+            except Exception as e:
+                errors.extend(f"{label}: {e}" for label in labels)
+                continue
+
+            results, chunk_errors = _alias_results(response, labels, "a")
+            errors.extend(chunk_errors)
+            for label, result in results:
+                item = result.get("item") or {}
+                if item.get("id"):
+                    item_ids[label] = item["id"]
+                else:
+                    errors.append(f"{label}: no result")
+
+        return item_ids, errors
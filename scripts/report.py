@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+レポート一括生成スクリプト
+
+tasks.json / schedule.json を1度だけ読み込み、各レポート生成処理をステージとして
+1つのプロセスで実行します。出力ファイルが互いに独立しているため、--jobs を指定すると
+ステージをスレッドで並列に実行します。最後にステージごとの所要時間を表示します。
+
+ステージ:
+    progress   README.md の進捗セクション（calculate-progress.py）
+    daily      日次レポート（daily-report.py）と進捗スナップショットの記録
+    mindmap    docs/MINDMAP.md（generate-mindmap.py）
+    review     docs/TASK_REVIEW.md（generate-task-review.py）
+    plan       PLAN.md（update-schedule.py）
+    schedule   SCHEDULE.md（update-schedule.py）
+
+使い方:
+    # 全ステージを順に実行
+    python3 scripts/report.py
+
+    # 選んだステージだけを4スレッドで実行
+    python3 scripts/report.py --only progress,mindmap,review --jobs 4
+
+    # 日次レポートをGitHub Issueに投稿
+    python3 scripts/report.py --only daily --github --issue-number 1
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from output_writer import get_writer
+from task_model import ProjectModel, load_project
+
+SCRIPTS_DIR = Path(__file__).parent
+
+_modules: Dict[str, object] = {}
+
+
+def load_script(name: str):
+    """ハイフン付きのスクリプト（例: calculate-progress.py）をモジュールとして読み込む"""
+    if name not in _modules:
+        spec = importlib.util.spec_from_file_location(name.replace("-", "_"), SCRIPTS_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+class ReportContext:
+    """ステージ間で共有する読み込み済みデータと設定"""
+
+    def __init__(self, base_dir: Path, model: ProjectModel, args: argparse.Namespace):
+        self.base_dir = base_dir
+        self.model = model
+        self.args = args
+        self._manager = None
+
+    def prepare_manager(self):
+        """
+        PLAN.md / SCHEDULE.md 生成用のマネージャーを作成（読み込み済みデータを使う）
+
+        model.data は schedule.json の日付を補ったものなので、update-schedule.py と同じ
+        ダイジェストになり、tasks.json に書き戻しても内容が変わらない元の tasks.json を渡す。
+        """
+        if self._manager is None:
+            update_schedule = load_script("update-schedule")
+            self._manager = update_schedule.ScheduleUpdateManager(
+                self.base_dir,
+                tasks_data=self.model.raw_data,
+                schedule_data=self.model.schedule
+            )
+            # 書き込んだファイルをまとめて報告できるよう共通のライターを使う
+            self._manager.output_writer = get_writer()
+
+    @property
+    def manager(self):
+        self.prepare_manager()
+        return self._manager
+
+
+# ----------------------------------------------------------------------
+# ステージ
+# ----------------------------------------------------------------------
+
+def stage_progress(context: ReportContext):
+    calculate_progress = load_script("calculate-progress")
+    progress = calculate_progress.calculate_all_progress(context.model.data, context.model.calendar)
+    calculate_progress.update_readme(
+        progress["overall"],
+        progress["groups"]["phase"],
+        progress["groups"]["midCategory"],
+        context.model.project.get("name", "Unknown Project")
+    )
+
+
+def stage_daily(context: ReportContext):
+    daily_report = load_script("daily-report")
+    args = context.args
+    if not args.no_snapshot:
+        daily_report.record_snapshot(context.model.data, args.history_dir)
+
+    report = daily_report.generate_report(context.model.data)
+    if args.github:
+        daily_report.post_to_github_issue(report, args.issue_number)
+    elif get_writer().write(args.daily_output, report):
+        print(f"✅ レポートを {args.daily_output} に出力しました")
+
+
+def stage_mindmap(context: ReportContext):
+    generate_mindmap = load_script("generate-mindmap")
+    content = generate_mindmap.generate_mindmap_content(context.model.data)
+    output_path = context.base_dir / "docs" / "MINDMAP.md"
+    if get_writer().write(output_path, content):
+        print(f"✅ マインドマップを生成しました: {output_path}")
+
+
+def stage_review(context: ReportContext):
+    generate_task_review = load_script("generate-task-review")
+    generate_task_review.generate_task_review(context.model.data, context.base_dir)
+
+
+def stage_plan(context: ReportContext):
+    context.manager.regenerate_plan_md()
+
+
+def stage_schedule(context: ReportContext):
+    context.manager.regenerate_schedule_md()
+
+
+# ステージ名 → (説明, 使うスクリプト, 処理)
+STAGES: Dict[str, Tuple[str, str, Callable[[ReportContext], None]]] = {
+    "progress": ("README.md 進捗セクション", "calculate-progress", stage_progress),
+    "daily": ("日次レポート", "daily-report", stage_daily),
+    "mindmap": ("docs/MINDMAP.md", "generate-mindmap", stage_mindmap),
+    "review": ("docs/TASK_REVIEW.md", "generate-task-review", stage_review),
+    "plan": ("PLAN.md", "update-schedule", stage_plan),
+    "schedule": ("SCHEDULE.md", "update-schedule", stage_schedule),
+}
+
+
+# ----------------------------------------------------------------------
+# パイプライン
+# ----------------------------------------------------------------------
+
+def run_stage(name: str, context: ReportContext) -> Tuple[str, float, Optional[str]]:
+    """ステージを実行して (名前, 所要時間, エラー) を返す"""
+    _, _, func = STAGES[name]
+    started = time.perf_counter()
+    try:
+        func(context)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        print(f"❌ {name}: {error}", file=sys.stderr)
+    return name, time.perf_counter() - started, error
+
+
+def run_pipeline(context: ReportContext, stage_names: List[str], jobs: int = 1) -> List[Tuple[str, float, Optional[str]]]:
+    """ステージを実行（jobs > 1 ならスレッドで並列）"""
+    # スクリプトの読み込みとマネージャーの作成はスレッドを分ける前に済ませておく
+    for name in stage_names:
+        load_script(STAGES[name][1])
+    if {"plan", "schedule"} & set(stage_names):
+        context.prepare_manager()
+
+    if jobs <= 1:
+        return [run_stage(name, context) for name in stage_names]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(lambda name: run_stage(name, context), stage_names))
+
+
+def print_timings(load_seconds: float, results: List[Tuple[str, float, Optional[str]]], total_seconds: float):
+    print("\n⏱️  ステージ別の所要時間")
+    print(f"  {'load':<10} {load_seconds * 1000:>8.1f} ms  tasks.json / schedule.json の読み込み")
+    for name, seconds, error in results:
+        status = f"❌ {error}" if error else STAGES[name][0]
+        print(f"  {name:<10} {seconds * 1000:>8.1f} ms  {status}")
+    print(f"  {'total':<10} {total_seconds * 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tasks.json を1度だけ読み込んで各レポートを生成")
+    parser.add_argument("--only", help=f"実行するステージ（カンマ区切り、既定: 全て）: {','.join(STAGES)}")
+    parser.add_argument("--skip", help="実行しないステージ（カンマ区切り）")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="並列に実行するスレッド数（デフォルト: 1）")
+    parser.add_argument("--base-dir", default=str(SCRIPTS_DIR.parent), help="プロジェクトのルートディレクトリ")
+    parser.add_argument("--daily-output", default="daily-report.md", help="日次レポートの出力先（デフォルト: daily-report.md）")
+    parser.add_argument("--github", action="store_true", help="日次レポートをGitHub Issueに投稿")
+    parser.add_argument("--issue-number", type=int, help="GitHub Issue番号")
+    parser.add_argument("--history-dir", default="progress-history", help="進捗スナップショットの保存先")
+    parser.add_argument("--no-snapshot", action="store_true", help="進捗スナップショットを記録しない")
+    args = parser.parse_args()
+
+    stage_names = args.only.split(",") if args.only else list(STAGES)
+    if args.skip:
+        skipped = set(args.skip.split(","))
+        stage_names = [name for name in stage_names if name not in skipped]
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        print(f"ERROR: 不明なステージ: {', '.join(unknown)}（指定可能: {', '.join(STAGES)}）")
+        sys.exit(1)
+    if args.github and not args.issue_number and "daily" in stage_names:
+        print("ERROR: --github を使用する場合は --issue-number を指定してください")
+        sys.exit(1)
+
+    # 各スクリプトはカレントディレクトリのファイルを読み書きする
+    base_dir = Path(args.base_dir).resolve()
+    os.chdir(base_dir)
+
+    started = time.perf_counter()
+    model = load_project(base_dir)
+    load_seconds = time.perf_counter() - started
+
+    context = ReportContext(base_dir, model, args)
+    results = run_pipeline(context, stage_names, jobs=args.jobs)
+    print_timings(load_seconds, results, time.perf_counter() - started)
+    print()
+    get_writer().print_summary()
+
+    if any(error for _, _, error in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
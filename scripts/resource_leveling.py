@@ -0,0 +1,224 @@
+"""
+リソース平準化スケジューラー
+
+担当者（assignee）ごとの稼働能力を超えないように、依存関係を守りながらタスクを並べ直します。
+優先度付きキューによるリストスケジューリング（並列スケジュール生成法）:
+
+    1. 依存タスクが全て終わったタスクを、担当者ごとの待ち行列（ヒープ）に入れる
+    2. 担当者に空きがあれば、待ち行列から最も優先するタスクを取り出して開始する
+    3. 完了イベント（ヒープ）を時刻順に処理し、後続タスクの解放と担当者への割り当てを繰り返す
+
+優先順位は priority（high → medium → low）、クリティカルパスの総余裕が小さい順、トポロジカル順。
+時刻はプロジェクトの稼働日カレンダーの番号で表すので、土日・祝日は飛ばされます。
+各タスク・各依存関係を1度ずつ処理し、ヒープ操作は O(log N) なので全体で O((V+E) log V) です。
+
+担当者の稼働能力（schedule.json の project.resources、省略時は1名 × プロジェクトの稼働率）:
+    "resources": {"BI Engineer": {"units": 1, "allocation": 0.5}}
+    units      … 同時に進められるタスク数（人数）
+    allocation … 1人あたりの稼働率。タスクの期間は 工数 ÷ allocation を切り上げた稼働日数
+
+担当者が未設定のタスクは稼働能力の制約を受けず、依存タスクが終わり次第開始します。
+status が done / completed / in_progress のタスクは日付を変えず、終了日まで担当者を占有します。
+
+使用例:
+    result = level_resources(TaskStore(schedule_data["tasks"]), schedule_data["project"])
+    result.starts["TASK-007"], result.ends["TASK-007"]
+    changed = apply_leveling(store, result)
+"""
+
+import heapq
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from critical_path import FIXED_STATUSES, compute_critical_path
+from schedule_graph import topological_order
+from task_store import TaskStore
+from work_calendar import WorkCalendar, allocation_from_project, calendar_from_project, task_duration
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+class Resource:
+    """担当者の稼働能力と、開始を待っているタスク"""
+
+    def __init__(self, units: int = 1, allocation: float = 1.0):
+        self.units = max(int(units), 1)
+        self.allocation = allocation
+        self.busy = 0
+        # (優先順位, タスクID) のヒープ
+        self.ready: List[Tuple[tuple, str]] = []
+
+
+class LevelingResult:
+    """平準化の結果"""
+
+    def __init__(self):
+        self.starts: Dict[str, str] = {}
+        self.ends: Dict[str, str] = {}
+        # 元の開始日からのずれ（稼働日、前倒しは負。元の日付が無いタスクは含まない）
+        self.delays: Dict[str, int] = {}
+        self.finish_date: Optional[str] = None
+
+
+def task_effort(task: Dict, hours_per_day: float) -> float:
+    """工数（人日）。effort が無ければ effortHours ÷ workingHoursPerDay"""
+    effort = task.get("effort")
+    if effort is None and hours_per_day:
+        effort = (task.get("effortHours") or 0) / hours_per_day
+    return float(effort or 0)
+
+
+def assignee_capacity(project: Dict, assignee: str) -> Tuple[int, float]:
+    """担当者の (units, allocation)。project.resources に無ければ1名 × プロジェクトの稼働率"""
+    default_allocation = allocation_from_project(project)
+    spec = (project.get("resources") or {}).get(assignee) or {}
+    return max(int(spec.get("units", 1)), 1), spec.get("allocation") or default_allocation
+
+
+def level_resources(
+    store: TaskStore,
+    project: Dict,
+    calendar: Optional[WorkCalendar] = None
+) -> LevelingResult:
+    """
+    担当者の稼働能力を守るタスクの開始日・終了日を求める（store のタスクは変更しない）
+
+    Args:
+        store: schedule.json のタスクストア
+        project: schedule.json の project（startDate, resources, holidays など）
+        calendar: 稼働日カレンダー（省略時は project から作る）
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+    """
+    calendar = calendar or calendar_from_project(project)
+    default_allocation = allocation_from_project(project)
+    hours_per_day = project.get("workingHoursPerDay") or 0
+    resources: Dict[str, Resource] = {}
+
+    def resource_of(task: Dict) -> Optional[Resource]:
+        name = task.get("assignee")
+        if not name:
+            return None
+        if name not in resources:
+            resources[name] = Resource(*assignee_capacity(project, name))
+        return resources[name]
+
+    order = topological_order(store)
+    position = {task_id: index for index, task_id in enumerate(order)}
+    durations = {}
+    for task_id in order:
+        task = store.get(task_id)
+        resource = resource_of(task)
+        allocation = resource.allocation if resource else default_allocation
+        durations[task_id] = task_duration(task_effort(task, hours_per_day), allocation)
+
+    # 総余裕は担当者の制約を考えない期間（稼働日）で計算する
+    slack = compute_critical_path(store, duration=lambda task: durations[task["id"]]).slack
+
+    def priority_key(task_id: str) -> tuple:
+        task = store.get(task_id)
+        return (PRIORITY_ORDER.get(task.get("priority"), PRIORITY_ORDER["medium"]), slack.get(task_id, 0.0), position[task_id])
+
+    project_start = project.get("startDate") or min(
+        (task["startDate"] for task in store if task.get("startDate")), default=date.today().isoformat()
+    )
+    start_rank = calendar.rank(project_start)
+
+    result = LevelingResult()
+    # (完了時刻, トポロジカル順, タスクID)。完了時刻は終了日より後の最初の稼働日の番号
+    events: List[Tuple[int, int, str]] = []
+    fixed = set()
+
+    def record(task_id: str, start: date, end: date):
+        task = store.get(task_id)
+        result.starts[task_id] = start.isoformat()
+        result.ends[task_id] = end.isoformat()
+        if task.get("startDate"):
+            result.delays[task_id] = calendar.working_day_shift(task["startDate"], start)
+        heapq.heappush(events, (calendar.rank(end.toordinal() + 1), position[task_id], task_id))
+
+    def place(task_id: str, now: int):
+        """時刻 now に開始する（担当者の休業日に当たれば次の稼働日から）"""
+        task_calendar = calendar.for_assignee(store.get(task_id).get("assignee"))
+        start = task_calendar.next_working_day(calendar.date_at(now))
+        record(task_id, start, task_calendar.add_working_days(start, durations[task_id] - 1))
+
+    # 日付を固定するタスクは終了日まで担当者を占有する
+    for task_id in order:
+        task = store.get(task_id)
+        if task.get("status") in FIXED_STATUSES and task.get("startDate") and task.get("endDate"):
+            fixed.add(task_id)
+            resource = resource_of(task)
+            if resource:
+                resource.busy += 1
+            record(task_id, date.fromisoformat(task["startDate"]), date.fromisoformat(task["endDate"]))
+
+    remaining = {
+        task_id: sum(1 for dep_id in set(store.dependencies(task_id)) if dep_id in store)
+        for task_id in order if task_id not in fixed
+    }
+
+    def release(task_id: str, now: int, touched: Dict[int, Resource]):
+        """依存タスクが全て終わったタスクを担当者の待ち行列に入れる"""
+        resource = resource_of(store.get(task_id))
+        if resource is None:
+            place(task_id, now)
+            return
+        heapq.heappush(resource.ready, (priority_key(task_id), task_id))
+        touched[id(resource)] = resource
+
+    def dispatch(resource: Resource, now: int):
+        """空いている担当者に優先順位の高いタスクから割り当てる"""
+        while resource.busy < resource.units and resource.ready:
+            _, task_id = heapq.heappop(resource.ready)
+            resource.busy += 1
+            place(task_id, now)
+
+    touched: Dict[int, Resource] = {}
+    for task_id, count in remaining.items():
+        if count == 0:
+            release(task_id, start_rank, touched)
+    for resource in touched.values():
+        dispatch(resource, start_rank)
+
+    while events:
+        # 同じ時刻に終わるタスクをまとめて処理してから割り当てる（優先順位を正しく比べるため）
+        now = max(events[0][0], start_rank)
+        touched = {}
+        while events and events[0][0] <= now:
+            _, _, task_id = heapq.heappop(events)
+            resource = resource_of(store.get(task_id))
+            if resource is not None:
+                resource.busy -= 1
+                touched[id(resource)] = resource
+            for dependent_id in store.dependents(task_id):
+                if dependent_id not in remaining:
+                    continue
+                remaining[dependent_id] -= 1
+                if remaining[dependent_id] == 0:
+                    release(dependent_id, now, touched)
+        for resource in touched.values():
+            dispatch(resource, now)
+
+    result.finish_date = max(result.ends.values(), default=None)
+    return result
+
+
+def apply_leveling(store: TaskStore, result: LevelingResult) -> List[str]:
+    """
+    平準化の結果をタスクに書き込む
+
+    Returns:
+        日付が変わったタスクID（トポロジカル順ではなく一覧の順）
+    """
+    changed = []
+    for task in store:
+        task_id = task["id"]
+        if task_id not in result.starts:
+            continue
+        if task.get("startDate") != result.starts[task_id] or task.get("endDate") != result.ends[task_id]:
+            task["startDate"] = result.starts[task_id]
+            task["endDate"] = result.ends[task_id]
+            changed.append(task_id)
+    return changed
@@ -0,0 +1,133 @@
+"""
+スケジュール依存グラフ
+
+タスクの dependencies から成る有向グラフ（依存タスク → 後続タスク）に対して、
+トポロジカル順序の計算と日付変更の伝播を行います。
+
+伝播は変更されたタスクから到達できる部分グラフを1度だけトポロジカル順に走査し、
+各後続タスクの新しい開始日を「先行タスクの新しい終了日 + 元のラグ」の最大値として
+求めます（O(V+E)）。ラグは変更前の 後続タスクの開始日 − 先行タスクの終了日 で、
+変更されていない先行タスクのラグも維持されます。このため複数の経路から到達する
+タスクも1回だけ、最も遅い先行タスクに合わせてずらされます。
+
+使用例:
+    store = TaskStore(schedule_data["tasks"])
+    shifts = propagate_shift(store, {"TASK-007": 3})   # TASK-007の終了日が3日後ろへ
+    # → {"TASK-009": 3, "TASK-012": 3, ...}
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from task_store import TaskStore
+
+
+class CycleError(ValueError):
+    """依存関係が循環している"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"依存関係が循環しています: {' → '.join(cycle)}")
+
+
+def _find_cycle(store: TaskStore, nodes: Set[str]) -> List[str]:
+    """Kahnの走査で残ったノードから循環経路を1つ取り出す"""
+    # 残ったノードは必ず残ったノードの中に先行タスクを持つので、
+    # 先行方向にたどり続ければいずれ同じノードに戻る
+    path: List[str] = []
+    position: Dict[str, int] = {}
+    current = min(nodes)
+    while current not in position:
+        position[current] = len(path)
+        path.append(current)
+        current = next(d for d in store.dependencies(current) if d in nodes)
+    cycle = path[position[current]:] + [current]
+    # 依存タスク → 後続タスクの向きで表示する
+    return cycle[::-1]
+
+
+def topological_order(store: TaskStore, task_ids: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    タスクをトポロジカル順（依存タスクが先）に並べる
+
+    Args:
+        store: タスクストア
+        task_ids: 対象のタスクID（省略時は全タスク）。対象外のタスクへの依存は無視する
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+    """
+    if task_ids is None:
+        nodes = [task["id"] for task in store]
+    else:
+        nodes = [task_id for task_id in task_ids if task_id in store]
+    node_set = set(nodes)
+
+    # 存在しないタスクへの依存（削除済みなど）は数えない
+    indegree = {
+        task_id: sum(1 for dep_id in set(store.dependencies(task_id)) if dep_id in node_set)
+        for task_id in nodes
+    }
+
+    queue = deque(task_id for task_id in nodes if indegree[task_id] == 0)
+    order: List[str] = []
+    while queue:
+        task_id = queue.popleft()
+        order.append(task_id)
+        for dependent_id in store.dependents(task_id):
+            if dependent_id in indegree:
+                indegree[dependent_id] -= 1
+                if indegree[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+    if len(order) < len(nodes):
+        remaining = node_set.difference(order)
+        raise CycleError(_find_cycle(store, remaining))
+
+    return order
+
+
+def descendants(store: TaskStore, roots: Iterable[str]) -> Set[str]:
+    """rootsから後続方向に到達できるタスクID（roots自身を含む）"""
+    seen: Set[str] = set()
+    stack = [root for root in roots if root in store]
+    while stack:
+        task_id = stack.pop()
+        if task_id in seen:
+            continue
+        seen.add(task_id)
+        stack.extend(d for d in store.dependents(task_id) if d not in seen)
+    return seen
+
+
+def propagate_shift(store: TaskStore, end_shifts: Dict[str, int]) -> Dict[str, int]:
+    """
+    終了日の変更を後続タスクに伝播し、各後続タスクをずらす日数を求める
+
+    Args:
+        store: タスクストア
+        end_shifts: 直接変更したタスクID → 終了日の変化量（日）。
+            これらのタスクの日付は変更済みとして扱い、伝播では動かさない
+
+    Returns:
+        後続タスクID → 開始日・終了日をずらす日数（トポロジカル順、0日のタスクは含まない）
+
+    Raises:
+        CycleError: 影響範囲に循環依存がある場合
+    """
+    affected = descendants(store, end_shifts)
+    shifts = {task_id: days for task_id, days in end_shifts.items() if task_id in store}
+    result: Dict[str, int] = {}
+
+    for task_id in topological_order(store, affected):
+        if task_id in end_shifts:
+            continue
+
+        # 影響を受けない先行タスクはラグを保ったまま0日として扱う
+        deltas = [shifts.get(dep_id, 0) for dep_id in store.dependencies(task_id) if dep_id in store]
+        delta = max(deltas, default=0)
+        shifts[task_id] = delta
+        if delta:
+            result[task_id] = delta
+
+    return result
@@ -0,0 +1,117 @@
+"""
+SCHEDULE.md レンダラー
+
+schedule.json の週次スケジュールとタスクから SCHEDULE.md をセクション単位で描画します。
+セクションのキー: header, week:<週名>, details, task:<タスクID>
+
+使用例:
+    renderer = ScheduleRenderer(tasks_data, schedule_data)
+    content = renderer.render()
+    renderer.render_section("week:Week 3")
+"""
+
+from typing import Dict, List
+
+PRIORITY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+
+
+class ScheduleRenderer:
+    """SCHEDULE.md をセクション単位で描画する"""
+
+    def __init__(self, tasks_data: Dict, schedule_data: Dict):
+        self.project_name = tasks_data.get("project", {}).get("name", "プロジェクト")
+        self.tasks = schedule_data.get("tasks", [])
+        self.weeks = {week["week"]: week for week in schedule_data.get("weeklySchedule", [])}
+        self.by_id = {task["id"]: task for task in self.tasks}
+
+    def keys(self) -> List[str]:
+        """セクションのキー（表示順）"""
+        return (
+            ["header"]
+            + [f"week:{name}" for name in self.weeks]
+            + ["details"]
+            + [f"task:{task['id']}" for task in self.tasks]
+        )
+
+    def render_section(self, key: str) -> str:
+        """1セクションを描画"""
+        if key == "header":
+            return self._render_header()
+        if key == "details":
+            return "## 📋 全タスク詳細\n\n"
+        kind, _, name = key.partition(":")
+        if kind == "week":
+            return self._render_week(self.weeks[name])
+        if kind == "task":
+            return self._render_task(self.by_id[name])
+        raise KeyError(key)
+
+    def render(self) -> str:
+        """全セクションを描画（マーカーなし）"""
+        return "".join(self.render_section(key) for key in self.keys())
+
+    # ------------------------------------------------------------------
+    # セクション
+    # ------------------------------------------------------------------
+
+    def _render_header(self) -> str:
+        if self.tasks:
+            project_start = min(task["startDate"] for task in self.tasks)
+            project_end = max(task["endDate"] for task in self.tasks)
+        else:
+            project_start = "未定"
+            project_end = "未定"
+
+        return f"""# {self.project_name} - スケジュール
+
+## 📅 プロジェクト期間
+
+- **開始日**: {project_start}
+- **終了日**: {project_end}
+- **総タスク数**: {len(self.tasks)}個
+- **スケジュール期間**: {len(self.weeks)}週間
+
+## 📊 週次スケジュール
+
+"""
+
+    def _render_week(self, week_info: Dict) -> str:
+        tasks_in_week = week_info["tasks"]
+        lines = [
+            f"### {week_info['week']} ({week_info['dateRange']})\n\n",
+            f"- **累積進捗率**: {week_info['cumulativeProgress']}%\n",
+            f"- **タスク数**: {len(tasks_in_week)}個\n\n",
+        ]
+
+        if tasks_in_week:
+            lines.append("**タスク一覧**:\n\n")
+            for task_id in tasks_in_week:
+                task = self.by_id.get(task_id)
+                if task:
+                    priority_emoji = PRIORITY_EMOJI.get(task.get("priority", "medium"), "⚪")
+                    lines.append(f"- {priority_emoji} **{task_id}**: {task.get('title', '')}\n")
+                    lines.append(f"  - カテゴリ: {task.get('category', '')}, 工数: {task.get('effort', 0)}日\n")
+                    lines.append(f"  - 期間: {task['startDate']} 〜 {task['endDate']}\n")
+
+        lines.append("\n")
+        return "".join(lines)
+
+    def _render_task(self, task: Dict) -> str:
+        priority = task.get("priority", "medium")
+        dependencies = task.get("dependencies", [])
+
+        lines = [
+            f"### {PRIORITY_EMOJI.get(priority, '⚪')} {task['id']}: {task.get('title', '')}\n\n",
+            f"**概要**: {task.get('description', '')}\n\n",
+            f"- **Phase**: {task.get('phase', '')}\n",
+            f"- **カテゴリ**: {task.get('category', '')}\n",
+            f"- **優先度**: {priority}\n",
+            f"- **工数**: {task.get('effort', 0)}日\n",
+            f"- **重み**: {task.get('weight', 0)}%\n",
+            f"- **期間**: {task.get('startDate', '')} 〜 {task.get('endDate', '')}\n",
+        ]
+        if dependencies:
+            lines.append(f"- **依存タスク**: {', '.join(dependencies)}\n")
+
+        lines.append("\n")
+        return "".join(lines)
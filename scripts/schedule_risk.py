@@ -0,0 +1,481 @@
+"""
+スケジュールリスクのモンテカルロシミュレーション
+
+タスクの期間を工数のまわりの分布（PERT または三角分布）から、リスクの発生を発生確率から
+反復回数分まとめてサンプリングし、トポロジカル順に並べた依存グラフの前進計算で
+プロジェクトの完了日の分布を求めます。計算は NumPy の行列演算で行い、反復は
+chunk_size 回ずつのシャードに分けるので、反復回数が多くてもメモリ使用量は一定です。
+
+モデル:
+    - 期間（稼働日） = 工数 ÷ 稼働率。最頻値を工数、最小値・最大値を工数 × optimistic / pessimistic
+      （タスクに optimisticEffort / pessimisticEffort があればその値）とする
+    - status が done / completed のタスクは期間を固定し、リスクの影響も受けない
+    - リスクは反復ごとに probability（high / medium / low または 0〜1 の数値）で発生し、
+      affectedWeeks の週（weeklySchedule）に載っているタスク、または affectedTasks のタスクの期間を
+      impact（high / medium / low または割合の数値）の割合だけ延ばす（複数のリスクは加算）
+    - 担当者の稼働能力が1名分（project.resources の units が1）の場合は、同じ担当者のタスクを
+      現在のスケジュールの順に1つずつ行うものとして、依存関係に順序を加える
+    - 各反復のプロジェクト期間は稼働日の端数を切り上げて数える
+
+並列実行:
+    シャードはプロセスプールで並列に計算できます（workers）。各シャードの乱数は
+    SeedSequence(seed).spawn() で作る独立した系列なので、seed と chunk_size が同じなら
+    ワーカー数に関係なく同じ結果になります。ワーカーは期間のサンプルを返さず、
+    完了までの稼働日のヒストグラムと件数だけを返し、親プロセスがシャードの順に合算します。
+    iter_simulation はシャードが終わるたびに途中の集計を返すので、パーセンタイルの収束を表示できます。
+
+結果:
+    - 完了日のパーセンタイル（P50 / P80 / P95 など）と、計画（最頻値・リスクなし）の完了日
+    - 予定終了日（project.estimatedEndDate）までに完了する確率
+    - タスクごとのクリティカル指数（クリティカルパスに乗った反復の割合）
+    - リスクごとの発生率
+
+使用例:
+    model = build_risk_model(schedule_data, calendar)
+    stats = simulate(model, iterations=100000, seed=42, workers=8)
+    summary = summarize(model, stats, percentiles=(50, 80, 95))
+    summary["percentiles"][80]        # "2026-04-08"
+    summary["criticality"]["TASK-007"]  # 0.93
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy はオプション（シミュレーションを実行するときだけ必要）
+    np = None
+
+from resource_leveling import assignee_capacity, task_effort
+from schedule_graph import topological_order
+from task_store import TaskStore
+from work_calendar import WorkCalendar, allocation_from_project, calendar_from_project
+
+DISTRIBUTIONS = ("pert", "triangular")
+
+# 工数に対する最小値・最大値の既定の倍率
+DEFAULT_OPTIMISTIC = 0.8
+DEFAULT_PESSIMISTIC = 1.5
+
+# リスクの発生確率・影響（期間を延ばす割合）のラベル
+RISK_PROBABILITY = {"high": 0.6, "medium": 0.3, "low": 0.1}
+RISK_IMPACT = {"high": 0.5, "medium": 0.25, "low": 0.1}
+
+DONE_STATUSES = {"done", "completed"}
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# ワーカープロセスで使うモデルと分布（プロセスの開始時に1度だけ受け取る）
+_WORKER_STATE: Dict = {}
+
+# 浮動小数点の誤差を吸収するための許容値（稼働日）
+EPSILON = 1e-7
+
+
+def require_numpy():
+    """NumPy が無い場合は ImportError"""
+    if np is None:
+        raise ImportError("シミュレーションには NumPy が必要です（pip install numpy）")
+
+
+def _risk_value(value, labels: Dict[str, float]) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return labels.get(str(value).lower(), 0.0)
+
+
+def _topological(ids: List[str], predecessors: Dict[str, List[str]]) -> Optional[List[str]]:
+    """Kahnの走査でトポロジカル順に並べる（循環があれば None）"""
+    indegree = {task_id: len(predecessors[task_id]) for task_id in ids}
+    successors: Dict[str, List[str]] = {task_id: [] for task_id in ids}
+    for task_id in ids:
+        for pred_id in predecessors[task_id]:
+            successors[pred_id].append(task_id)
+
+    queue = [task_id for task_id in ids if indegree[task_id] == 0]
+    order = []
+    while queue:
+        task_id = queue.pop()
+        order.append(task_id)
+        for successor_id in successors[task_id]:
+            indegree[successor_id] -= 1
+            if indegree[successor_id] == 0:
+                queue.append(successor_id)
+    return order if len(order) == len(ids) else None
+
+
+class RiskModel:
+    """シミュレーション用に配列へ変換したスケジュール（タスクはトポロジカル順）"""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        # 各タスクの先行タスクの位置（トポロジカル順のインデックス）
+        self.predecessors: List[List[int]] = []
+        self.low = None
+        self.mode = None
+        self.high = None
+        self.risk_ids: List[str] = []
+        self.risk_probability = None
+        # リスク × タスク の影響（期間を延ばす割合）
+        self.risk_impact = None
+        self.calendar: Optional[WorkCalendar] = None
+        self.start_date: Optional[str] = None
+        self.target_date: Optional[str] = None
+
+
+def build_risk_model(
+    schedule_data: Dict,
+    calendar: Optional[WorkCalendar] = None,
+    optimistic: float = DEFAULT_OPTIMISTIC,
+    pessimistic: float = DEFAULT_PESSIMISTIC,
+    resource_chains: bool = True
+) -> RiskModel:
+    """
+    schedule.json のデータからシミュレーション用のモデルを作る
+
+    Args:
+        schedule_data: schedule.json（tasks, project, risks, weeklySchedule）
+        calendar: 稼働日カレンダー（省略時は project から作る）
+        optimistic, pessimistic: 工数に対する最小値・最大値の倍率
+        resource_chains: 1名分の担当者のタスクを現在のスケジュールの順に直列にするか
+
+    Raises:
+        CycleError: 依存関係が循環している場合
+        ImportError: NumPy が無い場合
+    """
+    require_numpy()
+    if not 0 <= optimistic <= 1 <= pessimistic:
+        raise ValueError("optimistic は 0〜1、pessimistic は 1 以上で指定してください")
+
+    project = schedule_data.get("project", {})
+    store = TaskStore(schedule_data.get("tasks", []))
+    calendar = calendar or calendar_from_project(project)
+    hours_per_day = project.get("workingHoursPerDay") or 0
+    default_allocation = allocation_from_project(project)
+
+    topo = topological_order(store)
+    position = {task_id: index for index, task_id in enumerate(topo)}
+    predecessors = {
+        task_id: sorted({dep_id for dep_id in store.dependencies(task_id) if dep_id in store}, key=position.get)
+        for task_id in topo
+    }
+
+    order = topo
+    if resource_chains:
+        chains: Dict[str, List[str]] = {}
+        for task_id in topo:
+            assignee = store.get(task_id).get("assignee")
+            if assignee and assignee_capacity(project, assignee)[0] == 1:
+                chains.setdefault(assignee, []).append(task_id)
+
+        def chained(key) -> Dict[str, List[str]]:
+            result = {task_id: list(preds) for task_id, preds in predecessors.items()}
+            for members in chains.values():
+                members = sorted(members, key=key)
+                for previous, current in zip(members, members[1:]):
+                    if previous not in result[current]:
+                        result[current].append(previous)
+            return result
+
+        # 現在のスケジュールの順（依存関係と矛盾して循環する場合はトポロジカル順）
+        with_chains = chained(lambda task_id: (store.get(task_id).get("startDate") or "9999-12-31", position[task_id]))
+        order = _topological(topo, with_chains)
+        if order is None:
+            with_chains = chained(position.get)
+            order = _topological(topo, with_chains)
+        predecessors = with_chains
+
+    index = {task_id: i for i, task_id in enumerate(order)}
+    model = RiskModel()
+    model.ids = list(order)
+    model.predecessors = [sorted(index[pred_id] for pred_id in predecessors[task_id]) for task_id in order]
+
+    low, mode, high, fixed = [], [], [], []
+    for task_id in order:
+        task = store.get(task_id)
+        assignee = task.get("assignee")
+        allocation = assignee_capacity(project, assignee)[1] if assignee else default_allocation
+        effort = task_effort(task, hours_per_day)
+        done = task.get("status") in DONE_STATUSES
+        task_low = effort if done else task.get("optimisticEffort", effort * optimistic)
+        task_high = effort if done else task.get("pessimisticEffort", effort * pessimistic)
+        low.append(min(task_low, effort) / allocation)
+        mode.append(effort / allocation)
+        high.append(max(task_high, effort) / allocation)
+        fixed.append(done)
+    model.low = np.array(low, dtype=float)
+    model.mode = np.array(mode, dtype=float)
+    model.high = np.array(high, dtype=float)
+
+    # リスクの影響を受けるタスク（affectedWeeks の週に載っているタスク、または affectedTasks）
+    week_tasks = {week["week"]: week.get("tasks", []) for week in schedule_data.get("weeklySchedule", [])}
+    risks = schedule_data.get("risks", [])
+    model.risk_ids = [risk.get("id", f"RISK-{i + 1:03d}") for i, risk in enumerate(risks)]
+    model.risk_probability = np.array(
+        [min(max(_risk_value(risk.get("probability"), RISK_PROBABILITY), 0.0), 1.0) for risk in risks],
+        dtype=float
+    )
+    model.risk_impact = np.zeros((len(risks), len(order)))
+    for k, risk in enumerate(risks):
+        impact = _risk_value(risk.get("impact"), RISK_IMPACT)
+        affected = set(risk.get("affectedTasks", []))
+        for week in risk.get("affectedWeeks", []):
+            affected.update(week_tasks.get(week, []))
+        for task_id in affected:
+            if task_id in index and not fixed[index[task_id]]:
+                model.risk_impact[k, index[task_id]] = impact
+
+    model.calendar = calendar
+    model.start_date = project.get("startDate") or min(
+        (task["startDate"] for task in store if task.get("startDate")), default=date.today().isoformat()
+    )
+    model.target_date = project.get("estimatedEndDate")
+    return model
+
+
+class SimulationStats:
+    """シミュレーションの集計（チャンクごとの集計を merge でまとめられる）"""
+
+    def __init__(self, task_count: int, risk_count: int):
+        self.iterations = 0
+        # プロジェクト期間（稼働日、端数切り上げ） → 反復回数
+        self.histogram = np.zeros(0, dtype=np.int64)
+        self.critical_counts = np.zeros(task_count, dtype=np.int64)
+        self.risk_counts = np.zeros(risk_count, dtype=np.int64)
+        self.duration_sum = 0.0
+
+    def add_histogram(self, histogram):
+        if len(histogram) > len(self.histogram):
+            histogram, self.histogram = self.histogram, histogram.astype(np.int64)
+        self.histogram[:len(histogram)] += histogram
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        self.iterations += other.iterations
+        self.add_histogram(other.histogram)
+        self.critical_counts += other.critical_counts
+        self.risk_counts += other.risk_counts
+        self.duration_sum += other.duration_sum
+        return self
+
+
+def _sample_durations(model: RiskModel, iterations: int, rng, distribution: str):
+    """タスク × 反復 の期間（稼働日）をサンプリング"""
+    shape = (len(model.ids), iterations)
+    low, mode, high = model.low[:, None], model.mode[:, None], model.high[:, None]
+    width = high - low
+    if distribution == "triangular":
+        # 逆関数法（幅0のタスクは最頻値）
+        u = rng.random(shape)
+        split = np.divide(mode - low, width, out=np.zeros_like(width), where=width > 0)
+        left = low + np.sqrt(u * width * (mode - low))
+        right = high - np.sqrt((1 - u) * width * (high - mode))
+        return np.where(u < split, left, right)
+
+    # PERT: 最小値 + 幅 × Beta(α, β)
+    safe_width = np.where(width > 0, width, 1.0)
+    alpha = np.where(width > 0, 1 + 4 * (mode - low) / safe_width, 1.0)
+    beta = np.where(width > 0, 1 + 4 * (high - mode) / safe_width, 1.0)
+    return low + width * rng.beta(np.broadcast_to(alpha, shape), np.broadcast_to(beta, shape))
+
+
+def forward_pass(model: RiskModel, durations):
+    """前進計算で各タスクの終了時点（プロジェクト開始からの稼働日）を求める（タスク × 反復）"""
+    finish = np.empty_like(durations)
+    for i, preds in enumerate(model.predecessors):
+        if not preds:
+            finish[i] = durations[i]
+        elif len(preds) == 1:
+            np.add(finish[preds[0]], durations[i], out=finish[i])
+        else:
+            np.add(finish[preds].max(axis=0), durations[i], out=finish[i])
+    return finish
+
+
+def simulate_chunk(model: RiskModel, iterations: int, rng, distribution: str = "pert") -> SimulationStats:
+    """iterations 回分を行列演算でまとめてシミュレーションする"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"無効な分布: {distribution}（{', '.join(DISTRIBUTIONS)} のいずれか）")
+    stats = SimulationStats(len(model.ids), len(model.risk_ids))
+    stats.iterations = iterations
+    if not model.ids or iterations <= 0:
+        return stats
+
+    durations = _sample_durations(model, iterations, rng, distribution)
+
+    # リスクの発生（反復 × リスク）と、発生したリスクによる期間の延び（タスク × 反復）
+    if len(model.risk_ids):
+        triggered = rng.random((iterations, len(model.risk_ids))) < model.risk_probability
+        stats.risk_counts += triggered.sum(axis=0)
+        durations *= 1 + model.risk_impact.T @ triggered.T.astype(float)
+
+    finish = forward_pass(model, durations)
+    project_finish = finish.max(axis=0)
+
+    # 後退計算: プロジェクトの完了に効いた（余裕の無い）先行タスクをたどる
+    critical = finish >= project_finish - EPSILON
+    for i in range(len(model.ids) - 1, -1, -1):
+        preds = model.predecessors[i]
+        if not preds:
+            continue
+        start = finish[i] - durations[i] - EPSILON
+        for pred in preds:
+            critical[pred] |= critical[i] & (finish[pred] >= start)
+    stats.critical_counts += critical.sum(axis=1)
+
+    days = np.ceil(project_finish - EPSILON).astype(np.int64)
+    stats.add_histogram(np.bincount(np.maximum(days, 0)))
+    stats.duration_sum += float(project_finish.sum())
+    return stats
+
+
+def _init_worker(model: RiskModel, distribution: str):
+    _WORKER_STATE["model"] = model
+    _WORKER_STATE["distribution"] = distribution
+
+
+def _run_shard(iterations: int, seed_sequence) -> SimulationStats:
+    """ワーカープロセスで1シャードを計算する"""
+    rng = np.random.default_rng(seed_sequence)
+    return simulate_chunk(_WORKER_STATE["model"], iterations, rng, _WORKER_STATE["distribution"])
+
+
+def iter_simulation(
+    model: RiskModel,
+    iterations: int = 10000,
+    seed: Optional[int] = None,
+    distribution: str = "pert",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = 1
+) -> Iterator[SimulationStats]:
+    """
+    iterations 回を chunk_size 回ずつのシャードに分けてシミュレーションし、
+    シャードが終わるたびにそれまでの累積の集計を返す（同じオブジェクトを更新して返す）
+
+    Args:
+        workers: ワーカープロセス数（None ならCPU数、1ならプロセスを使わない）
+    """
+    require_numpy()
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"無効な分布: {distribution}（{', '.join(DISTRIBUTIONS)} のいずれか）")
+    chunk_size = max(int(chunk_size), 1)
+    sizes = [min(chunk_size, iterations - offset) for offset in range(0, max(iterations, 0), chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    stats = SimulationStats(len(model.ids), len(model.risk_ids))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(sizes) <= 1:
+        for size, seed_sequence in zip(sizes, seeds):
+            yield stats.merge(simulate_chunk(model, size, np.random.default_rng(seed_sequence), distribution))
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(sizes)),
+        initializer=_init_worker,
+        initargs=(model, distribution)
+    )
+    try:
+        # map はシャードの順に結果を返すので、合算の順序（浮動小数点の和）も毎回同じになる
+        for shard in executor.map(_run_shard, sizes, seeds):
+            yield stats.merge(shard)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def simulate(
+    model: RiskModel,
+    iterations: int = 10000,
+    seed: Optional[int] = None,
+    distribution: str = "pert",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = 1
+) -> SimulationStats:
+    """iterations 回のシミュレーションを chunk_size 回ずつのシャードで行って集計する"""
+    stats = None
+    for stats in iter_simulation(model, iterations, seed, distribution, chunk_size, workers):
+        pass
+    return stats or SimulationStats(len(model.ids), len(model.risk_ids))
+
+
+def percentile_days(histogram, iterations: int, percentile: float) -> int:
+    """ヒストグラムから percentile（%）に当たるプロジェクト期間（稼働日）を求める"""
+    cumulative = np.cumsum(histogram)
+    return int(np.searchsorted(cumulative, iterations * percentile / 100.0, side="left"))
+
+
+def finish_date(model: RiskModel, days: int) -> str:
+    """プロジェクト開始から days 稼働日目の日付"""
+    start = model.calendar.rank(model.start_date)
+    return model.calendar.date_at(start + max(days, 1) - 1).isoformat()
+
+
+def snapshot(model: RiskModel, stats: SimulationStats, percentiles: Sequence[float] = (50, 80, 95)) -> Dict:
+    """
+    途中の集計からパーセンタイルと予定終了日までに完了する確率だけを求める（収束の表示用）
+
+    Returns:
+        {iterations, percentiles: {P: 日付}, percentile_days: {P: 稼働日}, on_time_probability}
+    """
+    result = {
+        "iterations": stats.iterations,
+        "percentiles": {},
+        "percentile_days": {},
+        "on_time_probability": None,
+    }
+    for percentile in percentiles:
+        days = percentile_days(stats.histogram, stats.iterations, percentile)
+        result["percentile_days"][percentile] = days
+        result["percentiles"][percentile] = finish_date(model, days)
+
+    if model.target_date:
+        target_days = model.calendar.working_days_between(model.start_date, model.target_date)
+        result["on_time_probability"] = int(stats.histogram[:target_days + 1].sum()) / max(stats.iterations, 1)
+    return result
+
+
+def summarize(model: RiskModel, stats: SimulationStats, percentiles: Sequence[float] = (50, 80, 95)) -> Dict:
+    """
+    集計結果を日付と割合にまとめる
+
+    Returns:
+        {iterations, start_date, planned_finish, target_date, on_time_probability, mean_days,
+         percentiles: {P: 日付}, percentile_days: {P: 稼働日}, criticality: {タスクID: 割合},
+         risk_rates: {リスクID: 発生率}}
+    """
+    planned = forward_pass(model, model.mode[:, None]).max(axis=0) if model.ids else np.zeros(1)
+    planned_days = int(math.ceil(float(planned[0]) - EPSILON))
+    iterations = max(stats.iterations, 1)
+    current = snapshot(model, stats, percentiles)
+
+    return {
+        "iterations": stats.iterations,
+        "start_date": model.start_date,
+        "planned_finish": finish_date(model, planned_days),
+        "planned_days": planned_days,
+        "target_date": model.target_date,
+        "on_time_probability": current["on_time_probability"],
+        "mean_days": stats.duration_sum / iterations,
+        "percentiles": current["percentiles"],
+        "percentile_days": current["percentile_days"],
+        "criticality": {task_id: int(count) / iterations for task_id, count in zip(model.ids, stats.critical_counts)},
+        "risk_rates": {risk_id: int(count) / iterations for risk_id, count in zip(model.risk_ids, stats.risk_counts)},
+    }
+
+
+def parse_percentiles(text: str) -> List[float]:
+    """"50,80,95" → [50.0, 80.0, 95.0]"""
+    values = []
+    for part in text.split(","):
+        value = float(part)
+        if not 0 < value <= 100:
+            raise ValueError(f"パーセンタイルは 0〜100 で指定してください: {part}")
+        values.append(int(value) if value == int(value) else value)
+    return values
+
+
+def criticality_ranking(summary: Dict, top: Optional[int] = None) -> List[Tuple[str, float]]:
+    """クリティカル指数の高い順の (タスクID, 割合)"""
+    ranking = sorted(summary["criticality"].items(), key=lambda item: -item[1])
+    return ranking[:top] if top else ranking
@@ -0,0 +1,237 @@
+"""
+セクション単位で再生成できるMarkdownドキュメント
+
+PLAN.md / SCHEDULE.md の各部分（Phase・週・タスクなど）を HTMLコメントのマーカーで囲み、
+変更の影響を受けたセクションだけを描画し直して既存のファイルに差し込みます。
+
+    <!-- section:week:Week 3 -->
+    ### Week 3 (2026-01-20 〜 2026-01-24)
+    ...
+    <!-- /section:week:Week 3 -->
+
+マーカーはMarkdownの表示には現れません。ドキュメント全体はセクションの連結で、
+セクションの外に文字列は置きません（先頭の描画元データのダイジェストを除く）。
+
+差し込みは既存のファイルが変更前のデータから描画されている場合だけ正しいため、
+ドキュメントの先頭に描画元データのダイジェスト（<!-- source:... -->）を記録しておき、
+変更前のデータのダイジェストと一致しない場合（JSONを手で編集した場合など）は全体を描画します。
+
+SectionTracker はスケジュールの変更（タスクの項目変更・削除・週次スケジュールの再計算）を受け取り、
+どのドキュメントのどのセクションに影響するかを記録します。
+
+使用例:
+    tracker = SectionTracker()
+    tracker.task_changed(task, {"priority"}, weekly_schedule)
+    dirty = tracker.take("schedule")            # {"task:TASK-003", "week:Week 2"}
+    content, rendered = splice(existing, renderer.keys(), renderer.render_section, dirty,
+                               source=data_digest(new_data), base_source=data_digest(old_data))
+"""
+
+import hashlib
+import json
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_SECTION = re.compile(
+    r"<!-- section:(?P<key>[^\n]*?) -->\n(?P<body>.*?)<!-- /section:(?P=key) -->\n",
+    re.DOTALL
+)
+
+_SOURCE = re.compile(r"<!-- source:(?P<digest>[0-9a-f]+) -->\n")
+
+# Phase 全体など、前方一致でまとめて指定するときの接尾辞（例: "phase:*"）
+WILDCARD = "*"
+
+
+def wrap(key: str, body: str) -> str:
+    """セクションをマーカーで囲む"""
+    return f"<!-- section:{key} -->\n{body}<!-- /section:{key} -->\n"
+
+
+def data_digest(*sources) -> str:
+    """描画元データのダイジェスト"""
+    payload = json.dumps(sources, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _source_line(source: Optional[str]) -> str:
+    return f"<!-- source:{source} -->\n" if source else ""
+
+
+def split_source(text: str) -> Tuple[Optional[str], str]:
+    """ドキュメント先頭のダイジェストを取り出す → (ダイジェスト, 残りの本文)"""
+    match = _SOURCE.match(text)
+    if match is None:
+        return None, text
+    return match.group("digest"), text[match.end():]
+
+
+def render_document(keys: Iterable[str], render_section: Callable[[str], str],
+                    source: Optional[str] = None) -> str:
+    """全セクションを描画してドキュメントを作る"""
+    return _source_line(source) + "".join(wrap(key, render_section(key)) for key in keys)
+
+
+def parse_sections(text: str) -> Optional[Dict[str, str]]:
+    """
+    ドキュメントをセクションに分解（キー → 本文、出現順）
+
+    Returns:
+        ドキュメント全体がセクションの連結になっていない場合（マーカーの無い旧形式や
+        手で編集された場合）は None
+    """
+    sections: Dict[str, str] = {}
+    position = 0
+    for match in _SECTION.finditer(text):
+        if match.start() != position or match.group("key") in sections:
+            return None
+        sections[match.group("key")] = match.group("body")
+        position = match.end()
+    if position != len(text):
+        return None
+    return sections
+
+
+def expand_keys(dirty: Set[str], keys: List[str]) -> Set[str]:
+    """"phase:*" のような前方一致の指定を実際のキーに展開"""
+    prefixes = [key[:-len(WILDCARD)] for key in dirty if key.endswith(WILDCARD)]
+    if not prefixes:
+        return set(dirty)
+    expanded = {key for key in dirty if not key.endswith(WILDCARD)}
+    expanded.update(key for key in keys if any(key.startswith(prefix) for prefix in prefixes))
+    return expanded
+
+
+def splice(
+    existing: Optional[str],
+    keys: List[str],
+    render_section: Callable[[str], str],
+    dirty: Optional[Set[str]],
+    source: Optional[str] = None,
+    base_source: Optional[str] = None
+) -> Tuple[str, int]:
+    """
+    影響を受けたセクションだけを描画し直したドキュメントを作る
+
+    既存のドキュメントに無いセクション（追加されたタスク・週）も描画し、
+    keys に無いセクション（削除されたもの）は取り除く。
+
+    Args:
+        existing: 既存のドキュメント（無ければ None）
+        keys: 現在のデータから作られるセクションのキー（表示順）
+        render_section: キー → セクション本文
+        dirty: 描画し直すセクション。None なら全セクションを描画する
+        source: 今回の描画元データのダイジェスト（ドキュメントの先頭に記録する）
+        base_source: 変更前のデータのダイジェスト。既存のドキュメントの記録と異なれば全体を描画する
+
+    Returns:
+        (ドキュメント, 描画したセクション数)
+    """
+    sections = None
+    if existing is not None and dirty is not None:
+        existing_source, body = split_source(existing)
+        if base_source is None or existing_source == base_source:
+            sections = parse_sections(body)
+    if sections is None:
+        return render_document(keys, render_section, source), len(keys)
+
+    dirty = expand_keys(dirty, keys)
+    parts = [_source_line(source)]
+    rendered = 0
+    for key in keys:
+        if key in dirty or key not in sections:
+            parts.append(wrap(key, render_section(key)))
+            rendered += 1
+        else:
+            parts.append(wrap(key, sections[key]))
+    return "".join(parts), rendered
+
+
+# ----------------------------------------------------------------------
+# 変更の影響範囲
+# ----------------------------------------------------------------------
+
+# PLAN.md に表示されるタスクの項目
+PLAN_DATE_FIELDS = {"startDate", "endDate"}
+PLAN_DETAIL_FIELDS = {"title", "effort", "effortHours", "weight", "assignee", "description", "dependencies", "category", "phase"}
+
+# 内容が毎回変わる（最終更新日など）ため常に描画し直すセクション
+ALWAYS_DIRTY = {
+    "plan": {"closing"},
+    "schedule": set(),
+}
+
+
+def _phase_key(task: Dict) -> str:
+    return f"phase:{task.get('phase', '') or 'その他'}"
+
+
+class SectionTracker:
+    """スケジュールの変更から PLAN.md / SCHEDULE.md の再描画が必要なセクションを記録"""
+
+    def __init__(self):
+        self._dirty: Dict[str, Set[str]] = {"plan": set(), "schedule": set()}
+        self._active = {"plan": False, "schedule": False}
+
+    def _mark(self, document: str, keys: Iterable[str]):
+        self._active[document] = True
+        self._dirty[document].update(keys)
+
+    @staticmethod
+    def _weeks_containing(task_id: str, weekly_schedule: List[Dict]) -> List[str]:
+        return [f"week:{week['week']}" for week in weekly_schedule if task_id in week.get("tasks", [])]
+
+    def task_changed(self, task: Dict, fields: Set[str], weekly_schedule: List[Dict]):
+        """タスクの項目（fields）が変わった"""
+        task_id = task["id"]
+
+        # SCHEDULE.md: タスク詳細と、タスクが載っている週の一覧
+        schedule_keys = {f"task:{task_id}"}
+        schedule_keys.update(self._weeks_containing(task_id, weekly_schedule))
+        if fields & PLAN_DATE_FIELDS:
+            schedule_keys.add("header")
+        self._mark("schedule", schedule_keys)
+
+        # PLAN.md: 優先度などPLAN.mdに出ない項目だけなら影響なし
+        plan_keys = set()
+        if fields & PLAN_DATE_FIELDS:
+            plan_keys.update({"overview", _phase_key(task), "summary", "milestones"})
+        if fields & PLAN_DETAIL_FIELDS:
+            plan_keys.update({"overview", _phase_key(task), "task-table", "dependency-map", "summary"})
+        if "phase" in fields:
+            # Phase の追加・消滅で他の Phase の番号も変わりうる
+            plan_keys.update({f"phase:{WILDCARD}", "milestones"})
+        self._mark("plan", plan_keys)
+
+    def task_deleted(self, task: Dict, weekly_schedule: List[Dict]):
+        """タスクが削除された（タスク自身のセクションは keys から消えるので自動で取り除かれる）"""
+        self._mark("schedule", {"header", *self._weeks_containing(task["id"], weekly_schedule)})
+        # Phase が空になると以降の Phase の番号が変わるため Phase は全て描画し直す
+        self._mark("plan", {"overview", f"phase:{WILDCARD}", "task-table", "dependency-map", "summary", "milestones"})
+
+    def weeks_changed(self, old_weeks: List[Dict], new_weeks: List[Dict]):
+        """週次スケジュールが再計算された"""
+        old_by_name = {week["week"]: week for week in old_weeks}
+        schedule_keys = {f"week:{week['week']}" for week in new_weeks if old_by_name.get(week["week"]) != week}
+        if len(old_weeks) != len(new_weeks):
+            schedule_keys.add("header")
+        self._mark("schedule", schedule_keys)
+
+        # PLAN.md は週の期間（週番号の対応）が変わったときだけ影響を受ける
+        old_ranges = [week.get("dateRange") for week in old_weeks]
+        new_ranges = [week.get("dateRange") for week in new_weeks]
+        self._mark("plan", {"overview", f"phase:{WILDCARD}", "summary", "milestones"} if old_ranges != new_ranges else set())
+
+    def take(self, document: str) -> Optional[Set[str]]:
+        """
+        ドキュメントの再描画が必要なセクションを取り出して記録をリセット
+
+        Returns:
+            何も記録されていない場合は None（変更内容が分からないので全体を描画する）
+        """
+        if not self._active[document]:
+            return None
+        dirty = self._dirty[document] | ALWAYS_DIRTY[document]
+        self._dirty[document] = set()
+        self._active[document] = False
+        return dirty
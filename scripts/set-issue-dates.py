@@ -15,67 +15,39 @@ import json
 import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from gh_client import get_client
+from project_index import ProjectIndex, load_project_index
 
 
 def run_gh_api(query: str) -> Dict:
     """GitHub GraphQL APIを実行"""
     try:
-        result = subprocess.run(
-            ["gh", "api", "graphql", "-f", f"query={query}"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json.loads(result.stdout)
+        return get_client().graphql(query)
     except subprocess.CalledProcessError as e:
         print(f"ERROR: GraphQL API error: {e.stderr}")
         raise
 
 
-def get_project_info(owner: str, project_number: int) -> Dict:
-    """プロジェクト情報を取得"""
-    query = f"""
-    {{
-      user(login: "{owner}") {{
-        projectV2(number: {project_number}) {{
-          id
-          title
-          fields(first: 20) {{
-            nodes {{
-              ... on ProjectV2Field {{
-                id
-                name
-              }}
-              ... on ProjectV2SingleSelectField {{
-                id
-                name
-              }}
-            }}
-          }}
-          items(first: 100) {{
-            nodes {{
-              id
-              content {{
-                ... on Issue {{
-                  number
-                  title
-                }}
-              }}
-            }}
-          }}
-        }}
-      }}
-    }}
+def get_project_index(owner: str, project_number: int, cache_file: Path,
+                      require_issues: Optional[List] = None) -> ProjectIndex:
     """
+    プロジェクト情報（全アイテム・フィールド）を取得
 
-    result = run_gh_api(query)
-
+    require_issues のIssueがキャッシュに無ければ（TTL内にプロジェクトへ追加された場合など）取得し直す。
+    """
     try:
-        return result["data"]["user"]["projectV2"]
-    except (KeyError, TypeError):
+        return load_project_index(
+            run_gh_api,
+            owner=owner,
+            number=project_number,
+            cache_file=cache_file,
+            require_issues=require_issues
+        )
+    except (KeyError, TypeError, ValueError) as e:
         print(f"ERROR: Project not found or invalid response")
-        print(f"Response: {json.dumps(result, indent=2)}")
+        print(f"Detail: {e}")
         sys.exit(1)
 
 
@@ -140,16 +112,17 @@ def main():
 
     # プロジェクト情報取得
     print("📋 プロジェクト情報を取得中...")
-    project_info = get_project_info(owner, project_number)
-    project_id = project_info["id"]
+    issue_numbers = [issue_mapping[task["id"]] for task in schedule_data["tasks"] if task["id"] in issue_mapping]
+    project_index = get_project_index(owner, project_number, base_dir / ".cache" / "project-index.json",
+                                      require_issues=issue_numbers)
+    project_id = project_index.project_id
     print(f"✓ Project ID: {project_id}")
-    print(f"✓ Project Title: {project_info['title']}\n")
+    print(f"✓ Project Title: {project_index.title}")
+    print(f"✓ Items: {len(project_index.items)}個\n")
 
     # フィールドIDを取得
-    fields = {field["name"]: field["id"] for field in project_info["fields"]["nodes"]}
-
-    start_date_field_id = fields.get("Start Date")
-    end_date_field_id = fields.get("End Date")
+    start_date_field_id = project_index.field_id("Start Date")
+    end_date_field_id = project_index.field_id("End Date")
 
     if not start_date_field_id or not end_date_field_id:
         print("ERROR: 'Start Date' または 'End Date' フィールドが見つかりません")
@@ -159,19 +132,12 @@ def main():
         print("  3. Field type: 'Date' を選択")
         print("  4. Field name: 'Start Date' を入力して作成")
         print("  5. 同様に 'End Date' も作成")
-        print(f"\n現在のフィールド: {list(fields.keys())}")
+        print(f"\n現在のフィールド: {list(project_index.fields.keys())}")
         sys.exit(1)
 
     print(f"✓ Start Date Field ID: {start_date_field_id}")
     print(f"✓ End Date Field ID: {end_date_field_id}\n")
 
-    # Issue番号 -> Project Item IDのマッピング作成
-    issue_to_item = {}
-    for item in project_info["items"]["nodes"]:
-        if item["content"]:
-            issue_number = str(item["content"]["number"])
-            issue_to_item[issue_number] = item["id"]
-
     print(f"📅 日付を設定中（{len(schedule_data['tasks'])}個）...\n")
 
     updated_count = 0
@@ -192,13 +158,12 @@ def main():
         issue_number = issue_mapping[task_id]
 
         # Project Item IDを取得
-        if issue_number not in issue_to_item:
+        item_id = project_index.item_id(issue_number)
+        if not item_id:
             print(f"  ⚠️  {task_id} (#{issue_number}): ProjectにIssueが追加されていません")
             error_count += 1
             continue
 
-        item_id = issue_to_item[issue_number]
-
         # Start Dateを設定
         try:
             update_item_field(project_id, item_id, start_date_field_id, start_date)
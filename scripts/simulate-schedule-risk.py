@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+スケジュールリスクシミュレーション - 完了日の確率分布を求める
+
+schedule.json のタスクの工数（見積の幅）とリスク（risks の発生確率・影響）から、
+モンテカルロシミュレーションでプロジェクト完了日の分布を求めます。
+
+使い方:
+    python3 scripts/simulate-schedule-risk.py
+
+    # 反復回数・乱数シード・分布を指定
+    python3 scripts/simulate-schedule-risk.py --iterations 100000 --seed 42 --distribution triangular
+
+    # 見積の幅（工数に対する倍率）とパーセンタイルを指定
+    python3 scripts/simulate-schedule-risk.py --optimistic 0.9 --pessimistic 2.0 --percentiles 50,90
+
+    # 4プロセスで並列に計算し、シャードごとにパーセンタイルの収束を表示
+    python3 scripts/simulate-schedule-risk.py --iterations 1000000 --seed 42 --workers 4 --progress
+
+    # 結果をJSONで保存（収束の経過 convergence も含む）
+    python3 scripts/simulate-schedule-risk.py --output risk-simulation.json
+
+出力:
+- 計画（工数どおり・リスクなし）の完了日と、P50 / P80 / P95 の完了日
+- 予定終了日（project.estimatedEndDate）までに完了する確率
+- タスクごとのクリティカル指数（クリティカルパスに乗った反復の割合）
+- リスクごとの発生率
+- --progress を付けると、シャード（--chunk-size 回）が終わるたびに途中のパーセンタイル
+
+反復はプロセスプールで並列に計算します（--workers、デフォルトはCPU数）。
+--seed と --chunk-size が同じなら、ワーカー数に関係なく同じ結果になります。
+
+計算は scripts/schedule_risk.py で行います（NumPy が必要）。
+"""
+
+import argparse
+import json
+import sys
+
+from schedule_risk import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PESSIMISTIC,
+    DISTRIBUTIONS,
+    build_risk_model,
+    criticality_ranking,
+    iter_simulation,
+    parse_percentiles,
+    snapshot,
+    summarize,
+)
+from task_model import load_project
+
+DISTRIBUTION_NAMES = {"pert": "PERT分布", "triangular": "三角分布"}
+
+
+def print_summary(summary, tasks_by_id, risks_by_id, distribution: str, top: int):
+    """シミュレーション結果を表示"""
+    print(f"\n🎲 スケジュールリスクシミュレーション（{DISTRIBUTION_NAMES[distribution]}、{summary['iterations']:,}回）")
+    print(f"開始日: {summary['start_date']}")
+    print(f"計画完了日: {summary['planned_finish']}（{summary['planned_days']}稼働日）")
+    if summary["on_time_probability"] is not None:
+        print(f"予定終了日 {summary['target_date']} までに完了する確率: {summary['on_time_probability'] * 100:.1f}%")
+
+    print("\n完了日の分布:")
+    for percentile, finish in summary["percentiles"].items():
+        print(f"  P{percentile}: {finish}（{summary['percentile_days'][percentile]}稼働日）")
+    print(f"  平均: {summary['mean_days']:.1f}稼働日")
+
+    print(f"\nクリティカル指数（上位{top}タスク）:")
+    for task_id, rate in criticality_ranking(summary, top):
+        print(f"  {task_id}: {rate * 100:5.1f}%  {tasks_by_id.get(task_id, {}).get('title', '')}")
+
+    if summary["risk_rates"]:
+        print("\nリスクの発生率:")
+        for risk_id, rate in summary["risk_rates"].items():
+            print(f"  {risk_id}: {rate * 100:5.1f}%  {risks_by_id.get(risk_id, {}).get('description', '')}")
+
+
+def print_progress(current):
+    """途中のパーセンタイルを1行で表示"""
+    columns = " / ".join(f"P{percentile} {finish}" for percentile, finish in current["percentiles"].items())
+    line = f"  {current['iterations']:>10,}回: {columns}"
+    if current["on_time_probability"] is not None:
+        line += f"  予定内 {current['on_time_probability'] * 100:.1f}%"
+    print(line, flush=True)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="モンテカルロシミュレーションでプロジェクト完了日の分布を求める")
+    parser.add_argument("--iterations", type=int, default=10000, help="反復回数（デフォルト: 10000）")
+    parser.add_argument("--seed", type=int, help="乱数シード（指定すると結果を再現できる）")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="pert",
+                        help="タスクの期間の分布（デフォルト: pert）")
+    parser.add_argument("--optimistic", type=float, default=DEFAULT_OPTIMISTIC,
+                        help=f"工数に対する最小値の倍率（デフォルト: {DEFAULT_OPTIMISTIC}）")
+    parser.add_argument("--pessimistic", type=float, default=DEFAULT_PESSIMISTIC,
+                        help=f"工数に対する最大値の倍率（デフォルト: {DEFAULT_PESSIMISTIC}）")
+    parser.add_argument("--percentiles", default="50,80,95", help="表示するパーセンタイル（デフォルト: 50,80,95）")
+    parser.add_argument("--top", type=int, default=10, help="クリティカル指数を表示するタスク数（デフォルト: 10）")
+    parser.add_argument("--no-resource-chains", action="store_true",
+                        help="同じ担当者のタスクを直列にせず、依存関係だけで計算する")
+    parser.add_argument("--workers", type=int, help="ワーカープロセス数（デフォルト: CPU数、1ならプロセスを使わない）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"1シャード（1ワーカーへの1回の依頼）の反復回数（デフォルト: {DEFAULT_CHUNK_SIZE}）")
+    parser.add_argument("--progress", action="store_true", help="シャードが終わるたびに途中のパーセンタイルを表示")
+    parser.add_argument("--output", metavar="PATH", help="結果をJSONで保存")
+    args = parser.parse_args()
+
+    try:
+        percentiles = parse_percentiles(args.percentiles)
+        model = load_project()
+        if not model.schedule.get("tasks"):
+            raise ValueError("schedule.json にタスクがありません")
+        risk_model = build_risk_model(
+            model.schedule,
+            model.calendar,
+            optimistic=args.optimistic,
+            pessimistic=args.pessimistic,
+            resource_chains=not args.no_resource_chains
+        )
+    except (OSError, ValueError, ImportError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.progress:
+        print("\n⏳ パーセンタイルの収束:")
+    stats = None
+    convergence = []
+    for stats in iter_simulation(
+        risk_model,
+        iterations=args.iterations,
+        seed=args.seed,
+        distribution=args.distribution,
+        chunk_size=args.chunk_size,
+        workers=args.workers
+    ):
+        current = snapshot(risk_model, stats, percentiles)
+        convergence.append(current)
+        if args.progress:
+            print_progress(current)
+    if stats is None:
+        print("❌ 反復回数は1以上を指定してください")
+        sys.exit(1)
+    summary = summarize(risk_model, stats, percentiles)
+
+    tasks_by_id = {task["id"]: task for task in model.schedule.get("tasks", [])}
+    risks_by_id = {risk.get("id"): risk for risk in model.schedule.get("risks", [])}
+    print_summary(summary, tasks_by_id, risks_by_id, args.distribution, args.top)
+
+    if args.output:
+        result = {
+            **summary,
+            "distribution": args.distribution,
+            "seed": args.seed,
+            "chunk_size": args.chunk_size,
+            "convergence": convergence
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ {args.output} に結果を保存しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+進捗スナップショットストア
+
+実行ごとのタスク状態（status, actualHours, weight, effortHours）を追記専用の
+JSONLファイルに1行ずつ記録します。通常は前回から変わったタスクだけを差分として書き、
+CHECKPOINT_INTERVAL 件ごとに全タスクのチェックポイントを書きます。
+
+    progress-history/
+        snapshots.jsonl   1行1レコード（追記のみ）
+        index.json        チェックポイントの日付とファイル内のバイト位置、
+                          snapshots.jsonl のサイズとレコード数
+
+任意の日付の状態は、その日付以前の最後のチェックポイントへ index.json から直接シークし、
+そこから後の差分だけを適用して復元します（履歴全体を読み直さない）。
+index.json は読み込み時に snapshots.jsonl のサイズ・各チェックポイントの位置（行頭か）と照合し、
+合わない場合（git のマージや手作業で snapshots.jsonl だけが変わった場合など）は作り直します。
+
+使用例:
+    store = SnapshotStore(Path("progress-history"))
+    store.append(tasks, metrics={"ev": 12.0, "ac": 30.5})
+    state = store.state_at("2026-02-01")   # {TASK-ID: {"status": ..., ...}}
+    actuals = evm_actuals(store)           # compute_evm_series(actuals=...) 用
+"""
+
+import bisect
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from evm import TaskColumns
+
+# 記録するタスクの項目
+TRACKED_FIELDS = ("status", "actualHours", "weight", "effortHours")
+
+# 何件ごとに全タスクのチェックポイントを書くか
+CHECKPOINT_INTERVAL = 30
+
+INDEX_VERSION = 2
+
+
+def _task_state(task: Dict) -> Dict:
+    return {field: task[field] for field in TRACKED_FIELDS if field in task}
+
+
+def _apply(state: Dict[str, Dict], record: Dict):
+    """レコードを状態に適用（チェックポイントは置き換え、差分はマージ）"""
+    if record["type"] == "checkpoint":
+        state.clear()
+        state.update({task_id: dict(values) for task_id, values in record["tasks"].items()})
+        return
+    for task_id, values in record["tasks"].items():
+        if values is None:
+            state.pop(task_id, None)
+        else:
+            state[task_id] = dict(values)
+
+
+class SnapshotStore:
+    """追記専用のスナップショット履歴"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.data_file = self.directory / "snapshots.jsonl"
+        self.index_file = self.directory / "index.json"
+        self._index: Optional[Dict] = None
+
+    # ------------------------------------------------------------------
+    # インデックス
+    # ------------------------------------------------------------------
+
+    @property
+    def index(self) -> Dict:
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def _data_size(self) -> int:
+        return self.data_file.stat().st_size if self.data_file.exists() else 0
+
+    def _load_index(self) -> Dict:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION and self._index_matches(index):
+                    return index
+            except (OSError, json.JSONDecodeError, KeyError, TypeError):
+                pass
+        return self._rebuild_index()
+
+    def _index_matches(self, index: Dict) -> bool:
+        """インデックスが snapshots.jsonl と食い違っていないか（サイズと各チェックポイントの位置を確認）"""
+        size = self._data_size()
+        if index["size"] != size:
+            return False
+        checkpoints = index["checkpoints"]
+        if index["records"] < len(checkpoints) + index["sinceCheckpoint"] or (size == 0) != (index["records"] == 0):
+            return False
+        if not checkpoints:
+            return index["records"] == index["sinceCheckpoint"]
+
+        with open(self.data_file, "rb") as f:
+            for checkpoint in checkpoints:
+                offset = checkpoint["offset"]
+                if not 0 <= offset < size:
+                    return False
+                # 行頭（ファイル先頭か直前が改行）から始まるレコードを指しているか
+                f.seek(max(offset - 1, 0))
+                head = f.read(2 if offset else 1)
+                if (offset and head[:1] != b"\n") or head[-1:] != b"{":
+                    return False
+        return True
+
+    def _rebuild_index(self) -> Dict:
+        """snapshots.jsonl を1度走査してインデックスを作り直す"""
+        index = {"version": INDEX_VERSION, "checkpoints": [], "records": 0, "sinceCheckpoint": 0,
+                 "size": self._data_size()}
+        for offset, record in self._read_from(0):
+            index["records"] += 1
+            if record["type"] == "checkpoint":
+                index["checkpoints"].append({"date": record["date"], "offset": offset})
+                index["sinceCheckpoint"] = 0
+            else:
+                index["sinceCheckpoint"] += 1
+        return index
+
+    def _save_index(self):
+        tmp_file = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        tmp_file.replace(self.index_file)
+
+    # ------------------------------------------------------------------
+    # 読み込み
+    # ------------------------------------------------------------------
+
+    def _read_from(self, offset: int) -> Iterator[Tuple[int, Dict]]:
+        """指定バイト位置からレコードを順に読む（(位置, レコード) を返す）"""
+        if not self.data_file.exists():
+            return
+        with open(self.data_file, "rb") as f:
+            f.seek(offset)
+            while True:
+                position = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    yield position, json.loads(line)
+
+    def records(self) -> Iterator[Dict]:
+        """全レコードを記録順に返す"""
+        for _, record in self._read_from(0):
+            yield record
+
+    def iter_states(self) -> Iterator[Tuple[str, Dict[str, Dict], Dict]]:
+        """記録順に (日付, その時点の全タスク状態, 集計値) を返す（1回の走査）"""
+        state: Dict[str, Dict] = {}
+        for record in self.records():
+            _apply(state, record)
+            yield record["date"], state, record.get("metrics", {})
+
+    def state_at(self, target_date: str) -> Dict[str, Dict]:
+        """
+        指定日（YYYY-MM-DD）の終わり時点のタスク状態を復元
+
+        指定日以前の最後のチェックポイントから読み始め、指定日より後のレコードに達したら止める。
+        """
+        checkpoints = self.index["checkpoints"]
+        position = bisect.bisect_right([c["date"] for c in checkpoints], target_date) - 1
+        if position < 0:
+            return {}
+
+        state: Dict[str, Dict] = {}
+        for _, record in self._read_from(checkpoints[position]["offset"]):
+            if record["date"] > target_date:
+                break
+            _apply(state, record)
+        return state
+
+    def latest_state(self) -> Dict[str, Dict]:
+        """最新の状態（最後のチェックポイント以降だけを読む）"""
+        checkpoints = self.index["checkpoints"]
+        if not checkpoints:
+            return {}
+        state: Dict[str, Dict] = {}
+        for _, record in self._read_from(checkpoints[-1]["offset"]):
+            _apply(state, record)
+        return state
+
+    # ------------------------------------------------------------------
+    # 書き込み
+    # ------------------------------------------------------------------
+
+    def append(self, tasks: List[Dict], metrics: Optional[Dict] = None,
+               now: Optional[datetime] = None) -> Dict:
+        """
+        現在のタスク状態を記録
+
+        Returns:
+            書き込んだレコード（差分が無い場合も日付と集計値を残すため空の差分を書く）
+        """
+        now = now or datetime.now()
+        current = {task["id"]: _task_state(task) for task in tasks if "id" in task}
+
+        index = self.index
+        checkpoint = not index["checkpoints"] or index["sinceCheckpoint"] + 1 >= CHECKPOINT_INTERVAL
+        if checkpoint:
+            record_tasks = current
+        else:
+            previous = self.latest_state()
+            record_tasks = {
+                task_id: values for task_id, values in current.items()
+                if previous.get(task_id) != values
+            }
+            record_tasks.update({task_id: None for task_id in previous if task_id not in current})
+
+        record = {
+            "date": now.strftime("%Y-%m-%d"),
+            "at": now.isoformat(timespec="seconds"),
+            "type": "checkpoint" if checkpoint else "delta",
+            "tasks": record_tasks
+        }
+        if metrics:
+            record["metrics"] = metrics
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self.data_file, "ab") as f:
+            offset = f.tell()
+            f.write(line.encode("utf-8"))
+            size = f.tell()
+
+        if offset != index["size"]:
+            # インデックスを読み込んだ後に snapshots.jsonl が他で変更された
+            self._index = self._rebuild_index()
+        else:
+            index["records"] += 1
+            index["size"] = size
+            if checkpoint:
+                index["checkpoints"].append({"date": record["date"], "offset": offset})
+                index["sinceCheckpoint"] = 0
+            else:
+                index["sinceCheckpoint"] += 1
+        self._save_index()
+
+        return record
+
+
+def evm_actuals(store: SnapshotStore) -> Dict[str, Dict[str, float]]:
+    """
+    履歴から日付ごとのEV/ACを求める（compute_evm_series の actuals 形式）
+
+    同じ日に複数回記録されている場合はその日の最後の記録を使う。
+    """
+    actuals: Dict[str, Dict[str, float]] = {}
+    for day, state, _ in store.iter_states():
+        columns = TaskColumns(list(state.values()), group_by={})
+        actuals[day] = {"ev": sum(columns.ev), "ac": sum(columns.ac)}
+    return actuals
@@ -14,6 +14,7 @@ tasks.json と schedule.json のデータを GitHub Issues・Milestones・Projec
 環境変数（オプション）:
     GITHUB_REPO_NAME: リポジトリ名（指定しない場合は対話的に入力）
     GITHUB_REPO_VISIBILITY: public または private（デフォルト: private）
+    GITHUB_SYNC_CONCURRENCY: Issue作成の同時実行数（デフォルト: 4）
 """
 
 import json
@@ -21,16 +22,24 @@ import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gh_client import get_client
+from projects_v2 import ProjectItemBatch, issue_node_ids, resolve_project_id
+
+# Issue作成の同時実行数（書き込み間隔はAPIクライアントのレート制御が調整する）
+DEFAULT_CONCURRENCY = 4
 
 
 class GitHubSyncManager:
     """GitHub同期マネージャークラス"""
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, concurrency: int = DEFAULT_CONCURRENCY):
         self.base_dir = base_dir
+        self.concurrency = max(1, concurrency)
         self.tasks_file = base_dir / "tasks.json"
         self.schedule_file = base_dir / "schedule.json"
 
@@ -51,6 +60,9 @@ class GitHubSyncManager:
         self.project_id = None
         self.issue_numbers = {}  # TASK-ID -> Issue番号のマッピング
 
+        # GitHub APIクライアント（プロセス内で接続を再利用）
+        self.github = get_client()
+
         # ラベル定義
         self.labels = [
             # Phase ラベル
@@ -84,17 +96,13 @@ class GitHubSyncManager:
             sys.exit(1)
 
     def run_gh_command(self, command: List[str], capture_output: bool = True) -> str:
-        """GitHub CLIコマンドを実行"""
+        """GitHub CLIコマンドを実行（プロセス内APIクライアント経由）"""
         try:
-            result = subprocess.run(
-                ["gh"] + command,
-                capture_output=capture_output,
-                text=True,
-                check=True
-            )
-            if capture_output:
-                return result.stdout.strip()
-            return ""
+            if not capture_output:
+                # 出力をそのまま表示するコマンドはghを起動する
+                subprocess.run(["gh"] + command, text=True, check=True)
+                return ""
+            return self.github.run_gh_command(command)
         except FileNotFoundError:
             print("ERROR: GitHub CLI (gh) が見つかりません。")
             print("インストール手順: https://cli.github.com/")
@@ -105,6 +113,22 @@ class GitHubSyncManager:
                 print(f"詳細: {e.stderr}")
             raise
 
+    def _run_concurrently(self, items: List, func: Callable) -> List[Tuple[object, object, Optional[Exception]]]:
+        """
+        itemsの各要素にfuncを並列に適用
+
+        Returns:
+            入力順の (要素, 戻り値, 例外) のリスト
+        """
+        def call(item):
+            try:
+                return item, func(item), None
+            except subprocess.CalledProcessError as e:
+                return item, None, e
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(call, items))
+
     def check_gh_auth(self):
         """GitHub CLI認証状態を確認"""
         try:
@@ -206,58 +230,97 @@ class GitHubSyncManager:
         print("✅ マイルストーン作成完了")
 
     def create_issues(self):
-        """全タスクをIssueとして作成"""
-        print(f"\n📝 Issue作成中（{len(self.tasks)}個）...")
+        """
+        全タスクをIssueとして作成
+
+        Issueは並列に作成するため、依存タスクのIssue番号は作成時点では確定しない。
+        全Issueの作成後に、依存関係を持つIssueの本文をIssue番号付きリンクで更新する。
+        """
+        print(f"\n📝 Issue作成中（{len(self.tasks)}個、同時実行数: {self.concurrency}）...")
 
         # TASK-ID → タスク情報のマッピング
         task_map = {task["id"]: task for task in self.tasks}
 
-        for task in self.tasks:
+        results = self._run_concurrently(self.tasks, lambda task: self._create_issue(task, task_map))
+        for task, issue_number, error in results:
             task_id = task["id"]
-            title = f"[{task_id}] {task['title']}"
+            if error is not None:
+                print(f"  ✗ {task_id} - エラー: {error}")
+                continue
+            self.issue_numbers[task_id] = issue_number
+            print(f"  ✓ {task_id} → #{issue_number}")
 
-            # Issue本文を生成
-            body = self._generate_issue_body(task, task_map)
+        print("✅ Issue作成完了")
 
-            # ラベルを生成
-            labels = self._generate_issue_labels(task)
+        # 依存関係リンクを解決
+        self._link_issue_dependencies(task_map)
 
-            # マイルストーン名を取得（例: "Week 1"）
-            week_number = task.get("weekNumber", "")
-            if week_number and "Week" in week_number:
-                # "Week 2-3" のような場合は最初の週を使用
-                match = re.search(r"Week (\d+)", week_number)
-                if match:
-                    week_number = f"Week {match.group(1)}"
-                else:
-                    week_number = ""
+        # Issue番号マッピングを保存
+        self._save_issue_mapping()
 
-            # Issue作成
-            command = [
-                "issue", "create",
-                "--repo", self.repo_full_name,
-                "--title", title,
-                "--body", body,
-                "--label", ",".join(labels)
-            ]
+    def _create_issue(self, task: Dict, task_map: Dict) -> str:
+        """1タスク分のIssueを作成してIssue番号を返す"""
+        task_id = task["id"]
+        title = f"[{task_id}] {task['title']}"
 
-            # マイルストーンがある場合は追加
-            if week_number:
-                command.extend(["--milestone", week_number])
+        # Issue本文を生成
+        body = self._generate_issue_body(task, task_map)
 
-            try:
-                issue_url = self.run_gh_command(command)
-                # Issue番号を抽出
-                issue_number = issue_url.split("/")[-1]
-                self.issue_numbers[task_id] = issue_number
-                print(f"  ✓ {task_id} → #{issue_number}")
-            except subprocess.CalledProcessError as e:
-                print(f"  ✗ {task_id} - エラー: {e}")
+        # ラベルを生成
+        labels = self._generate_issue_labels(task)
 
-        print("✅ Issue作成完了")
+        # マイルストーン名を取得（例: "Week 1"）
+        week_number = task.get("weekNumber", "")
+        if week_number and "Week" in week_number:
+            # "Week 2-3" のような場合は最初の週を使用
+            match = re.search(r"Week (\d+)", week_number)
+            if match:
+                week_number = f"Week {match.group(1)}"
+            else:
+                week_number = ""
 
-        # Issue番号マッピングを保存
-        self._save_issue_mapping()
+        # Issue作成
+        command = [
+            "issue", "create",
+            "--repo", self.repo_full_name,
+            "--title", title,
+            "--body", body,
+            "--label", ",".join(labels)
+        ]
+
+        # マイルストーンがある場合は追加
+        if week_number:
+            command.extend(["--milestone", week_number])
+
+        issue_url = self.run_gh_command(command)
+        # Issue番号を抽出
+        return issue_url.split("/")[-1]
+
+    def _link_issue_dependencies(self, task_map: Dict):
+        """依存タスクのIssue番号が確定したIssueの本文を更新"""
+        targets = [
+            task for task in self.tasks
+            if task["id"] in self.issue_numbers
+            and any(dep_id in self.issue_numbers for dep_id in task.get("dependencies", []))
+        ]
+        if not targets:
+            return
+
+        print(f"\n🔗 依存関係リンク更新中（{len(targets)}個）...")
+
+        def update_body(task: Dict):
+            self.run_gh_command([
+                "issue", "edit", self.issue_numbers[task["id"]],
+                "--repo", self.repo_full_name,
+                "--body", self._generate_issue_body(task, task_map)
+            ])
+
+        results = self._run_concurrently(targets, update_body)
+        for task, _, error in results:
+            if error is not None:
+                print(f"  ✗ {task['id']} - エラー: {error}")
+
+        print("✅ 依存関係リンク更新完了")
 
     def _generate_issue_body(self, task: Dict, task_map: Dict) -> str:
         """Issue本文を生成"""
@@ -375,27 +438,39 @@ class GitHubSyncManager:
             sys.exit(1)
 
     def add_issues_to_project(self):
-        """全IssueをProjectsに追加"""
+        """
+        全IssueをProjectsに追加
+
+        addProjectV2ItemById をエイリアス付きのmutationにまとめて、APIクライアント経由で順に送信する
+        （gh project item-add を並列に起動すると書き込みがレート制御を通らないため）。
+        """
         if not self.project_id:
             print("⚠️  Project IDが設定されていません。スキップします。")
             return
 
-        print(f"\n🔗 IssuesをProjectsに追加中...")
+        print(f"\n🔗 IssuesをProjectsに追加中（{len(self.issue_numbers)}個）...")
 
-        for task_id, issue_number in self.issue_numbers.items():
-            issue_url = f"https://github.com/{self.repo_full_name}/issues/{issue_number}"
+        try:
+            project_node_id = resolve_project_id(self.github.graphql, self.repo_owner, int(self.project_id))
+            content_ids = issue_node_ids(
+                self.github.graphql, self.repo_owner, self.repo_name, self.issue_numbers.values()
+            )
+        except (subprocess.CalledProcessError, ValueError) as e:
+            print(f"ERROR: Projects追加の準備に失敗しました: {e}")
+            return
 
-            command = [
-                "project", "item-add", self.project_id,
-                "--owner", self.repo_owner,
-                "--url", issue_url
-            ]
+        batch = ProjectItemBatch(project_node_id, self.github.graphql)
+        for task_id, issue_number in self.issue_numbers.items():
+            if str(issue_number) in content_ids:
+                batch.add(content_ids[str(issue_number)], label=f"#{issue_number} ({task_id})")
+            else:
+                print(f"  ✗ #{issue_number} - エラー: Issueが見つかりません")
 
-            try:
-                self.run_gh_command(command)
-                print(f"  ✓ #{issue_number} ({task_id})")
-            except subprocess.CalledProcessError as e:
-                print(f"  ✗ #{issue_number} - エラー: {e}")
+        item_ids, errors = batch.flush()
+        for label in item_ids:
+            print(f"  ✓ {label}")
+        for error in errors:
+            print(f"  ✗ {error}")
 
         print("✅ Issue追加完了")
 
@@ -496,8 +571,15 @@ def main():
     # 可視性を取得
     visibility = os.environ.get("GITHUB_REPO_VISIBILITY", "private")
 
+    # 同時実行数を取得
+    try:
+        concurrency = int(os.environ.get("GITHUB_SYNC_CONCURRENCY", DEFAULT_CONCURRENCY))
+    except ValueError:
+        print("ERROR: GITHUB_SYNC_CONCURRENCY には整数を指定してください。")
+        sys.exit(1)
+
     # 同期マネージャーを初期化
-    manager = GitHubSyncManager(base_dir)
+    manager = GitHubSyncManager(base_dir, concurrency=concurrency)
 
     # 同期実行
     try:
@@ -0,0 +1,174 @@
+"""
+タスクモデル（tasks.json / schedule.json の共通ローダー）
+
+レポート系スクリプトが共通で使う読み込み処理です。tasks.json と schedule.json を読み、
+タスクの日付を正規化した結果を .cache/task-model.pickle にキャッシュします。
+キャッシュのキーは両ファイルの更新時刻（ns）とサイズなので、どちらかが変われば読み直します。
+同じプロセス内で繰り返し読み込んだ場合はメモリ上のキャッシュを使います。
+
+正規化の内容:
+    - タスクの開始日・終了日は startDate / endDate（YYYY-MM-DD）に統一
+      （start_date / end_date で書かれていればそちらを、無ければ schedule.json の日付を使う）
+    - 日付の書式は読み込み時に1度だけ検証する
+
+使用例:
+    model = load_project()
+    model.tasks          # 日付が正規化されたタスクのリスト
+    model.data           # tasks.json 全体（tasks は model.tasks と同じ）
+    model.raw_data       # 正規化する前の tasks.json（書き戻す・ダイジェストを取る場合はこちらを使う）
+    model.schedule       # schedule.json（無ければ空の dict）
+    model.calendar       # schedule.json の project から作った稼働日カレンダー
+"""
+
+import json
+import os
+import pickle
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from work_calendar import WorkCalendar, calendar_from_project
+
+CACHE_VERSION = 2
+CACHE_FILE = Path(".cache") / "task-model.pickle"
+
+# プロセス内キャッシュ: tasks.json の絶対パス → (キー, pickle済みのデータ, pickle済みの元の tasks.json)
+_memory_cache: Dict[str, Tuple[tuple, bytes, bytes]] = {}
+
+
+class ProjectModel:
+    """正規化済みのプロジェクトデータ"""
+
+    def __init__(self, data: Dict, schedule: Dict, raw_blob: Optional[bytes] = None):
+        self.data = data
+        self.schedule = schedule
+        self._raw_blob = raw_blob
+        self._calendar: Optional[WorkCalendar] = None
+
+    @property
+    def raw_data(self) -> Dict:
+        """
+        正規化する前の tasks.json（アクセスするたびに新しいコピーを返す）
+
+        data には schedule.json の日付が補われているため、tasks.json に書き戻すデータや
+        update-schedule.py と同じダイジェストを取るデータにはこちらを使う。
+        """
+        if self._raw_blob is None:
+            raise ValueError("元の tasks.json が読み込まれていません")
+        return pickle.loads(self._raw_blob)
+
+    @property
+    def tasks(self) -> List[Dict]:
+        return self.data.get("tasks", [])
+
+    @property
+    def project(self) -> Dict:
+        return self.data.get("project", {})
+
+    @property
+    def holidays(self) -> List[str]:
+        return self.schedule.get("project", {}).get("holidays", [])
+
+    @property
+    def calendar(self) -> WorkCalendar:
+        """稼働日カレンダー（初回アクセス時に作る）"""
+        if self._calendar is None:
+            self._calendar = calendar_from_project(self.schedule.get("project", {}))
+        return self._calendar
+
+
+def _normalize_date(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return date.fromisoformat(value).isoformat()
+
+
+def attach_schedule_dates(data: Dict, schedule: Dict):
+    """tasks.jsonのタスクの日付を startDate / endDate に正規化し、無ければschedule.jsonの日付を補う"""
+    schedule_tasks = {task["id"]: task for task in schedule.get("tasks", [])}
+    for task in data.get("tasks", []):
+        scheduled = schedule_tasks.get(task.get("id"), {})
+        for key, alias in (("startDate", "start_date"), ("endDate", "end_date")):
+            value = task.get(key) or task.pop(alias, None) or scheduled.get(key)
+            if value:
+                task[key] = _normalize_date(value)
+
+
+def _file_key(path: Path) -> tuple:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (None, None)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_json(path: Path) -> Dict:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_project(root: str = ".", use_cache: bool = True) -> ProjectModel:
+    """
+    root の tasks.json と schedule.json を読み込む
+
+    Args:
+        root: tasks.json のあるディレクトリ
+        use_cache: False ならキャッシュを使わず読み直す（キャッシュは更新する）
+
+    Raises:
+        FileNotFoundError: tasks.json が無い場合
+    """
+    root_path = Path(root)
+    tasks_file = root_path / "tasks.json"
+    schedule_file = root_path / "schedule.json"
+    cache_file = root_path / CACHE_FILE
+
+    key = (CACHE_VERSION, _file_key(tasks_file), _file_key(schedule_file))
+    if key[1] == (None, None):
+        raise FileNotFoundError(f"{tasks_file} が見つかりません")
+
+    memory_key = str(tasks_file.resolve())
+    blobs = None
+    if use_cache:
+        cached = _memory_cache.get(memory_key)
+        if cached and cached[0] == key:
+            blobs = cached[1:]
+        else:
+            blobs = _read_cache(cache_file, key)
+
+    if blobs is None:
+        data = _read_json(tasks_file)
+        schedule = _read_json(schedule_file)
+        raw_blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        attach_schedule_dates(data, schedule)
+        blobs = (pickle.dumps((data, schedule), protocol=pickle.HIGHEST_PROTOCOL), raw_blob)
+        _write_cache(cache_file, key, blobs)
+
+    _memory_cache[memory_key] = (key,) + tuple(blobs)
+    # 呼び出し側が変更しても他の呼び出しに影響しないよう毎回復元する
+    blob, raw_blob = blobs
+    data, schedule = pickle.loads(blob)
+    return ProjectModel(data, schedule, raw_blob)
+
+
+def _read_cache(cache_file: Path, key: tuple) -> Optional[Tuple[bytes, bytes]]:
+    try:
+        with open(cache_file, "rb") as f:
+            cached_key, blob, raw_blob = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
+    return (blob, raw_blob) if cached_key == key else None
+
+
+def _write_cache(cache_file: Path, key: tuple, blobs: Tuple[bytes, bytes]):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump((key,) + tuple(blobs), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # キャッシュが書けなくても読み込み自体は成功させる
+        pass
@@ -0,0 +1,115 @@
+"""
+タスクストア
+
+tasks.json / schedule.json の "tasks" リストに対して、読み込み時に1度だけ
+TASK-ID → タスク と 逆依存（タスク → そのタスクに依存しているタスク）の
+インデックスを構築し、追加・削除・依存関係の変更時にも整合性を保ちます。
+
+リストは元のJSONデータのものをそのまま保持して更新するため、
+ストア経由で変更した内容は json.dump でそのまま保存できます。
+
+使用例:
+    store = TaskStore(schedule_data.setdefault("tasks", []))
+    task = store.get("TASK-007")
+    for dependent_id in store.dependents("TASK-007"):
+        ...
+    store.remove("TASK-010")
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class TaskStore:
+    """IDと逆依存のインデックスを持つタスク一覧"""
+
+    def __init__(self, tasks: List[Dict]):
+        """
+        Args:
+            tasks: JSONデータ内のタスクリスト（このリストを直接更新する）
+        """
+        self.tasks = tasks
+        self._by_id: Dict[str, Dict] = {}
+        # タスクID → 依存しているタスクID（挿入順を保つためdictを順序付き集合として使う）
+        self._dependents: Dict[str, Dict[str, None]] = {}
+
+        for task in tasks:
+            self._by_id[task["id"]] = task
+        for task in tasks:
+            self._link(task)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._by_id
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.tasks)
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        """IDでタスクを取得"""
+        return self._by_id.get(task_id)
+
+    def dependencies(self, task_id: str) -> List[str]:
+        """タスクが依存しているタスクID"""
+        task = self._by_id.get(task_id)
+        return list(task.get("dependencies", [])) if task else []
+
+    def dependents(self, task_id: str) -> List[str]:
+        """タスクに依存しているタスクID（tasks内の登録順）"""
+        return list(self._dependents.get(task_id, {}))
+
+    def _link(self, task: Dict):
+        for dep_id in task.get("dependencies", []):
+            self._dependents.setdefault(dep_id, {})[task["id"]] = None
+
+    def _unlink(self, task: Dict):
+        for dep_id in task.get("dependencies", []):
+            dependents = self._dependents.get(dep_id)
+            if dependents is not None:
+                dependents.pop(task["id"], None)
+                if not dependents:
+                    del self._dependents[dep_id]
+
+    def add(self, task: Dict):
+        """タスクを追加"""
+        if task["id"] in self._by_id:
+            raise ValueError(f"{task['id']} は既に存在します")
+        self.tasks.append(task)
+        self._by_id[task["id"]] = task
+        self._link(task)
+
+    def set_dependencies(self, task_id: str, dependencies: List[str]):
+        """タスクの依存関係を置き換える"""
+        task = self._by_id.get(task_id)
+        if task is None:
+            raise ValueError(f"{task_id} が見つかりません")
+        self._unlink(task)
+        task["dependencies"] = list(dependencies)
+        self._link(task)
+
+    def remove(self, task_id: str) -> Tuple[Optional[Dict], List[str]]:
+        """
+        タスクを削除し、他タスクの依存関係からも取り除く
+
+        Returns:
+            (削除したタスク（存在しない場合はNone）, 依存関係から取り除いたタスクIDのリスト)
+        """
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return None, []
+
+        self._unlink(task)
+        for index, candidate in enumerate(self.tasks):
+            if candidate is task:
+                del self.tasks[index]
+                break
+
+        # 依存しているタスクだけを更新する（全タスクの走査はしない）
+        dependent_ids = list(self._dependents.pop(task_id, {}))
+        for dependent_id in dependent_ids:
+            dependencies = self._by_id[dependent_id].get("dependencies", [])
+            while task_id in dependencies:
+                dependencies.remove(task_id)
+
+        return task, dependent_ids
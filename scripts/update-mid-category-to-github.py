@@ -22,6 +22,8 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Set
 
+from gh_client import get_client
+
 
 # 中カテゴリのラベルカラー（16色）
 LABEL_COLORS = {
@@ -49,15 +51,10 @@ LABEL_COLORS = {
 
 
 def run_gh_command(args: List[str], check: bool = True) -> subprocess.CompletedProcess:
-    """GitHub CLIコマンドを実行"""
+    """GitHub CLIコマンドを実行（プロセス内APIクライアント経由）"""
     try:
-        result = subprocess.run(
-            ["gh"] + args,
-            capture_output=True,
-            text=True,
-            check=check
-        )
-        return result
+        output = get_client().run_gh_command(args)
+        return subprocess.CompletedProcess(["gh"] + args, 0, stdout=output, stderr="")
     except subprocess.CalledProcessError as e:
         if check:
             print(f"❌ エラー: GitHub CLIコマンドの実行に失敗しました")
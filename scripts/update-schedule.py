@@ -17,9 +17,30 @@
     # タスクの優先度を変更
     python3 scripts/update-schedule.py --task TASK-005 --priority high
 
+    # 担当者の稼働能力を超えないようにスケジュールを組み直す（リソース平準化）
+    python3 scripts/update-schedule.py --action level
+
     # インタラクティブモード
     python3 scripts/update-schedule.py --interactive
 
+    # 変更ファイル（JSON Lines / YAML）の変更をまとめて適用
+    python3 scripts/update-schedule.py --batch changes.jsonl
+
+    # 直前の変更を取り消す（番号を指定するとその変更を取り消す）
+    python3 scripts/update-schedule.py --undo
+    python3 scripts/update-schedule.py --undo 12
+
+    # 変更ジャーナルの履歴を表示
+    python3 scripts/update-schedule.py --journal
+
+日付の計算:
+    期限延長・依存タスクの移動は稼働日（土日・project.holidays・担当者ごとの休業日を除く）単位で行い、
+    開始日変更後の終了日は 工数 ÷ 稼働率（teamSize の「50%」など）を稼働日数として求めます。
+
+変更の記録:
+    変更したレコードの変更前後の値を .journal/changes.jsonl に記録します（ファイルを書き込む前に記録）。
+    エラー時は変更前の状態に戻し、--undo で記録済みの変更を新しい順に取り消せます。
+
 前提条件:
     - GitHub CLI (gh) がインストールされていること
     - gh auth login で認証済みであること
@@ -30,10 +51,28 @@ import argparse
 import json
 import subprocess
 import sys
-import shutil
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+from batch_changes import load_changes
+from change_journal import (
+    COMMITTED, JOURNAL_FILE, KEEP_ENTRIES, PENDING, ROLLED_BACK, ChangeJournal,
+    apply_changes, conflicts, diff, snapshot
+)
+from critical_path import apply_critical_path, compute_scheduled_critical_path
+from gh_client import get_client
+from output_writer import CACHE_FILE as OUTPUT_HASH_FILE, OutputWriter
+from plan_renderer import PlanRenderer
+from project_index import ProjectIndex, load_project_index
+from projects_v2 import ProjectFieldBatch
+from resource_leveling import apply_leveling, level_resources
+from schedule_graph import propagate_shift
+from schedule_renderer import ScheduleRenderer
+from sectioned_doc import SectionTracker, data_digest, splice
+from task_store import TaskStore
+from weekly_schedule import build_weekly_schedule
+from work_calendar import WorkCalendar, allocation_from_project, calendar_from_project
 
 # 定数
 REPO_FULL_NAME = "sh-usami-rg/dashboard-migration-project"
@@ -44,7 +83,7 @@ REPO_OWNER = "sh-usami-rg"
 class ScheduleUpdateManager:
     """スケジュール更新マネージャークラス"""
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, tasks_data: Optional[Dict] = None, schedule_data: Optional[Dict] = None):
         self.base_dir = base_dir
         self.tasks_file = base_dir / "tasks.json"
         self.schedule_file = base_dir / "schedule.json"
@@ -52,18 +91,46 @@ class ScheduleUpdateManager:
         self.plan_md_file = base_dir / "PLAN.md"
         self.mapping_file = base_dir / "github-issue-mapping.json"
 
-        # バックアップディレクトリ
-        self.backup_dir = base_dir / ".backups"
-        self.backup_dir.mkdir(exist_ok=True)
-
-        # データ読み込み
-        self.tasks_data = self._load_json(self.tasks_file)
-        self.schedule_data = self._load_json(self.schedule_file)
+        # データ読み込み（読み込み済みのデータを渡された場合はそれを使う）
+        self.tasks_data = tasks_data if tasks_data is not None else self._load_json(self.tasks_file)
+        self.schedule_data = schedule_data if schedule_data is not None else self._load_json(self.schedule_file)
         self.issue_mapping = self._load_json(self.mapping_file)
 
+        # タスクのインデックス（ID・逆依存）
+        self.tasks_store = TaskStore(self.tasks_data.setdefault("tasks", []))
+        self.schedule_store = TaskStore(self.schedule_data.setdefault("tasks", []))
+
+        # 稼働日カレンダーと稼働率（日付の計算に使う）
+        project = self.schedule_data.get("project", {})
+        self.calendar = calendar_from_project(project)
+        self.allocation = allocation_from_project(project)
+
         # 変更追跡
         self.changes = []
         self.errors = []
+        # 日付が変更されたタスクID（GitHub同期対象）
+        self.updated_task_ids: List[str] = []
+        # PLAN.md / SCHEDULE.md で描画し直すセクションと、各ファイルの描画元データのダイジェスト
+        self.sections = SectionTracker()
+        loaded_digest = data_digest(self.tasks_data, self.schedule_data)
+        self._rendered_digest = {"plan": loaded_digest, "schedule": loaded_digest}
+
+        # PLAN.md / SCHEDULE.md は内容が変わったときだけ書き込む
+        self.output_writer = OutputWriter(base_dir / OUTPUT_HASH_FILE)
+
+        # GitHub APIクライアント（プロセス内で接続を再利用）
+        self.github = get_client()
+
+        # Projects V2インデックス（初回アクセス時に取得）
+        self.project_cache_file = base_dir / ".cache" / "project-index.json"
+        self._project_index: Optional[ProjectIndex] = None
+        # APIから取得し直してもプロジェクトに無かったIssue番号（同じ実行の中では再取得しない）
+        self._issues_not_in_project: Set[str] = set()
+
+        # 変更ジャーナル（変更したレコードの変更前後の値を記録）
+        self.journal = ChangeJournal(base_dir / JOURNAL_FILE)
+        self._transaction: Optional[Dict] = None
+        self._recover_pending()
 
     def _load_json(self, filepath: Path) -> Dict:
         """JSONファイルを読み込む"""
@@ -78,51 +145,110 @@ class ScheduleUpdateManager:
             sys.exit(1)
 
     def _save_json(self, filepath: Path, data: Dict):
-        """JSONファイルを保存"""
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """JSONファイルを保存（一時ファイルに書いてから置き換える）"""
+        self.output_writer.write(filepath, json.dumps(data, indent=2, ensure_ascii=False))
 
-    def _backup_files(self):
-        """現在のファイルをバックアップ"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_subdir = self.backup_dir / timestamp
-        backup_subdir.mkdir(exist_ok=True)
+    def _sources(self) -> Dict[str, Dict]:
+        """変更ジャーナルで追跡するデータ"""
+        return {"tasks": self.tasks_data, "schedule": self.schedule_data, "mapping": self.issue_mapping}
 
-        files_to_backup = [
-            self.tasks_file,
-            self.schedule_file,
-            self.schedule_md_file,
-            self.plan_md_file,
-            self.mapping_file
-        ]
+    def _reload_stores(self):
+        """データを書き戻した後にタスクのインデックスを作り直す"""
+        self.tasks_store = TaskStore(self.tasks_data.setdefault("tasks", []))
+        self.schedule_store = TaskStore(self.schedule_data.setdefault("tasks", []))
 
-        for file in files_to_backup:
-            if file.exists():
-                shutil.copy2(file, backup_subdir / file.name)
-
-        print(f"✅ バックアップ作成: {backup_subdir}")
-        return backup_subdir
+    def _write_data_files(self):
+        self._save_json(self.tasks_file, self.tasks_data)
+        self._save_json(self.schedule_file, self.schedule_data)
+        self._save_json(self.mapping_file, self.issue_mapping)
 
-    def _restore_from_backup(self, backup_dir: Path):
-        """バックアップからファイルを復元"""
-        print(f"\n⚠️  エラーが発生したため、バックアップから復元します: {backup_dir}")
+    def _recover_pending(self):
+        """前回の処理がファイルの書き込み途中で止まっていた場合、変更前の状態に戻す"""
+        entry = self.journal.pending()
+        if entry is None:
+            return
 
-        for backup_file in backup_dir.iterdir():
-            original_file = self.base_dir / backup_file.name
-            shutil.copy2(backup_file, original_file)
+        print(f"⚠️  前回の変更（#{entry['op']}: {entry['label']}）が保存の途中で止まっています。変更前の状態に戻します")
+        apply_changes(self._sources(), entry["changes"], "before")
+        self._reload_stores()
+        self._write_data_files()
+        self.journal.mark(entry["op"], ROLLED_BACK)
+        print("  ✓ 巻き戻し完了（PLAN.md・SCHEDULE.md は次回の更新時に再生成されます）")
+
+    def begin_transaction(self):
+        """変更の開始時点を記録（エラー時の巻き戻しと変更ジャーナルの記録に使う）"""
+        self._transaction = {
+            "snapshot": snapshot(self._sources()),
+            "documents": {
+                path: path.read_bytes() if path.exists() else None
+                for path in (self.plan_md_file, self.schedule_md_file)
+            },
+            "changes_from": len(self.changes),
+            "op": None,
+            "undoes": None
+        }
+
+    def rollback(self):
+        """begin_transaction 以降の変更を取り消す（保存済みの場合はファイルも元に戻す）"""
+        transaction = self._transaction
+        if transaction is None:
+            return
+        self._transaction = None
+
+        print("\n⚠️  エラーが発生したため、変更前の状態に戻します")
+        sources = self._sources()
+        apply_changes(sources, diff(transaction["snapshot"], sources), "before")
+        self._reload_stores()
+
+        # ジャーナルに記録済み（ファイルを書き込み始めている）なら、ファイルも書き戻す
+        if transaction["op"] is not None:
+            self._write_data_files()
+            self.journal.mark(transaction["op"], ROLLED_BACK)
+
+        for path, content in transaction["documents"].items():
+            if content is not None:
+                self.output_writer.write(path, content.decode("utf-8"))
+            elif path.exists():
+                path.unlink()
+
+        print("✅ 変更前の状態に戻しました")
+
+    def undo(self, op: Optional[int] = None):
+        """変更ジャーナルに記録された変更を取り消す（省略時は取り消されていない最新の変更）"""
+        entry = self.journal.undo_candidate(op)
+        print(f"\n↩️  #{entry['op']} の変更を取り消します: {entry['label']}")
+
+        sources = self._sources()
+        conflicting = conflicts(sources, entry["changes"])
+        if conflicting:
+            raise ValueError(
+                f"#{entry['op']} の後に変更されたデータがあるため取り消せません: {', '.join(conflicting[:5])}"
+                + (f" ほか{len(conflicting) - 5}件" if len(conflicting) > 5 else "")
+            )
 
-        print("✅ バックアップから復元完了")
+        if self._transaction is None:
+            self.begin_transaction()
+        self._transaction["undoes"] = entry["op"]
+        apply_changes(sources, entry["changes"], "before")
+        self._reload_stores()
+
+        for change in entry["changes"]:
+            kind, _, key = change["key"].partition(":")
+            if change["source"] == "schedule" and kind == "task" and "before" in change:
+                after = change.get("after") or {}
+                if (after.get("startDate"), after.get("endDate")) != (change["before"].get("startDate"), change["before"].get("endDate")):
+                    if key not in self.updated_task_ids:
+                        self.updated_task_ids.append(key)
+            elif change["source"] == "mapping" and "before" in change and "after" not in change:
+                print(f"  ⚠️  {key} の Issue #{change['before']} はクローズされたままです（必要に応じて gh issue reopen で再オープンしてください）")
+
+        self.changes.append(f"#{entry['op']} を取り消し: {entry['label']}")
+        print(f"  ✓ {len(entry['changes'])}件のレコードを変更前の値に戻しました")
 
     def run_gh_command(self, command: List[str]) -> str:
-        """GitHub CLIコマンドを実行"""
+        """GitHub CLIコマンドを実行（プロセス内APIクライアント経由）"""
         try:
-            result = subprocess.run(
-                ["gh"] + command,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
+            return self.github.run_gh_command(command)
         except subprocess.CalledProcessError as e:
             error_msg = f"GitHub CLIコマンドエラー: {' '.join(command)}"
             if e.stderr:
@@ -133,13 +259,7 @@ class ScheduleUpdateManager:
     def run_gh_api(self, query: str) -> Dict:
         """GitHub GraphQL APIを実行"""
         try:
-            result = subprocess.run(
-                ["gh", "api", "graphql", "-f", f"query={query}"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return json.loads(result.stdout)
+            return self.github.graphql(query)
         except subprocess.CalledProcessError as e:
             error_msg = f"GraphQL API error: {e.stderr}"
             self.errors.append(error_msg)
@@ -147,34 +267,42 @@ class ScheduleUpdateManager:
 
     def find_task_in_schedule(self, task_id: str) -> Optional[Dict]:
         """schedule.json内のタスクを検索"""
-        for task in self.schedule_data.get("tasks", []):
-            if task["id"] == task_id:
-                return task
-        return None
+        return self.schedule_store.get(task_id)
 
     def find_task_in_tasks_json(self, task_id: str) -> Optional[Dict]:
         """tasks.json内のタスクを検索"""
-        for task in self.tasks_data.get("tasks", []):
-            if task["id"] == task_id:
-                return task
-        return None
+        return self.tasks_store.get(task_id)
+
+    def _calendar_for(self, task: Dict) -> WorkCalendar:
+        """タスクの担当者の休業日を含む稼働日カレンダー"""
+        return self.calendar.for_assignee(task.get("assignee"))
+
+    def _mark_updated(self, task_id: str):
+        """日付が変更されたタスクを同期対象として記録"""
+        if task_id not in self.updated_task_ids:
+            self.updated_task_ids.append(task_id)
+        self.sections.task_changed(
+            self.find_task_in_schedule(task_id),
+            {"startDate", "endDate"},
+            self.schedule_data.get("weeklySchedule", [])
+        )
 
     def extend_deadline(self, task_id: str, days: int):
-        """タスクの期限を延長"""
-        print(f"\n📅 {task_id}の期限を{days}日延長します...")
+        """タスクの期限を延長（days は稼働日数）"""
+        print(f"\n📅 {task_id}の期限を{days}稼働日延長します...")
 
         # schedule.jsonのタスクを更新
         schedule_task = self.find_task_in_schedule(task_id)
         if not schedule_task:
             raise ValueError(f"{task_id} が schedule.json に見つかりません")
 
-        # 終了日を延長
+        # 終了日を延長（土日・祝日を飛ばす）
         old_end_date = schedule_task["endDate"]
-        end_date = datetime.strptime(old_end_date, "%Y-%m-%d")
-        new_end_date = end_date + timedelta(days=days)
-        schedule_task["endDate"] = new_end_date.strftime("%Y-%m-%d")
+        new_end_date = self._calendar_for(schedule_task).add_working_days(old_end_date, days)
+        schedule_task["endDate"] = new_end_date.isoformat()
 
         self.changes.append(f"{task_id}: 終了日 {old_end_date} → {schedule_task['endDate']}")
+        self._mark_updated(task_id)
         print(f"  ✓ 終了日更新: {old_end_date} → {schedule_task['endDate']}")
 
         # 依存タスクも連鎖的に延長する必要があるかチェック
@@ -195,44 +323,53 @@ class ScheduleUpdateManager:
         except ValueError:
             raise ValueError(f"無効な日付形式: {new_start_date}（YYYY-MM-DD形式で指定してください）")
 
+        # 非稼働日を指定された場合は次の稼働日から開始する
+        calendar = self._calendar_for(schedule_task)
+        start_date = calendar.next_working_day(new_start_date).isoformat()
+        if start_date != new_start_date:
+            print(f"  ⚠️  {new_start_date} は非稼働日のため、{start_date} から開始します")
+            new_start_date = start_date
+
         old_start_date = schedule_task["startDate"]
+        old_end_date = schedule_task["endDate"]
         schedule_task["startDate"] = new_start_date
 
-        # 工数に基づいて終了日を再計算
-        effort_days = schedule_task.get("effort", 1)
-        start_date_obj = datetime.strptime(new_start_date, "%Y-%m-%d")
-        new_end_date_obj = start_date_obj + timedelta(days=effort_days - 1)
-        schedule_task["endDate"] = new_end_date_obj.strftime("%Y-%m-%d")
+        # 工数と稼働率から終了日を再計算（稼働日で数える）
+        new_end_date = calendar.end_date(new_start_date, schedule_task.get("effort", 1), self.allocation)
+        schedule_task["endDate"] = new_end_date.isoformat()
 
         self.changes.append(f"{task_id}: 開始日 {old_start_date} → {new_start_date}")
+        self._mark_updated(task_id)
         print(f"  ✓ 開始日更新: {old_start_date} → {new_start_date}")
         print(f"  ✓ 終了日再計算: {schedule_task['endDate']}")
 
+        # 終了日が動いた稼働日数だけ依存タスクも調整する
+        end_shift = calendar.working_day_shift(old_end_date, new_end_date)
+        if end_shift:
+            self._update_dependent_tasks(task_id, end_shift)
+
     def delete_task(self, task_id: str):
         """タスクを削除"""
         print(f"\n🗑️  {task_id}を削除します...")
 
-        # tasks.jsonから削除
-        tasks_list = self.tasks_data.get("tasks", [])
-        original_count = len(tasks_list)
-        self.tasks_data["tasks"] = [t for t in tasks_list if t["id"] != task_id]
-
-        if len(self.tasks_data["tasks"]) == original_count:
+        if task_id not in self.tasks_store:
             raise ValueError(f"{task_id} が tasks.json に見つかりません")
 
-        # schedule.jsonから削除
-        schedule_tasks = self.schedule_data.get("tasks", [])
-        self.schedule_data["tasks"] = [t for t in schedule_tasks if t["id"] != task_id]
+        # 削除前に、タスクが載っている週を記録しておく
+        weekly_schedule = self.schedule_data.get("weeklySchedule", [])
+        schedule_task = self.find_task_in_schedule(task_id)
+        if schedule_task:
+            self.sections.task_deleted(schedule_task, weekly_schedule)
 
-        # 依存関係から削除
-        for task in self.tasks_data.get("tasks", []):
-            if "dependencies" in task and task_id in task["dependencies"]:
-                task["dependencies"].remove(task_id)
-                print(f"  ✓ {task['id']}の依存関係から{task_id}を削除")
+        # tasks.json・schedule.jsonから削除（依存関係からも取り除く）
+        _, dependent_ids = self.tasks_store.remove(task_id)
+        if schedule_task:
+            _, schedule_dependent_ids = self.schedule_store.remove(task_id)
+            for dependent_id in schedule_dependent_ids:
+                self.sections.task_changed(self.find_task_in_schedule(dependent_id), {"dependencies"}, weekly_schedule)
 
-        for task in self.schedule_data.get("tasks", []):
-            if "dependencies" in task and task_id in task["dependencies"]:
-                task["dependencies"].remove(task_id)
+        for dependent_id in dependent_ids:
+            print(f"  ✓ {dependent_id}の依存関係から{task_id}を削除")
 
         self.changes.append(f"{task_id}: タスクを削除")
         print(f"  ✓ {task_id}を削除しました")
@@ -257,636 +394,158 @@ class ScheduleUpdateManager:
         schedule_task = self.find_task_in_schedule(task_id)
         if schedule_task:
             schedule_task["priority"] = new_priority
+            self.sections.task_changed(schedule_task, {"priority"}, self.schedule_data.get("weeklySchedule", []))
 
         self.changes.append(f"{task_id}: 優先度 {old_priority} → {new_priority}")
         print(f"  ✓ 優先度更新: {old_priority} → {new_priority}")
 
-    def _update_dependent_tasks(self, task_id: str, days: int):
-        """依存タスクを連鎖的に更新"""
-        # このタスクに依存しているタスクを探す
-        dependent_tasks = []
-        for task in self.schedule_data.get("tasks", []):
-            if "dependencies" in task and task_id in task["dependencies"]:
-                dependent_tasks.append(task)
-
-        if dependent_tasks:
-            print(f"\n  📌 依存タスクも自動で延長します:")
-            for dep_task in dependent_tasks:
-                dep_id = dep_task["id"]
-                old_start = dep_task["startDate"]
-                old_end = dep_task["endDate"]
-
-                # 開始日と終了日を延長
-                start_date = datetime.strptime(old_start, "%Y-%m-%d")
-                end_date = datetime.strptime(old_end, "%Y-%m-%d")
+    def apply_batch(self, changes: List[Dict]) -> List[str]:
+        """
+        一括変更をメモリ上で順に適用（再計算・保存・GitHub同期は呼び出し側で1回だけ行う）
 
-                new_start_date = start_date + timedelta(days=days)
-                new_end_date = end_date + timedelta(days=days)
+        Args:
+            changes: batch_changes.load_changes() の結果
 
-                dep_task["startDate"] = new_start_date.strftime("%Y-%m-%d")
-                dep_task["endDate"] = new_end_date.strftime("%Y-%m-%d")
+        Returns:
+            削除したタスクIDのリスト
+        """
+        print(f"\n📦 {len(changes)}件の変更を適用します...")
+        deleted = []
+        for change in changes:
+            op, task_id, value = change["op"], change["task"], change["value"]
+            try:
+                if op == "extend_deadline":
+                    self.extend_deadline(task_id, value)
+                elif op == "start_date":
+                    self.change_start_date(task_id, str(value))
+                elif op == "priority":
+                    self.change_priority(task_id, value)
+                elif op == "delete":
+                    self.delete_task(task_id)
+                    deleted.append(task_id)
+            except ValueError as e:
+                raise ValueError(f"{change['location']}: {e}") from e
+        return deleted
+
+    def level_schedule(self):
+        """担当者の稼働能力（project.resources）を超えないようにタスクの日付を組み直す"""
+        print("\n⚖️  リソース平準化中...")
+
+        result = level_resources(self.schedule_store, self.schedule_data.get("project", {}), self.calendar)
+        changed = apply_leveling(self.schedule_store, result)
+        for task_id in changed:
+            task = self.schedule_store.get(task_id)
+            delay = result.delays.get(task_id)
+            note = f"（{delay:+d}稼働日）" if delay else ""
+            self.changes.append(f"{task_id}: 平準化 {task['startDate']} 〜 {task['endDate']}{note}")
+            self._mark_updated(task_id)
+
+        print(f"  ✓ {len(changed)}タスクの日付を変更（完了予定: {result.finish_date or '未定'}）")
 
-                print(f"    ✓ {dep_id}: {old_start} 〜 {old_end} → {dep_task['startDate']} 〜 {dep_task['endDate']}")
-                self.changes.append(f"{dep_id}: 依存関係により自動延長 {old_start} → {dep_task['startDate']}")
+    def _update_dependent_tasks(self, task_id: str, days: int):
+        """
+        依存タスクを連鎖的に更新
 
-                # さらに依存しているタスクも再帰的に更新
-                self._update_dependent_tasks(dep_id, days)
+        影響範囲をトポロジカル順に1度だけ走査し、各タスクを先行タスクの
+        ずれの最大値（稼働日数）だけずらす（複数経路から到達するタスクも1回だけ更新）。
+        """
+        shifts = propagate_shift(self.schedule_store, {task_id: days})
+        if not shifts:
+            return
 
-    def recalculate_weekly_schedule(self):
-        """週次スケジュールを再計算"""
-        print("\n📊 週次スケジュールを再計算中...")
+        print(f"\n  📌 依存タスクも自動で調整します:")
+        for dep_id, delta in shifts.items():
+            dep_task = self.schedule_store.get(dep_id)
+            old_start = dep_task["startDate"]
+            old_end = dep_task["endDate"]
 
-        # 開始日を取得（プロジェクト情報から）
-        project_start = self.schedule_data.get("projectStartDate", "2026-01-06")
-        start_date = datetime.strptime(project_start, "%Y-%m-%d")
+            # 開始日と終了日を稼働日単位でずらす
+            calendar = self._calendar_for(dep_task)
+            dep_task["startDate"] = calendar.add_working_days(old_start, delta).isoformat()
+            dep_task["endDate"] = calendar.add_working_days(old_end, delta).isoformat()
 
-        # 週ごとのタスクを再集計
-        weekly_schedule = []
-        week_number = 1
-        cumulative_progress = 0
+            print(f"    ✓ {dep_id}: {old_start} 〜 {old_end} → {dep_task['startDate']} 〜 {dep_task['endDate']}")
+            self.changes.append(f"{dep_id}: 依存関係により自動調整 {old_start} → {dep_task['startDate']}")
+            self._mark_updated(dep_id)
 
-        while True:
-            week_start = start_date + timedelta(days=(week_number - 1) * 7)
-            week_end = week_start + timedelta(days=4)  # 月〜金（5日間）
+    def recalculate_critical_path(self):
+        """クリティカルパスと各タスクの余裕日数（稼働日）を、タスクの現在の日付から再計算"""
+        print("\n🧭 クリティカルパス再計算中...")
 
-            # この週のタスクを検索
-            week_tasks = []
-            week_progress = 0
+        old_path = self.schedule_data.get("criticalPath", [])
+        project_start = self.schedule_data.get("project", {}).get("startDate")
+        result = compute_scheduled_critical_path(self.schedule_store, self.calendar, project_start)
+        apply_critical_path(self.schedule_data, result)
 
-            for task in self.schedule_data.get("tasks", []):
-                task_start = datetime.strptime(task["startDate"], "%Y-%m-%d")
-                task_end = datetime.strptime(task["endDate"], "%Y-%m-%d")
+        if result.critical_path != old_path:
+            self.changes.append(f"クリティカルパス: {' → '.join(result.critical_path)}")
+        finish = max((task["endDate"] for task in self.schedule_store if task.get("endDate")), default="未定")
+        print(f"  ✓ クリティカルパス: {len(result.critical_path)}タスク（所要 {result.project_duration:g}稼働日、完了予定 {finish}）")
 
-                # タスクがこの週に含まれるかチェック
-                if task_start <= week_end and task_end >= week_start:
-                    week_tasks.append(task["id"])
-                    # 完全にこの週に完了するタスクのみ進捗に加算
-                    if task_end <= week_end:
-                        week_progress += task.get("weight", 0)
+    def recalculate_weekly_schedule(self):
+        """週次スケジュールを再計算"""
+        print("\n📊 週次スケジュールを再計算中...")
 
-            if not week_tasks:
-                # タスクがない週が続いたら終了
-                if week_number > 1 and not weekly_schedule[-1]["tasks"]:
-                    break
+        # 開始日・祝日を取得（プロジェクト情報から）
+        project = self.schedule_data.get("project", {})
+        project_start = project.get("startDate") or self.schedule_data.get("projectStartDate")
 
-            cumulative_progress += week_progress
+        weekly_schedule = build_weekly_schedule(
+            self.schedule_data.get("tasks", []),
+            project_start=project_start,
+            holidays=project.get("holidays", []),
+            calendar=self.calendar
+        )
 
-            weekly_schedule.append({
-                "week": f"Week {week_number}",
-                "dateRange": f"{week_start.strftime('%Y-%m-%d')} 〜 {week_end.strftime('%Y-%m-%d')}",
-                "tasks": week_tasks,
-                "cumulativeProgress": round(cumulative_progress, 1)
-            })
+        self.sections.weeks_changed(self.schedule_data.get("weeklySchedule", []), weekly_schedule)
+        self.schedule_data["weeklySchedule"] = weekly_schedule
+        print(f"  ✓ 週次スケジュール再計算完了（{len(weekly_schedule)}週）")
 
-            week_number += 1
+    def _regenerate_sections(self, path: Path, renderer, document: str) -> bool:
+        """
+        セクション単位でMarkdownを再生成
 
-            # 最大52週（1年）で停止
-            if week_number > 52:
-                break
+        このマネージャーで行った変更の影響を受けたセクションだけを描画し直し、
+        既存ファイルの残りのセクションはそのまま使う。変更が記録されていない場合や、
+        既存ファイルが変更前のデータから描画されたものでない場合（マーカーが無い・
+        ダイジェストが異なる）は全体を描画する。
 
-        self.schedule_data["weeklySchedule"] = weekly_schedule
-        print(f"  ✓ 週次スケジュール再計算完了（{len(weekly_schedule)}週）")
+        Returns:
+            ファイルを書き込んだ場合 True
+        """
+        dirty = self.sections.take(document)
+        existing = path.read_text(encoding="utf-8") if dirty is not None and path.exists() else None
+
+        keys = renderer.keys()
+        digest = data_digest(self.tasks_data, self.schedule_data)
+        content, rendered = splice(
+            existing, keys, renderer.render_section, dirty,
+            source=digest, base_source=self._rendered_digest[document]
+        )
+        self._rendered_digest[document] = digest
+        if rendered < len(keys):
+            print(f"  ✓ 変更のあった {rendered}/{len(keys)} セクションを再描画")
+        return self.output_writer.write(path, content)
 
     def regenerate_plan_md(self):
         """PLAN.mdを再生成"""
         print("\n📝 PLAN.mdを再生成中...")
 
-        # 基本情報
-        project_info = self.tasks_data.get("project", {})
-        project_name = project_info.get("name", "プロジェクト")
-
-        # 日付計算
-        tasks = self.schedule_data.get("tasks", [])
-        if tasks:
-            start_dates = [datetime.strptime(t["startDate"], "%Y-%m-%d") for t in tasks]
-            end_dates = [datetime.strptime(t["endDate"], "%Y-%m-%d") for t in tasks]
-            project_start = min(start_dates).strftime("%Y-%m-%d")
-            project_end = max(end_dates).strftime("%Y-%m-%d")
-
-            # 期間計算
-            start_dt = min(start_dates)
-            end_dt = max(end_dates)
-            total_days = (end_dt - start_dt).days + 1
-            total_weeks = len(self.schedule_data.get("weeklySchedule", []))
+        renderer = PlanRenderer(self.tasks_data, self.schedule_data)
+        if self._regenerate_sections(self.plan_md_file, renderer, "plan"):
+            print(f"  ✓ PLAN.md再生成完了")
         else:
-            project_start = "未定"
-            project_end = "未定"
-            total_days = 0
-            total_weeks = 0
-
-        # 総工数計算
-        total_effort = sum(task.get("effort", 0) for task in tasks)
-        total_hours = sum(task.get("effortHours", 0) for task in tasks)
-        total_weight = sum(task.get("weight", 0) for task in tasks)
-
-        # Phase別タスク分類
-        phase1_tasks = [t for t in tasks if "Phase 1" in t.get("phase", "")]
-        phase2_tasks = [t for t in tasks if "Phase 2" in t.get("phase", "")]
-        phase3_tasks = [t for t in tasks if "Phase 3" in t.get("phase", "")]
-
-        # Phase別工数
-        phase1_effort = sum(t.get("effort", 0) for t in phase1_tasks)
-        phase1_hours = sum(t.get("effortHours", 0) for t in phase1_tasks)
-        phase1_weight = sum(t.get("weight", 0) for t in phase1_tasks)
-
-        phase2_effort = sum(t.get("effort", 0) for t in phase2_tasks)
-        phase2_hours = sum(t.get("effortHours", 0) for t in phase2_tasks)
-        phase2_weight = sum(t.get("weight", 0) for t in phase2_tasks)
-
-        phase3_effort = sum(t.get("effort", 0) for t in phase3_tasks)
-        phase3_hours = sum(t.get("effortHours", 0) for t in phase3_tasks)
-        phase3_weight = sum(t.get("weight", 0) for t in phase3_tasks)
-
-        # PLAN.md生成
-        content = f"""# {project_name} 実行計画書
-
-## プロジェクト概要
-
-- **プロジェクト名**: {project_name}
-- **開始日**: {project_start}
-- **終了日**: {project_end}
-- **期間**: {total_weeks}週間（約{total_days}日間）
-- **稼働体制**: 1名兼任（50%稼働）
-- **総稼働日数**: 56日（土日祝を除く）
-- **総工数**: {total_effort}人日（{total_hours}時間）
-- **ステークホルダー**: バックオフィス部門、マネージャー層、IT部門
-
-## 目的・目標
-
-### ビジネス目標
-- スプレッドシート管理工数を80%削減
-- データ更新の自動化によるリアルタイム分析の実現
-- 横展開可能なBI基盤の確立
-- 意思決定の高速化
-
-### 技術目標
-- BigQueryを基盤としたLooker/Looker Studio環境の構築
-- LookerML（コードベース管理）の導入と標準化
-- 30個以上のスプレッドシート（48シート）からの完全移行
-- 既存BigQuery DWHテーブルの活用
-
-### 成功基準
-- [ ] スプレッドシート管理工数を80%削減
-- [ ] ダッシュボード更新の自動化率100%
-- [ ] マネージャー層の満足度80%以上
-- [ ] BigQueryクエリコストを月間予算（5-10万円）内に収める
-- [ ] データ整合性100%（スプレッドシートとの突合）
-- [ ] LookerML開発者を3名以上育成
-- [ ] 全成果物の期限内納品
-
-## プロジェクトスコープ
-
-### 含まれるもの（In Scope）
-- 既存BigQuery DWHテーブルの確認とマッピング
-- Looker/Looker Studioからの既存テーブル接続
-- 7つのダッシュボードの構築（高優先度3、中優先度3、低優先度1）
-- LookerMLによるコードベース管理の導入
-- データ整合性検証スクリプトの作成
-- ユーザートレーニングとドキュメント整備
-
-### 含まれないもの（Out of Scope）
-- BigQueryテーブル構造の変更・再設計
-- ETLパイプラインの構築・変更（既に存在するため）
-- 既存システムからBigQueryへのデータ連携の変更
-- 新規データソースの追加
-
-## WBS（作業分解構造）
-
-"""
-
-        # Phase 1 WBS
-        if phase1_tasks:
-            # Phase 1の期間を取得
-            phase1_start_dates = [datetime.strptime(t["startDate"], "%Y-%m-%d") for t in phase1_tasks]
-            phase1_end_dates = [datetime.strptime(t["endDate"], "%Y-%m-%d") for t in phase1_tasks]
-            phase1_start = min(phase1_start_dates).strftime("%-m/%-d")
-            phase1_end = max(phase1_end_dates).strftime("%-m/%-d")
-
-            content += f"### Phase 1: 基盤整備と設計 (Week 1-4: {phase1_start}-{phase1_end})\n\n"
-
-            # カテゴリ別にタスクを分類
-            phase1_by_category = {}
-            for task in phase1_tasks:
-                category = task.get("category", "その他")
-                if category not in phase1_by_category:
-                    phase1_by_category[category] = []
-                phase1_by_category[category].append(task)
-
-            # カテゴリごとに出力
-            category_titles = {
-                "design": "設計・調査",
-                "development": "開発",
-                "testing": "テスト",
-                "documentation": "ドキュメント"
-            }
-
-            section_counter = 1
-            for category, cat_tasks in phase1_by_category.items():
-                cat_title = category_titles.get(category, category.capitalize())
-                content += f"#### 1.{section_counter} {cat_title}\n"
-
-                for task in sorted(cat_tasks, key=lambda x: x["id"]):
-                    task_id = task["id"]
-                    title = task.get("title", "")
-                    effort = task.get("effort", 0)
-                    effort_hours = task.get("effortHours", 0)
-                    weight = task.get("weight", 0)
-                    assignee = task.get("assignee", "未定")
-                    description = task.get("description", "")
-                    dependencies = task.get("dependencies", [])
-
-                    dep_text = ", ".join(dependencies) if dependencies else "なし"
-
-                    content += f"- **{task_id}** {title}\n"
-                    content += f"  - 担当: {assignee}\n"
-                    content += f"  - 工数: {effort}日（{effort_hours}時間）\n"
-                    content += f"  - Weight: {weight}\n"
-                    content += f"  - 依存: {dep_text}\n"
-                    content += f"  - 説明: {description}\n\n"
-
-                section_counter += 1
-
-            content += f"**Phase 1 合計**: {phase1_effort}日（{phase1_hours}時間）、Weight {phase1_weight}\n\n"
-
-        # Phase 2 WBS
-        if phase2_tasks:
-            phase2_start_dates = [datetime.strptime(t["startDate"], "%Y-%m-%d") for t in phase2_tasks]
-            phase2_end_dates = [datetime.strptime(t["endDate"], "%Y-%m-%d") for t in phase2_tasks]
-            phase2_start = min(phase2_start_dates).strftime("%-m/%-d")
-            phase2_end = max(phase2_end_dates).strftime("%-m/%-d")
-
-            content += f"### Phase 2: 実装と技術検証 (Week 5-8: {phase2_start}-{phase2_end})\n\n"
-
-            phase2_by_category = {}
-            for task in phase2_tasks:
-                category = task.get("category", "その他")
-                if category not in phase2_by_category:
-                    phase2_by_category[category] = []
-                phase2_by_category[category].append(task)
-
-            section_counter = 1
-            for category, cat_tasks in phase2_by_category.items():
-                cat_title = category_titles.get(category, category.capitalize())
-                content += f"#### 2.{section_counter} {cat_title}\n"
-
-                for task in sorted(cat_tasks, key=lambda x: x["id"]):
-                    task_id = task["id"]
-                    title = task.get("title", "")
-                    effort = task.get("effort", 0)
-                    effort_hours = task.get("effortHours", 0)
-                    weight = task.get("weight", 0)
-                    assignee = task.get("assignee", "未定")
-                    description = task.get("description", "")
-                    dependencies = task.get("dependencies", [])
-
-                    dep_text = ", ".join(dependencies) if dependencies else "なし"
-
-                    content += f"- **{task_id}** {title}\n"
-                    content += f"  - 担当: {assignee}\n"
-                    content += f"  - 工数: {effort}日（{effort_hours}時間）\n"
-                    content += f"  - Weight: {weight}\n"
-                    content += f"  - 依存: {dep_text}\n"
-                    content += f"  - 説明: {description}\n\n"
-
-                section_counter += 1
-
-            content += f"**Phase 2 合計**: {phase2_effort}日（{phase2_hours}時間）、Weight {phase2_weight}\n\n"
-
-        # Phase 3 WBS
-        if phase3_tasks:
-            phase3_start_dates = [datetime.strptime(t["startDate"], "%Y-%m-%d") for t in phase3_tasks]
-            phase3_end_dates = [datetime.strptime(t["endDate"], "%Y-%m-%d") for t in phase3_tasks]
-            phase3_start = min(phase3_start_dates).strftime("%-m/%-d")
-            phase3_end = max(phase3_end_dates).strftime("%-m/%-d")
-
-            content += f"### Phase 3: フル移行と展開 (Week 9-12: {phase3_start}-{phase3_end})\n\n"
-
-            phase3_by_category = {}
-            for task in phase3_tasks:
-                category = task.get("category", "その他")
-                if category not in phase3_by_category:
-                    phase3_by_category[category] = []
-                phase3_by_category[category].append(task)
-
-            section_counter = 1
-            for category, cat_tasks in phase3_by_category.items():
-                cat_title = category_titles.get(category, category.capitalize())
-                content += f"#### 3.{section_counter} {cat_title}\n"
-
-                for task in sorted(cat_tasks, key=lambda x: x["id"]):
-                    task_id = task["id"]
-                    title = task.get("title", "")
-                    effort = task.get("effort", 0)
-                    effort_hours = task.get("effortHours", 0)
-                    weight = task.get("weight", 0)
-                    assignee = task.get("assignee", "未定")
-                    description = task.get("description", "")
-                    dependencies = task.get("dependencies", [])
-
-                    dep_text = ", ".join(dependencies) if dependencies else "なし"
-
-                    content += f"- **{task_id}** {title}\n"
-                    content += f"  - 担当: {assignee}\n"
-                    content += f"  - 工数: {effort}日（{effort_hours}時間）\n"
-                    content += f"  - Weight: {weight}\n"
-                    content += f"  - 依存: {dep_text}\n"
-                    content += f"  - 説明: {description}\n\n"
-
-                section_counter += 1
-
-            content += f"**Phase 3 合計**: {phase3_effort}日（{phase3_hours}時間）、Weight {phase3_weight}\n\n"
-
-        # タスク一覧テーブル
-        content += "## タスク一覧（GitHub Projects用）\n\n"
-        content += "| ID | タスク名 | Phase | 工数 | Weight | 依存関係 | カテゴリ |\n"
-        content += "|----|---------|-------|------|--------|----------|----------|\n"
-
-        for task in sorted(tasks, key=lambda x: x["id"]):
-            task_id = task["id"]
-            title = task.get("title", "")
-            phase = task.get("phase", "")
-            effort = task.get("effort", 0)
-            weight = task.get("weight", 0)
-            dependencies = task.get("dependencies", [])
-            category = task.get("category", "")
-
-            dep_text = ", ".join(dependencies) if dependencies else "-"
-
-            content += f"| {task_id} | {title} | {phase} | {effort}日 | {weight} | {dep_text} | {category} |\n"
-
-        content += f"\n**Weight設定ガイド:**\n"
-        content += f"- 総Weight = {total_weight} (プロジェクト全体の進捗を%で管理)\n"
-        content += f"- 0.5日タスク = Weight 2, 1日タスク = Weight 3-4, 1.5日タスク = Weight 5, 2.5日タスク = Weight 9\n\n"
-
-        # 依存関係マップ（簡易版）
-        content += "## 依存関係マップ\n\n```\n"
-        content += f"Phase 1: 基盤整備と設計 (Weight: {phase1_weight})\n"
-        for task in phase1_tasks[:5]:  # 最初の5つのみ表示
-            task_id = task["id"]
-            title = task.get("title", "")
-            weight = task.get("weight", 0)
-            content += f"├── {task_id}: {title} (W:{weight})\n"
-
-        content += f"\nPhase 2: 実装と技術検証 (Weight: {phase2_weight})\n"
-        for task in phase2_tasks[:5]:
-            task_id = task["id"]
-            title = task.get("title", "")
-            weight = task.get("weight", 0)
-            content += f"├── {task_id}: {title} (W:{weight})\n"
-
-        content += f"\nPhase 3: フル移行と展開 (Weight: {phase3_weight})\n"
-        for task in phase3_tasks[:5]:
-            task_id = task["id"]
-            title = task.get("title", "")
-            weight = task.get("weight", 0)
-            content += f"├── {task_id}: {title} (W:{weight})\n"
-
-        content += "```\n\n"
-
-        # 工数サマリー
-        content += "## 工数サマリー\n\n"
-        content += "### Phase別工数\n\n"
-        content += "| Phase | 期間 | タスク数 | 総工数 | Total Weight |\n"
-        content += "|-------|------|----------|--------|--------------||\n"
-        content += f"| Phase 1 | Week 1-4 ({phase1_start}-{phase1_end}) | {len(phase1_tasks)}個 | {phase1_effort}日 ({phase1_hours}時間) | {phase1_weight}% |\n"
-        content += f"| Phase 2 | Week 5-8 ({phase2_start}-{phase2_end}) | {len(phase2_tasks)}個 | {phase2_effort}日 ({phase2_hours}時間) | {phase2_weight}% |\n"
-        content += f"| Phase 3 | Week 9-12 ({phase3_start}-{phase3_end}) | {len(phase3_tasks)}個 | {phase3_effort}日 ({phase3_hours}時間) | {phase3_weight}% |\n"
-        content += f"| **合計** | **{total_weeks}週間** | **{len(tasks)}個** | **{total_effort}日 ({total_hours}時間)** | **{total_weight}%** |\n\n"
-
-        content += "### メンバー別工数\n\n"
-        content += "| メンバー | 担当タスク数 | 総工数 | 備考 |\n"
-        content += "|---------|-------------|--------|------|\n"
-        content += f"| BI Engineer | {len(tasks)}個 | {total_effort}日 ({total_hours}時間) | 50%稼働（1日3.5時間） |\n\n"
-
-        content += "### 稼働日数計算\n\n"
-        content += f"- **プロジェクト期間**: {project_start}〜{project_end}（{total_days}日間）\n"
-        content += "- **休業日**: 土日、1/12(成人の日)、2/11(建国記念の日)、2/23(天皇誕生日)、3/20(春分の日)\n"
-        content += "- **稼働日数**: 約56日\n"
-        content += "- **50%稼働**: 28人日 = 196時間\n"
-        content += f"- **計画工数**: {total_effort}人日 = {total_hours}時間\n"
-
-        buffer_rate = ((28 - total_effort) / 28 * 100) if total_effort > 0 else 0
-        content += f"- **余裕率**: {buffer_rate:.1f}%\n\n"
-
-        # 残りの固定セクション
-        content += """## リスク管理
-
-| ID | リスク | 影響度 | 発生確率 | 対策 | 責任者 |
-|----|--------|--------|----------|------|--------|
-| RISK-001 | LookerML習熟度不足による開発遅延 | 高 | 中 | ・Phase 2でトライアル期間を設定<br>・外部トレーニングの活用<br>・シンプルな実装から開始 | PM |
-| RISK-002 | データ品質問題によるダッシュボード信頼性低下 | 高 | 中 | ・Phase 1での徹底的なデータ検証<br>・データ品質チェックの自動化<br>・問題データのクレンジングルール策定 | BI Engineer |
-| RISK-003 | ユーザー要件変更によるスコープクリープ | 中 | 高 | ・優先度による段階的実装<br>・変更管理プロセスの明確化<br>・Phase 3での調整バッファ確保 | PM |
-| RISK-004 | BigQueryコスト超過 | 中 | 低 | ・クエリ最適化<br>・コストモニタリングの自動化<br>・予算アラート設定 | BI Engineer |
-| RISK-005 | 50%稼働による遅延リスク | 高 | 中 | ・優先度の明確化<br>・クリティカルパスの管理<br>・早期のリスク検知とエスカレーション | PM |
-
-## マイルストーン
-
-"""
-
-        # マイルストーンを動的生成
-        weekly_schedule = self.schedule_data.get("weeklySchedule", [])
-        if len(weekly_schedule) >= 4:
-            week4_end = weekly_schedule[3]["dateRange"].split("〜")[-1].strip()
-            content += f"- **Week 4 ({week4_end})**: Phase 1完了 - 基盤整備・設計完了、LookerML設計方針確定\n"
-        if len(weekly_schedule) >= 8:
-            week8_end = weekly_schedule[7]["dateRange"].split("〜")[-1].strip()
-            content += f"- **Week 8 ({week8_end})**: Phase 2完了 - Looker Studio高優先度ダッシュボード3種完成、LookerML基本構造実装完了\n"
-        if len(weekly_schedule) >= 12:
-            week12_end = weekly_schedule[11]["dateRange"].split("〜")[-1].strip()
-            content += f"- **Week 12 ({week12_end})**: Phase 3完了 - 全ダッシュボード完成、本番リリース\n"
-
-        content += """
-## 成果物
-
-### Phase 1
-- [ ] 既存BigQuery DWHテーブルのドキュメント（テーブル一覧、スキーマ定義）
-- [ ] スプレッドシート→BigQueryマッピング表
-- [ ] データ品質チェックスクリプト
-- [ ] ダッシュボードワイヤーフレーム（高優先度3種）
-- [ ] KPI定義書
-- [ ] LookerML設計書
-
-### Phase 2
-- [ ] Looker Studioダッシュボード（優先度：高）×3
-  - 経営ダッシュボード
-  - 稼働状況ダッシュボード
-  - 財務ダッシュボード
-- [ ] Looker Models（advisor_operations, financial_analysis）
-- [ ] Looker Views（base, facts, aggregates）
-- [ ] Looker Explores（advisor_activity, contract_management等）
-- [ ] GitHubリポジトリ（LookerMLコードベース）
-- [ ] LookerML開発ガイドライン
-- [ ] トレーニング資料
-
-### Phase 3
-- [ ] Lookerダッシュボード（優先度：中）×3
-  - 顧問パフォーマンスダッシュボード
-  - 解約分析ダッシュボード
-  - 営業（SS）分析ダッシュボード
-- [ ] Lookerダッシュボード（優先度：低）×1
-  - 詳細分析ダッシュボード
-- [ ] システムアーキテクチャ設計書
-- [ ] ダッシュボード利用マニュアル
-- [ ] 運用手順書
-- [ ] トラブルシューティングガイド
-
-## コミュニケーション計画
-
-### 定例会議
-- **週次進捗会議**: 毎週月曜日 10:00-10:30
-- **フェーズレビュー**: 各Phase終了時（Week 4, Week 8, Week 12）
-
-### レポート
-- **週次レポート**: 毎週金曜日に進捗報告
-- **月次レポート**: 月末に全体まとめ
-
-### コミュニケーションチャネル
-- **Slack**: #project-dashboard-migration
-- **GitHub Projects**: 進捗トラッキング
-- **Email**: プロジェクト関係者メーリングリスト
-
-## 品質基準
-
-### ダッシュボード品質
-- [ ] データ整合性100%（スプレッドシートとの突合）
-- [ ] ダッシュボード目視検証完了
-- [ ] LookML構文チェック（LookML Validator）
-- [ ] ユーザーレビュー実施
-
-### ドキュメント
-- [ ] システムアーキテクチャ設計書作成
-- [ ] ダッシュボード利用マニュアル作成
-- [ ] LookerML開発ガイドライン作成
-- [ ] 運用手順書作成
-
-### セキュリティ
-- [ ] BigQuery IAMアクセス制御設定
-- [ ] 列レベルセキュリティ設定（顧問名、企業名）
-- [ ] 監査ログ有効化
-
-## 承認
-
-| 役割 | 氏名 | 承認日 | 署名 |
-|------|------|--------|------|
-| プロジェクトマネージャー | [未定] | - | _______ |
-| バックオフィス責任者 | [未定] | - | _______ |
-| IT部門責任者 | [未定] | - | _______ |
-
----
-
-**作成日**: 2026-01-15
-**最終更新**: """ + datetime.now().strftime("%Y-%m-%d") + f"""
-**バージョン**: 1.0（自動生成）
-**SPEC.md参照**: Version 2.0 (2026-01-15)
-"""
-
-        # ファイルに書き込み
-        plan_md_file = self.base_dir / "PLAN.md"
-        with open(plan_md_file, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        print(f"  ✓ PLAN.md再生成完了")
+            print(f"  ✓ PLAN.mdに変更はありません（書き込みを省略）")
 
     def regenerate_schedule_md(self):
         """SCHEDULE.mdを再生成"""
         print("\n📝 SCHEDULE.mdを再生成中...")
 
-        # 基本情報
-        project_name = self.tasks_data.get("project", {}).get("name", "プロジェクト")
-        total_tasks = len(self.schedule_data.get("tasks", []))
-        total_weeks = len(self.schedule_data.get("weeklySchedule", []))
-
-        # 開始日・終了日
-        tasks = self.schedule_data.get("tasks", [])
-        if tasks:
-            start_dates = [datetime.strptime(t["startDate"], "%Y-%m-%d") for t in tasks]
-            end_dates = [datetime.strptime(t["endDate"], "%Y-%m-%d") for t in tasks]
-            project_start = min(start_dates).strftime("%Y-%m-%d")
-            project_end = max(end_dates).strftime("%Y-%m-%d")
+        renderer = ScheduleRenderer(self.tasks_data, self.schedule_data)
+        if self._regenerate_sections(self.schedule_md_file, renderer, "schedule"):
+            print(f"  ✓ SCHEDULE.md再生成完了")
         else:
-            project_start = "未定"
-            project_end = "未定"
-
-        # SCHEDULE.md生成
-        content = f"""# {project_name} - スケジュール
-
-## 📅 プロジェクト期間
-
-- **開始日**: {project_start}
-- **終了日**: {project_end}
-- **総タスク数**: {total_tasks}個
-- **スケジュール期間**: {total_weeks}週間
-
-## 📊 週次スケジュール
-
-"""
-
-        # 週次スケジュールを追加
-        for week_info in self.schedule_data.get("weeklySchedule", []):
-            week = week_info["week"]
-            date_range = week_info["dateRange"]
-            cumulative_progress = week_info["cumulativeProgress"]
-            tasks_in_week = week_info["tasks"]
-
-            content += f"### {week} ({date_range})\n\n"
-            content += f"- **累積進捗率**: {cumulative_progress}%\n"
-            content += f"- **タスク数**: {len(tasks_in_week)}個\n\n"
-
-            if tasks_in_week:
-                content += "**タスク一覧**:\n\n"
-                for task_id in tasks_in_week:
-                    task = self.find_task_in_schedule(task_id)
-                    if task:
-                        title = task.get("title", "")
-                        priority = task.get("priority", "medium")
-                        category = task.get("category", "")
-                        effort = task.get("effort", 0)
-
-                        priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(priority, "⚪")
-
-                        content += f"- {priority_emoji} **{task_id}**: {title}\n"
-                        content += f"  - カテゴリ: {category}, 工数: {effort}日\n"
-                        content += f"  - 期間: {task['startDate']} 〜 {task['endDate']}\n"
-
-            content += "\n"
-
-        # タスク詳細
-        content += "## 📋 全タスク詳細\n\n"
-
-        for task in self.schedule_data.get("tasks", []):
-            task_id = task["id"]
-            title = task.get("title", "")
-            description = task.get("description", "")
-            phase = task.get("phase", "")
-            priority = task.get("priority", "medium")
-            category = task.get("category", "")
-            effort = task.get("effort", 0)
-            weight = task.get("weight", 0)
-            start_date = task.get("startDate", "")
-            end_date = task.get("endDate", "")
-            dependencies = task.get("dependencies", [])
-
-            priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(priority, "⚪")
-
-            content += f"### {priority_emoji} {task_id}: {title}\n\n"
-            content += f"**概要**: {description}\n\n"
-            content += f"- **Phase**: {phase}\n"
-            content += f"- **カテゴリ**: {category}\n"
-            content += f"- **優先度**: {priority}\n"
-            content += f"- **工数**: {effort}日\n"
-            content += f"- **重み**: {weight}%\n"
-            content += f"- **期間**: {start_date} 〜 {end_date}\n"
-
-            if dependencies:
-                content += f"- **依存タスク**: {', '.join(dependencies)}\n"
-
-            content += "\n"
-
-        # ファイルに書き込み
-        with open(self.schedule_md_file, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        print(f"  ✓ SCHEDULE.md再生成完了")
+            print(f"  ✓ SCHEDULE.mdに変更はありません（書き込みを省略）")
 
     def update_github_issue(self, task_id: str):
         """GitHub Issueを更新"""
@@ -924,8 +583,38 @@ class ScheduleUpdateManager:
 
         print(f"  ✓ Issue #{issue_number} 更新完了")
 
-    def update_github_projects_dates(self, task_id: str):
-        """GitHub Projects V2の日付フィールドを更新"""
+    def _get_project_index(self, require_issues: Optional[List[str]] = None) -> ProjectIndex:
+        """
+        Projects V2のインデックスを取得（ローカルキャッシュを利用）
+
+        キャッシュに無いIssueがあれば再取得するが、APIからの取得は1回の実行につき1度まで。
+        取得し直しても無いIssueはプロジェクトに含まれていないものとして記録する。
+        """
+        index = self._project_index
+        if index is None or not index.fresh:
+            missing = [n for n in (require_issues or []) if index is None or index.item_id(n) is None]
+            if index is None or missing:
+                index = self._project_index = load_project_index(
+                    self.run_gh_api,
+                    owner=REPO_OWNER,
+                    number=PROJECT_NUMBER,
+                    cache_file=self.project_cache_file,
+                    require_issues=require_issues
+                )
+
+        if index.fresh:
+            self._issues_not_in_project.update(
+                str(n) for n in (require_issues or []) if index.item_id(n) is None
+            )
+        return index
+
+    def update_github_projects_dates(self, task_id: str, batch: Optional[ProjectFieldBatch] = None):
+        """
+        GitHub Projects V2の日付フィールドを更新
+
+        batchが指定された場合は更新をキューに積むだけで、送信は呼び出し側の
+        batch.flush() でまとめて行う。
+        """
         print(f"\n📊 Projects V2 日付更新中: {task_id}...")
 
         # Issue番号を取得
@@ -943,94 +632,53 @@ class ScheduleUpdateManager:
         start_date = schedule_task.get("startDate")
         end_date = schedule_task.get("endDate")
 
-        # プロジェクト情報を取得
-        query = f"""
-        {{
-          user(login: "{REPO_OWNER}") {{
-            projectV2(number: {PROJECT_NUMBER}) {{
-              id
-              fields(first: 20) {{
-                nodes {{
-                  ... on ProjectV2Field {{
-                    id
-                    name
-                  }}
-                }}
-              }}
-              items(first: 100) {{
-                nodes {{
-                  id
-                  content {{
-                    ... on Issue {{
-                      number
-                    }}
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
+        if str(issue_number) in self._issues_not_in_project:
+            print(f"  ⚠️  Issue #{issue_number} はプロジェクトに含まれていません。スキップします。")
+            return
 
         try:
-            result = self.run_gh_api(query)
-            project_info = result["data"]["user"]["projectV2"]
-            project_id = project_info["id"]
+            index = self._get_project_index([issue_number])
+        except Exception as e:
+            print(f"  ⚠️  Projects更新失敗: {e}")
+            return
 
-            # フィールドIDを取得
-            fields = {field["name"]: field["id"] for field in project_info["fields"]["nodes"]}
-            start_date_field_id = fields.get("Start Date")
-            end_date_field_id = fields.get("End Date")
+        start_date_field_id = index.field_id("Start Date")
+        end_date_field_id = index.field_id("End Date")
 
-            if not start_date_field_id or not end_date_field_id:
-                print("  ⚠️  'Start Date' または 'End Date' フィールドが見つかりません")
-                return
+        if not start_date_field_id or not end_date_field_id:
+            print("  ⚠️  'Start Date' または 'End Date' フィールドが見つかりません")
+            return
+
+        item_id = index.item_id(issue_number)
+        if not item_id:
+            print(f"  ⚠️  Issue #{issue_number} がProjectsに追加されていません")
+            return
 
-            # Issue番号からItem IDを取得
-            issue_to_item = {}
-            for item in project_info["items"]["nodes"]:
-                if item["content"]:
-                    item_issue_number = str(item["content"]["number"])
-                    issue_to_item[item_issue_number] = item["id"]
+        flush_now = batch is None
+        if flush_now:
+            batch = ProjectFieldBatch(index.project_id, self.run_gh_api)
 
-            if issue_number not in issue_to_item:
-                print(f"  ⚠️  Issue #{issue_number} がProjectsに追加されていません")
-                return
+        batch.set_date(item_id, start_date_field_id, start_date, label=f"{task_id} Start Date")
+        batch.set_date(item_id, end_date_field_id, end_date, label=f"{task_id} End Date")
+        print(f"  ✓ Start Date: {start_date} / End Date: {end_date}（送信待ち）")
 
-            item_id = issue_to_item[issue_number]
+        if flush_now:
+            self._flush_project_batch(batch)
 
-            # Start Dateを更新
-            self._update_project_field(project_id, item_id, start_date_field_id, start_date)
-            print(f"  ✓ Start Date更新: {start_date}")
+    def _flush_project_batch(self, batch: ProjectFieldBatch):
+        """キューに積まれたProjects V2の更新をまとめて送信"""
+        if not len(batch):
+            return
 
-            # End Dateを更新
-            self._update_project_field(project_id, item_id, end_date_field_id, end_date)
-            print(f"  ✓ End Date更新: {end_date}")
+        total = len(batch)
+        print(f"\n📤 Projects V2 フィールド更新を一括送信中（{total}件）...")
+        updated, errors = batch.flush()
 
-        except Exception as e:
-            print(f"  ⚠️  Projects更新失敗: {e}")
+        for error in errors:
+            self.errors.append(f"Projects更新失敗: {error}")
+            print(f"  ⚠️  {error}")
 
-    def _update_project_field(self, project_id: str, item_id: str, field_id: str, value: str):
-        """Project ItemのフィールドValueを更新"""
-        mutation = f"""
-        mutation {{
-          updateProjectV2ItemFieldValue(
-            input: {{
-              projectId: "{project_id}"
-              itemId: "{item_id}"
-              fieldId: "{field_id}"
-              value: {{
-                date: "{value}"
-              }}
-            }}
-          ) {{
-            projectV2Item {{
-              id
-            }}
-          }}
-        }}
-        """
-        self.run_gh_api(mutation)
+        print(f"  ✓ {updated}/{total}件のフィールドを更新")
 
     def delete_github_issue(self, task_id: str):
         """GitHub Issueをクローズ（削除の代わり）"""
@@ -1067,10 +715,23 @@ class ScheduleUpdateManager:
             # 全タスクを同期
             task_ids = [task["id"] for task in self.schedule_data.get("tasks", [])]
 
+        # Projects V2の日付更新は全タスク分をまとめて送信する
+        batch = None
+        try:
+            issue_numbers = [self.issue_mapping[t] for t in task_ids if t in self.issue_mapping]
+            index = self._get_project_index(issue_numbers)
+            batch = ProjectFieldBatch(index.project_id, self.run_gh_api)
+        except Exception as e:
+            print(f"  ⚠️  Projects情報の取得に失敗しました（日付更新をスキップ）: {e}")
+
         for task_id in task_ids:
             if task_id in self.issue_mapping:
                 self.update_github_issue(task_id)
-                self.update_github_projects_dates(task_id)
+                if batch is not None:
+                    self.update_github_projects_dates(task_id, batch)
+
+        if batch is not None:
+            self._flush_project_batch(batch)
 
         print("\n✅ GitHub同期完了")
 
@@ -1078,6 +739,15 @@ class ScheduleUpdateManager:
         """全ての変更をファイルに保存"""
         print("\n💾 変更をファイルに保存中...")
 
+        # ファイルを書き込む前に、変更したレコードをジャーナルに記録する
+        op = None
+        transaction = self._transaction
+        if transaction is not None and transaction["op"] is None:
+            changes = diff(transaction["snapshot"], self._sources())
+            if changes:
+                label = "; ".join(self.changes[transaction["changes_from"]:]) or "変更"
+                op = transaction["op"] = self.journal.append(label, changes, undoes=transaction["undoes"])
+
         # tasks.jsonを保存
         self._save_json(self.tasks_file, self.tasks_data)
         print("  ✓ tasks.json保存完了")
@@ -1090,6 +760,10 @@ class ScheduleUpdateManager:
         self._save_json(self.mapping_file, self.issue_mapping)
         print("  ✓ github-issue-mapping.json保存完了")
 
+        if op is not None:
+            self.journal.mark(op, COMMITTED)
+            print(f"  ✓ 変更ジャーナルに記録（#{op}）")
+
         print("\n✅ 全ファイル保存完了")
 
     def show_summary(self):
@@ -1110,6 +784,110 @@ class ScheduleUpdateManager:
                 print(f"  ✗ {error}")
 
 
+def run_batch(manager: ScheduleUpdateManager, args: argparse.Namespace):
+    """
+    変更ファイルの変更をまとめて適用
+
+    全ての変更をメモリ上で適用してから、クリティカルパス・週次スケジュール・PLAN.md・SCHEDULE.md の
+    再計算とファイルの保存を1回ずつ行い、変更のあったタスクをまとめてGitHubに同期する。
+    途中の変更でエラーが発生した場合は全ての変更を取り消す。
+    """
+    try:
+        changes = load_changes(Path(args.batch))
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if not changes:
+        print("変更ファイルに変更がありません。")
+        return
+
+    deletes = [change["task"] for change in changes if change["op"] == "delete"]
+    if deletes and not args.yes:
+        confirm = input(f"以下のタスクを削除します: {', '.join(deletes)}\n本当に削除しますか？ (yes/no): ").strip().lower()
+        if confirm != "yes":
+            print("キャンセルしました。")
+            sys.exit(0)
+
+    manager.begin_transaction()
+    try:
+        deleted = manager.apply_batch(changes)
+
+        # 再計算・再生成は全ての変更を適用した後に1回だけ行う
+        manager.recalculate_critical_path()
+        manager.recalculate_weekly_schedule()
+        manager.regenerate_plan_md()
+        manager.regenerate_schedule_md()
+
+        if not args.no_github_sync:
+            for task_id in deleted:
+                manager.delete_github_issue(task_id)
+
+        manager.save_all_changes()
+
+        # 日付が変わったタスクと変更を指定したタスクをまとめて同期（削除したタスクを除く）
+        if not args.no_github_sync:
+            candidates = manager.updated_task_ids + [change["task"] for change in changes]
+            sync_ids = list(dict.fromkeys(task_id for task_id in candidates if task_id not in deleted))
+            if sync_ids:
+                manager.sync_to_github(sync_ids)
+
+        manager.show_summary()
+
+        print("\n" + "=" * 70)
+        print(f"✅ 一括変更完了（{len(changes)}件）")
+        print("=" * 70)
+
+    except Exception as e:
+        print(f"\n\nERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        manager.rollback()
+        sys.exit(1)
+
+
+def run_leveling(manager: ScheduleUpdateManager, args: argparse.Namespace):
+    """リソース平準化を行い、日付が変わったタスクをGitHubに同期する"""
+    manager.begin_transaction()
+    try:
+        manager.level_schedule()
+        manager.recalculate_critical_path()
+        manager.recalculate_weekly_schedule()
+        manager.regenerate_plan_md()
+        manager.regenerate_schedule_md()
+        manager.save_all_changes()
+
+        if not args.no_github_sync and manager.updated_task_ids:
+            manager.sync_to_github(manager.updated_task_ids)
+
+        manager.show_summary()
+
+        print("\n" + "=" * 70)
+        print("✅ リソース平準化完了")
+        print("=" * 70)
+    except Exception as e:
+        print(f"\n\nERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        manager.rollback()
+        sys.exit(1)
+
+
+def show_journal(journal: ChangeJournal, limit: int = 20):
+    """変更ジャーナルの最近の履歴を表示"""
+    entries = journal.entries()
+    if not entries:
+        print("変更ジャーナルに記録はありません")
+        return
+
+    status_labels = {COMMITTED: "✓", ROLLED_BACK: "↩️ 巻き戻し済み", PENDING: "⏳ 未完了"}
+    print(f"📒 変更ジャーナル（最新{min(limit, len(entries))}件 / 全{len(entries)}件）")
+    for entry in entries[-limit:]:
+        status = status_labels.get(entry["status"], entry["status"])
+        if "undone_by" in entry:
+            status = f"↩️ #{entry['undone_by']}で取り消し済み"
+        print(f"  #{entry['op']:<4} {entry['time']}  {status}  {entry['label']}（{len(entry['changes'])}件）")
+
+
 def interactive_mode(manager: ScheduleUpdateManager):
     """インタラクティブモード"""
     print("\n" + "=" * 70)
@@ -1127,38 +905,40 @@ def interactive_mode(manager: ScheduleUpdateManager):
 
     if choice == "1":
         task_id = input("タスクID (例: TASK-007): ").strip()
-        days = int(input("延長する日数: ").strip())
+        days = int(input("延長する稼働日数: ").strip())
 
-        backup_dir = manager._backup_files()
+        manager.begin_transaction()
         try:
             manager.extend_deadline(task_id, days)
+            manager.recalculate_critical_path()
             manager.recalculate_weekly_schedule()
             manager.regenerate_plan_md()
             manager.regenerate_schedule_md()
             manager.save_all_changes()
-            manager.sync_to_github([task_id])
+            manager.sync_to_github(manager.updated_task_ids or [task_id])
             manager.show_summary()
         except Exception as e:
             print(f"\nERROR: {e}")
-            manager._restore_from_backup(backup_dir)
+            manager.rollback()
             sys.exit(1)
 
     elif choice == "2":
         task_id = input("タスクID (例: TASK-015): ").strip()
         new_date = input("新しい開始日 (YYYY-MM-DD): ").strip()
 
-        backup_dir = manager._backup_files()
+        manager.begin_transaction()
         try:
             manager.change_start_date(task_id, new_date)
+            manager.recalculate_critical_path()
             manager.recalculate_weekly_schedule()
             manager.regenerate_plan_md()
             manager.regenerate_schedule_md()
             manager.save_all_changes()
-            manager.sync_to_github([task_id])
+            manager.sync_to_github(manager.updated_task_ids or [task_id])
             manager.show_summary()
         except Exception as e:
             print(f"\nERROR: {e}")
-            manager._restore_from_backup(backup_dir)
+            manager.rollback()
             sys.exit(1)
 
     elif choice == "3":
@@ -1166,10 +946,11 @@ def interactive_mode(manager: ScheduleUpdateManager):
         confirm = input(f"本当に{task_id}を削除しますか？ (yes/no): ").strip().lower()
 
         if confirm == "yes":
-            backup_dir = manager._backup_files()
+            manager.begin_transaction()
             try:
                 manager.delete_task(task_id)
                 manager.delete_github_issue(task_id)
+                manager.recalculate_critical_path()
                 manager.recalculate_weekly_schedule()
                 manager.regenerate_plan_md()
                 manager.regenerate_schedule_md()
@@ -1177,7 +958,7 @@ def interactive_mode(manager: ScheduleUpdateManager):
                 manager.show_summary()
             except Exception as e:
                 print(f"\nERROR: {e}")
-                manager._restore_from_backup(backup_dir)
+                manager.rollback()
                 sys.exit(1)
         else:
             print("キャンセルしました。")
@@ -1186,7 +967,7 @@ def interactive_mode(manager: ScheduleUpdateManager):
         task_id = input("タスクID (例: TASK-005): ").strip()
         new_priority = input("新しい優先度 (high/medium/low): ").strip()
 
-        backup_dir = manager._backup_files()
+        manager.begin_transaction()
         try:
             manager.change_priority(task_id, new_priority)
             manager.save_all_changes()
@@ -1195,7 +976,7 @@ def interactive_mode(manager: ScheduleUpdateManager):
             manager.show_summary()
         except Exception as e:
             print(f"\nERROR: {e}")
-            manager._restore_from_backup(backup_dir)
+            manager.rollback()
             sys.exit(1)
 
     elif choice == "5":
@@ -1214,7 +995,7 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 使用例:
-  # タスクの期限を7日延長
+  # タスクの期限を7稼働日延長
   python3 scripts/update-schedule.py --task TASK-007 --extend-deadline 7
 
   # タスクの開始日を変更
@@ -1226,18 +1007,36 @@ def main():
   # タスクの優先度を変更
   python3 scripts/update-schedule.py --task TASK-005 --priority high
 
+  # リソース平準化（担当者の稼働能力を超えないように組み直す）
+  python3 scripts/update-schedule.py --action level
+
   # インタラクティブモード
   python3 scripts/update-schedule.py --interactive
+
+  # 変更ファイルの変更をまとめて適用
+  python3 scripts/update-schedule.py --batch changes.jsonl
+
+  # 直前の変更を取り消す
+  python3 scripts/update-schedule.py --undo
         """
     )
 
     parser.add_argument("--task", type=str, help="対象タスクID (例: TASK-007)")
-    parser.add_argument("--extend-deadline", type=int, help="期限を延長する日数")
+    parser.add_argument("--extend-deadline", type=int, help="期限を延長する稼働日数（土日・祝日を除く）")
     parser.add_argument("--start-date", type=str, help="新しい開始日 (YYYY-MM-DD)")
-    parser.add_argument("--action", type=str, choices=["delete"], help="実行するアクション")
+    parser.add_argument("--action", type=str, choices=["delete", "level"],
+                        help="実行するアクション（delete: --task のタスクを削除、level: リソース平準化）")
     parser.add_argument("--priority", type=str, choices=["high", "medium", "low"], help="新しい優先度")
     parser.add_argument("--interactive", action="store_true", help="インタラクティブモード")
     parser.add_argument("--no-github-sync", action="store_true", help="GitHub同期をスキップ")
+    parser.add_argument("--batch", type=str, metavar="FILE",
+                        help="変更ファイル（.jsonl / .yaml）の変更をまとめて適用")
+    parser.add_argument("--yes", "-y", action="store_true", help="削除の確認を省略（--batch 用）")
+    parser.add_argument("--undo", nargs="?", type=int, const=0, metavar="OP",
+                        help="変更ジャーナルの変更を取り消す（番号省略時は最新の変更）")
+    parser.add_argument("--journal", action="store_true", help="変更ジャーナルの履歴を表示")
+    parser.add_argument("--compact-journal", action="store_true",
+                        help=f"変更ジャーナルを新しい{KEEP_ENTRIES}件だけに圧縮")
 
     args = parser.parse_args()
 
@@ -1252,13 +1051,47 @@ def main():
         interactive_mode(manager)
         return
 
+    # 変更ジャーナルの操作
+    if args.journal:
+        show_journal(manager.journal)
+        return
+    if args.compact_journal:
+        removed = manager.journal.compact()
+        print(f"✅ 変更ジャーナルを圧縮しました（{removed}件削除）")
+        return
+    if args.undo is not None:
+        manager.begin_transaction()
+        try:
+            manager.undo(args.undo or None)
+            manager.regenerate_plan_md()
+            manager.regenerate_schedule_md()
+            manager.save_all_changes()
+            if not args.no_github_sync and manager.updated_task_ids:
+                manager.sync_to_github(manager.updated_task_ids)
+            manager.show_summary()
+        except Exception as e:
+            print(f"\n\nERROR: {e}")
+            manager.rollback()
+            sys.exit(1)
+        return
+
+    # 一括変更
+    if args.batch:
+        run_batch(manager, args)
+        return
+
+    # リソース平準化（全タスクが対象なので --task は不要）
+    if args.action == "level":
+        run_leveling(manager, args)
+        return
+
     # タスクIDが指定されていない場合はエラー
     if not args.task and not args.interactive:
         parser.print_help()
         sys.exit(1)
 
-    # バックアップ作成
-    backup_dir = manager._backup_files()
+    # 変更の開始時点を記録（エラー時のロールバック用）
+    manager.begin_transaction()
 
     try:
         # 操作実行
@@ -1280,6 +1113,9 @@ def main():
             print("ERROR: 実行する操作を指定してください（--extend-deadline, --start-date, --action, --priority）")
             sys.exit(1)
 
+        # クリティカルパス再計算
+        manager.recalculate_critical_path()
+
         # 週次スケジュール再計算
         manager.recalculate_weekly_schedule()
 
@@ -1294,7 +1130,7 @@ def main():
 
         # GitHub同期
         if not args.no_github_sync and args.action != "delete":
-            manager.sync_to_github([args.task])
+            manager.sync_to_github(manager.updated_task_ids or [args.task])
 
         # サマリー表示
         manager.show_summary()
@@ -1307,7 +1143,7 @@ def main():
         print(f"\n\nERROR: {e}")
         import traceback
         traceback.print_exc()
-        manager._restore_from_backup(backup_dir)
+        manager.rollback()
         sys.exit(1)
 
 
@@ -0,0 +1,104 @@
+"""
+週次スケジュール集計
+
+タスクの開始日・終了日を1度だけ日付の序数（date.toordinal）に変換し、
+開始日順に並べたタスクを週ごとに走査するスイープラインで週へ割り当てます。
+週数の上限はなく、複数年にわたるプロジェクトも扱えます。
+
+週の区切り:
+    - 週は月曜〜日曜。Week 1 はプロジェクト開始日を含む週
+    - 表示上の期間（dateRange）は 月曜（Week 1 はプロジェクト開始日）〜 金曜
+    - workingDays は期間内の稼働日数（稼働日カレンダーの表引きで求める）
+    - 土日にかかるタスクもその週に含める
+    - タスクの weight は終了日を含む週で累積進捗に加算する
+
+使用例:
+    weekly = build_weekly_schedule(
+        schedule_data["tasks"],
+        project_start="2026-01-06",
+        holidays=["2026-01-12", "2026-02-11"]
+    )
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from work_calendar import WorkCalendar
+
+
+def _ordinal(value: str) -> int:
+    return date.fromisoformat(value).toordinal()
+
+
+def build_weekly_schedule(
+    tasks: List[Dict],
+    project_start: Optional[str] = None,
+    holidays: Optional[Iterable[str]] = None,
+    calendar: Optional[WorkCalendar] = None
+) -> List[Dict]:
+    """
+    タスク一覧から週次スケジュールを生成
+
+    Args:
+        tasks: startDate / endDate / weight を持つタスクのリスト
+        project_start: プロジェクト開始日（省略時は最も早いタスクの開始日）
+        holidays: 祝日・休業日（YYYY-MM-DD、calendar を省略した場合に使う）
+        calendar: 稼働日カレンダー
+
+    Returns:
+        schedule.json の weeklySchedule と同じ形式のリスト
+    """
+    dated = [task for task in tasks if task.get("startDate") and task.get("endDate")]
+    if not dated:
+        return []
+
+    # 日付の解析はタスクごとに1度だけ
+    starts = [_ordinal(task["startDate"]) for task in dated]
+    ends = [_ordinal(task["endDate"]) for task in dated]
+
+    start_ordinal = _ordinal(project_start) if project_start else min(starts)
+    if calendar is None:
+        calendar = WorkCalendar(holidays=holidays, start=start_ordinal, end=max(ends))
+    # Week 1 の月曜日（date.weekday() は月曜が0）
+    first_monday = start_ordinal - date.fromordinal(start_ordinal).weekday()
+    week_count = (max(ends) - first_monday) // 7 + 1
+
+    # 終了日を含む週に weight を加算
+    week_progress = [0.0] * week_count
+    for task, end in zip(dated, ends):
+        week_index = (end - first_monday) // 7
+        if week_index >= 0:
+            week_progress[week_index] += task.get("weight", 0)
+
+    # 開始日順（同日はタスク一覧の順）に並べて週ごとに走査する
+    order = sorted(range(len(dated)), key=lambda i: (starts[i], i))
+    pointer = 0
+    active: List[int] = []
+
+    weekly_schedule = []
+    cumulative_progress = 0.0
+    for week_index in range(week_count):
+        monday = first_monday + week_index * 7
+        sunday = monday + 6
+
+        # この週までに始まるタスクを追加し、前の週までに終わったタスクを外す
+        while pointer < len(order) and starts[order[pointer]] <= sunday:
+            active.append(order[pointer])
+            pointer += 1
+        active = [i for i in active if ends[i] >= monday]
+
+        range_start = max(monday, start_ordinal)
+        friday = monday + 4
+        range_end = max(friday, range_start)
+        working_days = calendar.working_days_between(range_start, friday)
+
+        cumulative_progress += week_progress[week_index]
+        weekly_schedule.append({
+            "week": f"Week {week_index + 1}",
+            "dateRange": f"{date.fromordinal(range_start).isoformat()} 〜 {date.fromordinal(range_end).isoformat()}",
+            "workingDays": working_days,
+            "tasks": [dated[i]["id"] for i in active],
+            "cumulativeProgress": round(cumulative_progress, 1)
+        })
+
+    return weekly_schedule
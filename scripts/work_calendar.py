@@ -0,0 +1,222 @@
+"""
+稼働日カレンダー
+
+土日・祝日（project.holidays）・担当者ごとの休業日（project.assigneeExceptions）を除いた稼働日の
+番号表を期間分まとめて作っておき、稼働日の加算・稼働日数の計算を表引き（O(1)）で行います。
+表の範囲外の日付を扱うときは、範囲を広げて作り直します。
+
+番号表:
+    rank(d)  … d より前（d を含まない）の稼働日の数。稼働日は連番になり、
+               非稼働日は次の稼働日と同じ番号になる。表を広げても番号は変わらない
+    _day_at(k) … 番号 k の稼働日
+
+タスクの期間:
+    稼働率（project.allocation、無ければ teamSize の「50%」などから求める）で工数を割り、
+    端数を切り上げた稼働日数をタスクの期間とする（例: 50%稼働で工数1.5日 → 3稼働日）。
+
+使用例:
+    calendar = calendar_from_project(schedule_data["project"])
+    calendar.add_working_days("2026-01-09", 1)           # → 2026-01-13（土日と1/12を飛ばす）
+    calendar.working_days_between("2026-01-05", "2026-01-09")
+    end = calendar.end_date("2026-01-22", effort=2.5, allocation=0.5)
+"""
+
+import math
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Union
+
+DateLike = Union[str, date, int]
+
+# 土曜・日曜（date.weekday()）
+WEEKEND = (5, 6)
+
+# 範囲外の日付を扱うときに前後に広げる日数
+PADDING_DAYS = 366
+
+
+def _to_ordinal(value: DateLike) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value).toordinal()
+    return value.toordinal()
+
+
+class WorkCalendar:
+    """稼働日カレンダー（稼働日の番号表を持つ）"""
+
+    def __init__(
+        self,
+        holidays: Optional[Iterable[str]] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        weekend: Iterable[int] = WEEKEND,
+        exceptions: Optional[Dict[str, Iterable[str]]] = None
+    ):
+        """
+        Args:
+            holidays: 祝日・休業日（YYYY-MM-DD）
+            start, end: 番号表を作る期間（省略時は今日の前後）
+            weekend: 休みの曜日（date.weekday()、既定は土日）
+            exceptions: 担当者名 → その担当者だけの休業日
+        """
+        self.holidays = {_to_ordinal(day) for day in (holidays or [])}
+        self.weekend = frozenset(weekend)
+        if len(self.weekend) >= 7:
+            raise ValueError("稼働する曜日がありません")
+        self.exceptions = {name: list(days) for name, days in (exceptions or {}).items()}
+        self._assignee_calendars: Dict[str, "WorkCalendar"] = {}
+        self._ranks: List[int] = []
+        self._days: List[int] = []
+        self._offset = 0
+
+        today = date.today().toordinal()
+        first = _to_ordinal(start) if start is not None else today
+        last = _to_ordinal(end) if end is not None else first
+        self._build(min(first, last) - PADDING_DAYS, max(first, last) + PADDING_DAYS)
+
+    def _build(self, first: int, last: int):
+        """first〜last（序数）の番号表を作る"""
+        ranks: List[int] = []
+        days: List[int] = []
+        for ordinal in range(first, last + 1):
+            ranks.append(len(days))
+            if self.is_working_ordinal(ordinal):
+                days.append(ordinal)
+        # 最終日の翌日の番号（範囲内の稼働日の総数）
+        ranks.append(len(days))
+
+        # 作り直す前に返した番号が変わらないよう、前の表の基準日の番号を保つ
+        if self._ranks:
+            self._offset -= ranks[self._base - first]
+
+        self._base = first
+        self._last = last
+        self._ranks = ranks
+        self._days = days
+
+    def _ensure(self, ordinal: int):
+        if ordinal < self._base or ordinal > self._last:
+            self._build(min(ordinal, self._base) - PADDING_DAYS, max(ordinal, self._last) + PADDING_DAYS)
+
+    def is_working_ordinal(self, ordinal: int) -> bool:
+        return ordinal not in self.holidays and date.fromordinal(ordinal).weekday() not in self.weekend
+
+    def is_working_day(self, day: DateLike) -> bool:
+        """稼働日かどうか"""
+        return self.is_working_ordinal(_to_ordinal(day))
+
+    # ------------------------------------------------------------------
+    # 番号表の参照
+    # ------------------------------------------------------------------
+
+    def rank(self, day: DateLike) -> int:
+        """稼働日の番号（day より前の稼働日の数。差をとると稼働日数になる）"""
+        ordinal = _to_ordinal(day)
+        self._ensure(ordinal)
+        return self._ranks[ordinal - self._base] + self._offset
+
+    def _day_at(self, rank: int) -> int:
+        """番号 rank の稼働日（序数）。表の範囲を超える場合は広げる"""
+        index = rank - self._offset
+        while index < 0 or index >= len(self._days):
+            self._build(self._base - PADDING_DAYS, self._last + PADDING_DAYS)
+            index = rank - self._offset
+        return self._days[index]
+
+    # ------------------------------------------------------------------
+    # 稼働日の計算
+    # ------------------------------------------------------------------
+
+    def date_at(self, rank: int) -> date:
+        """番号 rank の稼働日（rank() の逆引き）"""
+        return date.fromordinal(self._day_at(rank))
+
+    def next_working_day(self, day: DateLike) -> date:
+        """day 以降で最初の稼働日（day が稼働日ならそのまま）"""
+        return date.fromordinal(self._day_at(self.rank(day)))
+
+    def add_working_days(self, day: DateLike, days: int) -> date:
+        """
+        day から days 稼働日後（負なら前）の稼働日
+
+        day が非稼働日の場合は前後の稼働日の間から数える（土曜の1稼働日後は月曜、
+        1稼働日前は金曜、0稼働日後は月曜）。
+        """
+        ordinal = _to_ordinal(day)
+        rank = self.rank(ordinal)
+        if days > 0 and not self.is_working_ordinal(ordinal):
+            rank -= 1
+        return date.fromordinal(self._day_at(rank + days))
+
+    def working_days_between(self, start: DateLike, end: DateLike) -> int:
+        """start〜end（両端を含む）の稼働日数（end < start なら 0）"""
+        first, last = _to_ordinal(start), _to_ordinal(end)
+        if last < first:
+            return 0
+        return self.rank(last + 1) - self.rank(first)
+
+    def working_day_shift(self, old: DateLike, new: DateLike) -> int:
+        """old から new への移動が何稼働日分か（前倒しは負）"""
+        return self.rank(new) - self.rank(old)
+
+    def end_date(self, start: DateLike, effort: float, allocation: float = 1.0) -> date:
+        """
+        工数（人日）と稼働率からタスクの終了日を求める
+
+        期間は 工数 ÷ 稼働率 の端数を切り上げた稼働日数（最低1日）。開始日が非稼働日なら次の稼働日から数える。
+        """
+        return self.add_working_days(self.next_working_day(start), task_duration(effort, allocation) - 1)
+
+    # ------------------------------------------------------------------
+    # 担当者ごとのカレンダー
+    # ------------------------------------------------------------------
+
+    def for_assignee(self, assignee: Optional[str]) -> "WorkCalendar":
+        """担当者だけの休業日を加えたカレンダー（休業日が無ければ自身）"""
+        extra = self.exceptions.get(assignee or "")
+        if not extra:
+            return self
+        calendar = self._assignee_calendars.get(assignee)
+        if calendar is None:
+            calendar = WorkCalendar(
+                holidays=[date.fromordinal(day).isoformat() for day in self.holidays] + list(extra),
+                start=self._base + PADDING_DAYS,
+                end=self._last - PADDING_DAYS,
+                weekend=self.weekend
+            )
+            self._assignee_calendars[assignee] = calendar
+        return calendar
+
+
+def task_duration(effort: float, allocation: float = 1.0) -> int:
+    """工数（人日）÷ 稼働率 を切り上げた稼働日数（最低1日）"""
+    allocation = allocation if allocation and allocation > 0 else 1.0
+    # 1.5 / 0.5 のような割り算の誤差で切り上がらないよう丸めてから切り上げる
+    return max(math.ceil(round((effort or 0) / allocation, 6)), 1)
+
+
+def allocation_from_project(project: Dict) -> float:
+    """
+    プロジェクトの稼働率（0〜1）
+
+    project.allocation があればその値、無ければ teamSize の「50%」などの表記から求める（既定は 1.0）。
+    """
+    allocation = project.get("allocation")
+    if allocation:
+        return float(allocation)
+    match = re.search(r"(\d+(?:\.\d+)?)\s*%", str(project.get("teamSize", "")))
+    if match and float(match.group(1)) > 0:
+        return float(match.group(1)) / 100
+    return 1.0
+
+
+def calendar_from_project(project: Dict) -> WorkCalendar:
+    """schedule.json の project から稼働日カレンダーを作る"""
+    return WorkCalendar(
+        holidays=project.get("holidays", []),
+        start=project.get("startDate"),
+        end=project.get("estimatedEndDate") or project.get("startDate"),
+        exceptions=project.get("assigneeExceptions")
+    )